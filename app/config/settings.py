@@ -6,13 +6,85 @@ import os
 # Ollama Configuration
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "qwen2.5")  # Default model, can be changed
+OLLAMA_CONNECT_TIMEOUT = 10  # seconds
+# Generations run at once across the process; match the Ollama server's OLLAMA_NUM_PARALLEL
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "1"))
+LLM_QUEUE_WAIT_SAMPLES = 200  # Recent queue wait times kept per priority for stats
+OLLAMA_IDLE_TIMEOUT = 120  # Longest silence (e.g. prompt evaluation) before a streamed generation is abandoned
+# LLM response cache: completed generations keyed by model, prompt, options and seed
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.db")  # Empty string disables the cache
+LLM_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Stored responses beyond this are evicted, least recently used first
+# Deterministic mode pins the seed (and the temperature, unless a caller sets one) so cache hits are meaningful.
+# Off by default: only requests that set their own seed are cached, and callers keep their sampling settings.
+LLM_DETERMINISTIC = os.getenv("LLM_DETERMINISTIC", "false").lower() == "true"
+LLM_SEED = 42
+LLM_DETERMINISTIC_TEMPERATURE = 0.0
+STYLE_PROFILE_WORKERS = 1  # Background style extractions at once (stored profiles are served meanwhile)
+# Style extraction: samples beyond this many tokens per prompt are map-reduced in chunks
+STYLE_CHUNK_TOKENS = 1500  # Leaves room for the prompt and answer in a 2048-token context
+STYLE_MAP_WORKERS = 2  # Chunks analyzed at once
+STYLE_CHUNK_CACHE_SIZE = 256  # Partial profiles kept in memory
+STYLE_MAX_PHRASES = 15  # Common phrases kept when merging partial profiles
 
 # Database Configuration
 DATABASE_PATH = os.getenv("DATABASE_PATH", "newsletter.db")
+DATABASE_BUSY_TIMEOUT_MS = 5000  # How long a writer waits on a locked database
+DATABASE_CACHE_SIZE_KB = 16384  # Page cache per connection
+# Storage for fact sheet / newsletter bodies: "none" (inline text) or "zlib"
+# (compressed and deduplicated by content hash, ignoring the per-run header)
+DATABASE_COMPRESSION = os.getenv("DATABASE_COMPRESSION", "none")
+HISTORY_PAGE_SIZE = 10  # Fact sheets / newsletters per history page
+
+# Retention Configuration
+RETENTION_KEEP_LAST = int(os.getenv("RETENTION_KEEP_LAST", "30"))  # Per topic, unless overridden
+RETENTION_BATCH_SIZE = 200  # Rows moved to the archive per transaction
+RETENTION_INTERVAL_HOURS = 24
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
 
 # Scraping Configuration
 SCRAPING_TIMEOUT = 30  # seconds
 MAX_RESULTS_PER_SOURCE = 10  # Maximum results to fetch per source
+# Per-source deadline for a fact sheet build, measured from when the source
+# starts running. MCP sources sharing one browser tab run in turn, and each
+# waits at most its own deadline for the tab (with an MCPSessionPool they
+# run in parallel).
+SOURCE_TIMEOUTS = {
+    "arxiv": 45,
+    "semantic_scholar": 45,
+    "news": 60,
+    "linkedin": 90,
+    "web": 120
+}
+# Circuit breakers: a source is skipped after this many consecutive failures
+SOURCE_FAILURE_THRESHOLD = 3
+SOURCE_COOLDOWN_SECONDS = 60  # Wait before probing an open source again (doubles per failed probe)
+SOURCE_MAX_COOLDOWN_SECONDS = 30 * 60
+SOURCE_HEALTH_PATH = os.getenv("SOURCE_HEALTH_PATH", "source_health.json")  # Empty string disables persistence
+# Duplicate items across sources are merged when their headline/abstract shingles are this similar (Jaccard)
+DEDUP_SIMILARITY = 0.6
+DEDUP_ABSTRACT_CHARS = 500  # Leading abstract characters compared
+# Ranking: only the best FACT_SHEET_MAX_ITEMS items (BM25 relevance + recency) make it into a fact sheet
+FACT_SHEET_MAX_ITEMS = 25
+RANKING_RECENCY_WEIGHT = 0.3  # Recency boost relative to relevance (both scaled to 0-1)
+RANKING_RECENCY_HALF_LIFE_DAYS = 30
+
+# MCP page readiness: after navigating, wait for the page instead of sleeping a fixed time
+MCP_READY_TIMEOUT = 10  # seconds
+MCP_READY_POLL_INTERVAL = 0.25  # seconds
+MCP_READY_STABLE_POLLS = 2  # Identical consecutive snapshots that count as a settled page
+# MCP page pool (MCPSessionPool). With MCPPlaywrightWrapper.connect as the
+# factory every page is its own MCP server and headless browser, roughly
+# 200-300 MB of memory each, so the pool size is capped.
+MCP_POOL_SIZE = 3  # Browser pages open at once
+MCP_POOL_MAX_SIZE = int(os.getenv("MCP_POOL_MAX_SIZE", "4"))  # Largest pool an MCPSessionPool accepts
+MCP_PAGE_MAX_USES = 50  # Leases before a page is replaced
+MCP_LEASE_TIMEOUT = 60  # Seconds to wait for a free page
+MCP_HEALTH_CHECK_IDLE = 60  # Pages idle longer than this are checked before reuse
+# MCP server started by MCPClient (stdio transport); each client runs its own server/browser
+MCP_SERVER_COMMAND = os.getenv("MCP_SERVER_COMMAND", "npx @playwright/mcp@latest --headless --isolated")
+MCP_REQUEST_TIMEOUT = 60  # Seconds to wait for a tool call's response
+# Due topics processed at once by the scheduler (more than 1 needs an MCPSessionPool for browser sources)
+PIPELINE_MAX_PARALLEL_TOPICS = int(os.getenv("PIPELINE_MAX_PARALLEL_TOPICS", "1"))
 
 # Newsletter Configuration
 NEWSLETTER_TITLE_TEMPLATE = "Weekly Newsletter: {topic}"
@@ -26,7 +98,31 @@ FREQUENCY_OPTIONS = {
     "monthly": 30
 }
 
+# HTTP Configuration
+HTTP_POOL_CONNECTIONS = 10  # Hosts with a kept-alive connection pool
+HTTP_POOL_MAXSIZE = 10  # Connections kept per host
+HTTP_USER_AGENT = "Automated-Newsletter/1.0"
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", "http_cache.db")  # Empty string disables the cache
+HTTP_CACHE_MAX_AGE = 7 * 24 * 3600  # Seconds before a cached response is dropped
+# How long (seconds) a cached API response is reused without revalidation
+HTTP_CACHE_TTLS = {
+    "arxiv": 3600,
+    "semantic_scholar": 3600
+}
+# Per-host request budget shared by all scrapers: host -> (requests per second, burst)
+RATE_LIMITS = {
+    "export.arxiv.org": (1 / 3, 1),  # arXiv asks for 3 seconds between calls
+    "api.semanticscholar.org": (1.0, 1)
+}
+RATE_LIMIT_BACKOFF = 5  # Seconds to pause a host after a 429/503 without Retry-After
+RATE_LIMIT_MAX_RETRIES = 4  # Retries of a 429/503 response before it is returned to the caller
+
 # Research API Configuration
 ARXIV_MAX_RESULTS = 10
+ARXIV_PAGE_SIZE = 25  # Page size when fetching incrementally
+ARXIV_INCREMENTAL_MAX_RESULTS = 100  # Upper bound on new entries fetched per run
+# Scheduled runs only fetch papers published since each source's last successful fetch
+INCREMENTAL_RESEARCH = os.getenv("INCREMENTAL_RESEARCH", "true").lower() == "true"
+RESEARCH_OVERLAP_DAYS = 3  # Re-read this far back: papers are announced/indexed days after their publication date
 SEMANTIC_SCHOLAR_MAX_RESULTS = 10
 
@@ -2,6 +2,7 @@
 Database module
 """
 from .database import Database
+from .retention import RetentionManager
 
-__all__ = ['Database']
+__all__ = ['Database', 'RetentionManager']
 
@@ -3,28 +3,337 @@ SQLite database management for Newsletter Generator
 """
 import sqlite3
 import json
+import threading
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Iterator
 from pathlib import Path
 import sys
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config.settings import DATABASE_PATH
+from config.settings import DATABASE_PATH, DATABASE_BUSY_TIMEOUT_MS, DATABASE_CACHE_SIZE_KB, DATABASE_COMPRESSION, HISTORY_PAGE_SIZE
+from utils.urls import url_hash
+from .payloads import CODECS, payload_hash, encode_payload, decode_payload, split_markdown, split_json
+
+SQLITE_MAX_PARAMS = 900  # Stay under SQLITE_MAX_VARIABLE_NUMBER on older builds
+
+
+def _payload_column(table_alias: str, inline: str, ref: str) -> str:
+    """
+    SQL expression returning a column's text whether stored inline or as a payload
+    
+    With a payload, the inline column holds the per-run head that precedes it.
+    """
+    return (
+        f"COALESCE({table_alias}.{inline} || (SELECT payload_decode(p.codec, p.data) FROM payloads p "
+        f"WHERE p.hash = {table_alias}.{ref}), {table_alias}.{inline})"
+    )
+
+
+FACT_SHEET_COLUMNS = f"""
+    f.id, f.topic_id, f.created_at,
+    {_payload_column('f', 'markdown', 'markdown_ref')} AS markdown,
+    {_payload_column('f', 'json_data', 'json_ref')} AS json_data
+"""
+
+NEWSLETTER_COLUMNS = f"""
+    n.id, n.topic_id, n.created_at,
+    {_payload_column('n', 'markdown', 'markdown_ref')} AS markdown
+"""
+
+
+def _payload_size(table_alias: str, inline: str, ref: str) -> str:
+    """SQL expression returning a column's size without decoding the payload"""
+    return (
+        f"LENGTH({table_alias}.{inline}) + COALESCE((SELECT p.raw_size FROM payloads p "
+        f"WHERE p.hash = {table_alias}.{ref}), 0)"
+    )
+
+
+# Lightweight listing columns for history pages (no bodies)
+FACT_SHEET_META_COLUMNS = f"""
+    f.id, f.topic_id, f.created_at,
+    {_payload_size('f', 'markdown', 'markdown_ref')} AS size
+"""
+
+NEWSLETTER_META_COLUMNS = f"""
+    n.id, n.topic_id, n.created_at,
+    {_payload_size('n', 'markdown', 'markdown_ref')} AS size
+"""
+
+
+# History lookups that run on every page render and pipeline run. Each one
+# must be answered from an idx_<table>_topic_created index without sorting.
+HOT_QUERIES = {
+    'writing_samples': """
+        SELECT * FROM writing_samples
+        WHERE topic_id = ?
+        ORDER BY created_at DESC, id DESC
+    """,
+    'latest_fact_sheet': f"""
+        SELECT {FACT_SHEET_COLUMNS} FROM fact_sheets f
+        WHERE f.topic_id = ?
+        ORDER BY f.created_at DESC, f.id DESC
+        LIMIT 1
+    """,
+    'all_fact_sheets': f"""
+        SELECT {FACT_SHEET_COLUMNS} FROM fact_sheets f
+        WHERE f.topic_id = ?
+        ORDER BY f.created_at DESC, f.id DESC
+    """,
+    'latest_newsletter': f"""
+        SELECT {NEWSLETTER_COLUMNS} FROM newsletters n
+        WHERE n.topic_id = ?
+        ORDER BY n.created_at DESC, n.id DESC
+        LIMIT 1
+    """,
+    'all_newsletters': f"""
+        SELECT {NEWSLETTER_COLUMNS} FROM newsletters n
+        WHERE n.topic_id = ?
+        ORDER BY n.created_at DESC, n.id DESC
+    """,
+    'new_items_since': """
+        SELECT i.*, t.first_linked FROM topic_items t
+        JOIN scraped_items i ON i.id = t.item_id
+        WHERE t.topic_id = ? AND t.first_linked > ?
+        ORDER BY t.first_linked DESC
+    """,
+    'fact_sheet_meta_page': f"""
+        SELECT {FACT_SHEET_META_COLUMNS} FROM fact_sheets f
+        WHERE f.topic_id = ?
+        ORDER BY f.created_at DESC, f.id DESC
+        LIMIT ?
+    """,
+    'fact_sheet_meta_page_after': f"""
+        SELECT {FACT_SHEET_META_COLUMNS} FROM fact_sheets f
+        WHERE f.topic_id = ? AND (f.created_at, f.id) < (?, ?)
+        ORDER BY f.created_at DESC, f.id DESC
+        LIMIT ?
+    """,
+    'fact_sheet_page': f"""
+        SELECT {FACT_SHEET_COLUMNS} FROM fact_sheets f
+        WHERE f.topic_id = ?
+        ORDER BY f.created_at DESC, f.id DESC
+        LIMIT ?
+    """,
+    'fact_sheet_page_after': f"""
+        SELECT {FACT_SHEET_COLUMNS} FROM fact_sheets f
+        WHERE f.topic_id = ? AND (f.created_at, f.id) < (?, ?)
+        ORDER BY f.created_at DESC, f.id DESC
+        LIMIT ?
+    """,
+    'newsletter_meta_page': f"""
+        SELECT {NEWSLETTER_META_COLUMNS} FROM newsletters n
+        WHERE n.topic_id = ?
+        ORDER BY n.created_at DESC, n.id DESC
+        LIMIT ?
+    """,
+    'newsletter_meta_page_after': f"""
+        SELECT {NEWSLETTER_META_COLUMNS} FROM newsletters n
+        WHERE n.topic_id = ? AND (n.created_at, n.id) < (?, ?)
+        ORDER BY n.created_at DESC, n.id DESC
+        LIMIT ?
+    """,
+    'newsletter_page': f"""
+        SELECT {NEWSLETTER_COLUMNS} FROM newsletters n
+        WHERE n.topic_id = ?
+        ORDER BY n.created_at DESC, n.id DESC
+        LIMIT ?
+    """,
+    'newsletter_page_after': f"""
+        SELECT {NEWSLETTER_COLUMNS} FROM newsletters n
+        WHERE n.topic_id = ? AND (n.created_at, n.id) < (?, ?)
+        ORDER BY n.created_at DESC, n.id DESC
+        LIMIT ?
+    """,
+}
+
+
+# Ranked full-text queries, one per searchable kind
+SEARCH_KINDS = ('fact_sheet', 'newsletter', 'item')
+
+SEARCH_QUERIES = {
+    'fact_sheet': """
+        SELECT 'fact_sheet' AS kind, f.id, f.topic_id, f.created_at,
+               'Fact sheet' AS title, NULL AS url,
+               snippet(fact_sheets_fts, 0, '**', '**', '…', 16) AS snippet,
+               bm25(fact_sheets_fts) AS rank
+        FROM fact_sheets_fts JOIN fact_sheets f ON f.id = fact_sheets_fts.rowid
+        WHERE fact_sheets_fts MATCH ? {topic_filter}
+        ORDER BY rank
+        LIMIT ?
+    """,
+    'newsletter': """
+        SELECT 'newsletter' AS kind, n.id, n.topic_id, n.created_at,
+               'Newsletter' AS title, NULL AS url,
+               snippet(newsletters_fts, 0, '**', '**', '…', 16) AS snippet,
+               bm25(newsletters_fts) AS rank
+        FROM newsletters_fts JOIN newsletters n ON n.id = newsletters_fts.rowid
+        WHERE newsletters_fts MATCH ? {topic_filter}
+        ORDER BY rank
+        LIMIT ?
+    """,
+    'item': """
+        SELECT 'item' AS kind, i.id, NULL AS topic_id, i.first_seen AS created_at,
+               i.headline AS title, i.url,
+               snippet(scraped_items_fts, -1, '**', '**', '…', 16) AS snippet,
+               bm25(scraped_items_fts, 2.0, 1.0) AS rank
+        FROM scraped_items_fts JOIN scraped_items i ON i.id = scraped_items_fts.rowid
+        WHERE scraped_items_fts MATCH ? {topic_filter}
+        ORDER BY rank
+        LIMIT ?
+    """,
+}
+
+SEARCH_TOPIC_FILTERS = {
+    'fact_sheet': "AND f.topic_id = ?",
+    'newsletter': "AND n.topic_id = ?",
+    'item': """
+        AND EXISTS (
+            SELECT 1 FROM fact_sheet_items l
+            WHERE l.topic_id = ? AND l.item_id = i.id
+        )
+    """,
+}
+
+
+def _close_connections(connections: List, lock: threading.Lock):
+    """Close and forget every (thread, connection) pair in `connections`"""
+    with lock:
+        pairs = list(connections)
+        connections.clear()
+    for _, conn in pairs:
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error closing database connection: {e}")
 
 
 class Database:
-    def __init__(self, db_path: str = DATABASE_PATH):
+    def __init__(self, db_path: str = DATABASE_PATH, compression: str = DATABASE_COMPRESSION):
+        if compression not in CODECS:
+            raise ValueError(f"Unknown compression '{compression}', expected one of {CODECS}")
         self.db_path = db_path
+        self.compression = compression
+        self._local = threading.local()
+        self._connections = []  # (thread, connection) pairs owned by this instance
+        self._connections_lock = threading.Lock()
         self.init_database()
+        # Closes the connections when this instance is garbage collected (e.g.
+        # with its Streamlit session) or at exit, without keeping it alive
+        self._finalizer = weakref.finalize(self, _close_connections, self._connections, self._connections_lock)
     
     def get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        """
+        Get the database connection for the calling thread
+        
+        Each thread reuses a single connection for the lifetime of this
+        Database instance. Connections left behind by finished threads
+        (e.g. Streamlit script runs) are closed when a new one is opened.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
         conn.row_factory = sqlite3.Row
+        self._configure_connection(conn)
+        
+        with self._connections_lock:
+            alive = []
+            for thread, other in self._connections:
+                if thread.is_alive():
+                    alive.append((thread, other))
+                else:
+                    other.close()
+            alive.append((threading.current_thread(), conn))
+            self._connections[:] = alive
+        
+        self._local.conn = conn
         return conn
     
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """Apply per-connection pragmas"""
+        conn.execute(f"PRAGMA busy_timeout = {int(DATABASE_BUSY_TIMEOUT_MS)}")
+        # Only takes effect on a new file, so it must precede the WAL switch
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        # Negative cache_size is in KiB rather than pages
+        conn.execute(f"PRAGMA cache_size = -{int(DATABASE_CACHE_SIZE_KB)}")
+        conn.create_function("payload_decode", 2, decode_payload, deterministic=True)
+    
+    def close(self):
+        """Close every connection opened by this instance"""
+        _close_connections(self._connections, self._connections_lock)
+        self._local = threading.local()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into one atomic commit
+        
+        Inside the block, write methods on this thread skip their own
+        commit; everything is committed once on exit or rolled back if the
+        block raises. Blocks may be nested; only the outermost one commits.
+        
+        Usage:
+            with db.transaction():
+                db.save_fact_sheet(...)
+                db.save_newsletter(...)
+        """
+        conn = self.get_connection()
+        depth = getattr(self._local, 'tx_depth', 0)
+        if depth == 0:
+            conn.execute("BEGIN IMMEDIATE")
+        self._local.tx_depth = depth + 1
+        try:
+            yield self
+        except BaseException:
+            self._local.tx_depth = depth
+            if depth == 0:
+                conn.rollback()
+            raise
+        self._local.tx_depth = depth
+        if depth == 0:
+            conn.commit()
+    
+    @contextmanager
+    def _write(self):
+        """
+        Run one write method's statements on this thread's connection
+        
+        Commits on success and rolls back if the block raises, so a failed
+        write never leaves the connection holding the write lock. Inside a
+        transaction() block both are left to the transaction.
+        """
+        conn = self.get_connection()
+        try:
+            yield conn
+        except BaseException:
+            self._rollback(conn)
+            raise
+        self._commit(conn)
+    
+    def _commit(self, conn: sqlite3.Connection):
+        """Commit unless a transaction() block is open on this thread"""
+        if not getattr(self._local, 'tx_depth', 0):
+            conn.commit()
+    
+    def _rollback(self, conn: sqlite3.Connection):
+        """Roll back unless a transaction() block is open on this thread"""
+        if not getattr(self._local, 'tx_depth', 0):
+            conn.rollback()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def init_database(self):
         """Initialize database tables"""
         conn = self.get_connection()
@@ -75,25 +384,250 @@ class Database:
             )
         """)
         
+        # Content-addressed (optionally compressed) storage for large columns
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS payloads (
+                hash TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                data BLOB NOT NULL,
+                raw_size INTEGER NOT NULL
+            )
+        """)
+        self._add_missing_columns(cursor, 'topics', {'retention_keep_last': 'INTEGER'})
+        self._add_missing_columns(cursor, 'fact_sheets', {'markdown_ref': 'TEXT', 'json_ref': 'TEXT'})
+        self._add_missing_columns(cursor, 'newsletters', {'markdown_ref': 'TEXT'})
+        
+        # Normalized scraped items, shared across runs, sources and topics
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scraped_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url_hash TEXT NOT NULL UNIQUE,
+                url TEXT NOT NULL,
+                source TEXT NOT NULL,
+                headline TEXT NOT NULL,
+                abstract TEXT NOT NULL DEFAULT '',
+                first_seen DATETIME NOT NULL,
+                last_seen DATETIME NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_scraped_items_first_seen
+            ON scraped_items (first_seen)
+        """)
+        
+        # Which fact sheet (and so which topic) each item appeared in
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS fact_sheet_items (
+                fact_sheet_id INTEGER NOT NULL,
+                item_id INTEGER NOT NULL,
+                topic_id INTEGER NOT NULL,
+                section TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (fact_sheet_id, item_id),
+                FOREIGN KEY (fact_sheet_id) REFERENCES fact_sheets(id),
+                FOREIGN KEY (item_id) REFERENCES scraped_items(id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_fact_sheet_items_topic_item
+            ON fact_sheet_items (topic_id, item_id)
+        """)
+        
+        # When each topic first saw each item (kept when fact sheets are archived)
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'topic_items'")
+        has_topic_items = cursor.fetchone() is not None
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS topic_items (
+                topic_id INTEGER NOT NULL,
+                item_id INTEGER NOT NULL,
+                first_linked DATETIME NOT NULL,
+                PRIMARY KEY (topic_id, item_id),
+                FOREIGN KEY (topic_id) REFERENCES topics(id),
+                FOREIGN KEY (item_id) REFERENCES scraped_items(id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_topic_items_topic_first_linked
+            ON topic_items (topic_id, first_linked DESC)
+        """)
+        if not has_topic_items:
+            # Backfill from the fact sheets still in the database
+            cursor.execute("""
+                INSERT INTO topic_items (topic_id, item_id, first_linked)
+                SELECT l.topic_id, l.item_id,
+                       MIN(strftime('%Y-%m-%dT%H:%M:%S', f.created_at, 'localtime'))
+                FROM fact_sheet_items l JOIN fact_sheets f ON f.id = l.fact_sheet_id
+                GROUP BY l.topic_id, l.item_id
+            """)
+        
+        # Incremental research: per topic and source, the time up to which
+        # results were fetched successfully
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS topic_sources (
+                topic_id INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                fetched_through DATETIME NOT NULL,
+                PRIMARY KEY (topic_id, source),
+                FOREIGN KEY (topic_id) REFERENCES topics(id)
+            ) WITHOUT ROWID
+        """)
+        
+        # Full-text search, kept in sync with the source tables by triggers.
+        # Fact sheet and newsletter indexes are external-content over views
+        # that decode the payloads, so they store no copy of the bodies;
+        # snippet() decodes just the rows it is asked for.
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name LIKE '%_fts'")
+        existing_fts = {row['name']: row['sql'] for row in cursor.fetchall()}
+        for table, ref in (('fact_sheets', 'markdown_ref'), ('newsletters', 'markdown_ref')):
+            if f'{table}_fts' in existing_fts and 'content' not in existing_fts[f'{table}_fts']:
+                # Older files kept a plain-text copy of every body in the index
+                cursor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_insert")
+                cursor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_delete")
+                cursor.execute(f"DROP TABLE {table}_fts")
+                del existing_fts[f'{table}_fts']
+            cursor.execute(f"""
+                CREATE VIEW IF NOT EXISTS {table}_text AS
+                SELECT t.id, {_payload_column('t', 'markdown', ref)} AS body FROM {table} t
+            """)
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts
+                USING fts5(body, content = '{table}_text', content_rowid = 'id',
+                           tokenize = 'porter unicode61')
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {table}_fts (rowid, body)
+                    VALUES (NEW.id, {_payload_column('NEW', 'markdown', ref)});
+                END
+            """)
+            # Runs before retention drops orphaned payloads, so OLD still decodes
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {table}_fts ({table}_fts, rowid, body)
+                    VALUES ('delete', OLD.id, {_payload_column('OLD', 'markdown', ref)});
+                END
+            """)
+            if f'{table}_fts' not in existing_fts:
+                cursor.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS scraped_items_fts
+            USING fts5(headline, abstract, content = 'scraped_items', content_rowid = 'id',
+                       tokenize = 'porter unicode61')
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS scraped_items_fts_insert AFTER INSERT ON scraped_items BEGIN
+                INSERT INTO scraped_items_fts (rowid, headline, abstract)
+                VALUES (NEW.id, NEW.headline, NEW.abstract);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS scraped_items_fts_delete AFTER DELETE ON scraped_items BEGIN
+                INSERT INTO scraped_items_fts (scraped_items_fts, rowid, headline, abstract)
+                VALUES ('delete', OLD.id, OLD.headline, OLD.abstract);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS scraped_items_fts_update
+            AFTER UPDATE OF headline, abstract ON scraped_items BEGIN
+                INSERT INTO scraped_items_fts (scraped_items_fts, rowid, headline, abstract)
+                VALUES ('delete', OLD.id, OLD.headline, OLD.abstract);
+                INSERT INTO scraped_items_fts (rowid, headline, abstract)
+                VALUES (NEW.id, NEW.headline, NEW.abstract);
+            END
+        """)
+        if 'scraped_items_fts' not in existing_fts:
+            cursor.execute("INSERT INTO scraped_items_fts (scraped_items_fts) VALUES ('rebuild')")
+        
+        # Extracted writing styles, keyed by the sample set they were computed from
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS style_profiles (
+                samples_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                topic_id INTEGER NOT NULL,
+                profile TEXT NOT NULL,
+                stale INTEGER NOT NULL DEFAULT 0,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (samples_hash, model),
+                FOREIGN KEY (topic_id) REFERENCES topics(id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_style_profiles_topic_model
+            ON style_profiles (topic_id, model)
+        """)
+        
+        # Per-topic history indexes (also added to existing database files)
+        for table in ('writing_samples', 'fact_sheets', 'newsletters'):
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{table}_topic_created
+                ON {table} (topic_id, created_at DESC, id DESC)
+            """)
+        
         conn.commit()
-        conn.close()
+    
+    def _add_missing_columns(self, cursor, table: str, columns: Dict[str, str]):
+        """Add columns introduced after a database file was created"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row['name'] for row in cursor.fetchall()}
+        for name, column_type in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+    
+    def _store_payload(self, cursor, head: str, body: str) -> Tuple[str, Optional[str]]:
+        """
+        Store a body in the payloads table when compression is enabled
+        
+        Bodies already stored (by hash) are not compressed again.
+        
+        Args:
+            head: Per-run part kept inline (see payloads.split_markdown)
+            body: Part that is content-addressed
+        
+        Returns:
+            Tuple of (inline column text, payload hash or None)
+        """
+        if self.compression == 'none':
+            return head + body, None
+        content_hash = payload_hash(body)
+        cursor.execute("SELECT 1 FROM payloads WHERE hash = ?", (content_hash,))
+        if cursor.fetchone() is None:
+            _, data = encode_payload(body, self.compression)
+            cursor.execute("""
+                INSERT OR IGNORE INTO payloads (hash, codec, data, raw_size)
+                VALUES (?, ?, ?, ?)
+            """, (content_hash, self.compression, data, len(body.encode('utf-8'))))
+        return head, content_hash
+    
+    def check_query_plans(self) -> List[str]:
+        """
+        Run EXPLAIN QUERY PLAN over the hot history queries
+        
+        Returns:
+            Names of queries that fall back to a table scan or a temp sort
+        """
+        conn = self.get_connection()
+        offenders = []
+        for name, sql in HOT_QUERIES.items():
+            params = (0,) * sql.count('?')
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            details = [row['detail'] for row in plan]
+            if any(d.startswith('SCAN') or 'TEMP B-TREE' in d for d in details):
+                offenders.append(name)
+        return offenders
     
     def add_topic(self, topic_name: str, frequency: str) -> int:
         """Add a new topic"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
         try:
-            cursor.execute("""
-                INSERT INTO topics (topic_name, frequency)
-                VALUES (?, ?)
-            """, (topic_name, frequency))
-            conn.commit()
+            with self._write() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO topics (topic_name, frequency)
+                    VALUES (?, ?)
+                """, (topic_name, frequency))
             topic_id = cursor.lastrowid
             return topic_id
         except sqlite3.IntegrityError:
             raise ValueError(f"Topic '{topic_name}' already exists")
-        finally:
-            conn.close()
     
     def get_topic(self, topic_id: int) -> Optional[Dict]:
         """Get topic by ID"""
@@ -101,7 +635,6 @@ class Database:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM topics WHERE id = ?", (topic_id,))
         row = cursor.fetchone()
-        conn.close()
         return dict(row) if row else None
     
     def get_all_topics(self) -> List[Dict]:
@@ -110,124 +643,356 @@ class Database:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM topics ORDER BY created_at DESC")
         rows = cursor.fetchall()
-        conn.close()
         return [dict(row) for row in rows]
     
     def update_topic_last_run(self, topic_id: int, last_run: datetime):
         """Update topic's last run time"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE topics
-            SET last_run = ?
-            WHERE id = ?
-        """, (last_run.isoformat(), topic_id))
-        conn.commit()
-        conn.close()
+        with self._write() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE topics
+                SET last_run = ?
+                WHERE id = ?
+            """, (last_run.isoformat(), topic_id))
+    
+    def get_fetched_through(self, topic_id: int) -> Dict[str, datetime]:
+        """Get, per source, the time up to which a topic's research was fetched successfully"""
+        cursor = self.get_connection().cursor()
+        cursor.execute("SELECT source, fetched_through FROM topic_sources WHERE topic_id = ?", (topic_id,))
+        return {row['source']: datetime.fromisoformat(row['fetched_through']) for row in cursor.fetchall()}
+    
+    def set_fetched_through(self, topic_id: int, source: str, fetched_through: datetime):
+        """Record that a source's results were fetched successfully up to `fetched_through`"""
+        with self._write() as conn:
+            conn.execute("""
+                INSERT INTO topic_sources (topic_id, source, fetched_through)
+                VALUES (?, ?, ?)
+                ON CONFLICT(topic_id, source) DO UPDATE SET
+                    fetched_through = MAX(fetched_through, excluded.fetched_through)
+            """, (topic_id, source, fetched_through.isoformat()))
+    
+    def set_topic_retention(self, topic_id: int, keep_last: Optional[int]):
+        """Set how many fact sheets/newsletters a topic keeps in the hot database (None = default)"""
+        with self._write() as conn:
+            conn.execute("""
+                UPDATE topics
+                SET retention_keep_last = ?
+                WHERE id = ?
+            """, (keep_last, topic_id))
     
     def add_writing_sample(self, topic_id: int, text: str) -> int:
-        """Add writing sample"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO writing_samples (topic_id, text)
-            VALUES (?, ?)
-        """, (topic_id, text))
-        conn.commit()
+        """Add writing sample (and mark the topic's style profiles stale)"""
+        with self._write() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO writing_samples (topic_id, text)
+                VALUES (?, ?)
+            """, (topic_id, text))
+            cursor.execute("UPDATE style_profiles SET stale = 1 WHERE topic_id = ?", (topic_id,))
         sample_id = cursor.lastrowid
-        conn.close()
         return sample_id
     
     def get_writing_samples(self, topic_id: int) -> List[Dict]:
         """Get writing samples for a topic"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM writing_samples
-            WHERE topic_id = ?
-            ORDER BY created_at DESC
-        """, (topic_id,))
+        cursor.execute(HOT_QUERIES['writing_samples'], (topic_id,))
         rows = cursor.fetchall()
-        conn.close()
         return [dict(row) for row in rows]
     
+    def get_style_profile(self, topic_id: int, model: str) -> Optional[Dict]:
+        """
+        Get a topic's stored style profile for a model
+        
+        Returns:
+            Dict with samples_hash, profile (decoded), stale (bool) and
+            updated_at, or None if none was stored yet
+        """
+        cursor = self.get_connection().cursor()
+        cursor.execute("""
+            SELECT samples_hash, profile, stale, updated_at FROM style_profiles
+            WHERE topic_id = ? AND model = ?
+        """, (topic_id, model))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return {
+            "samples_hash": row['samples_hash'],
+            "profile": json.loads(row['profile']),
+            "stale": bool(row['stale']),
+            "updated_at": row['updated_at']
+        }
+    
+    def save_style_profile(self, topic_id: int, model: str, samples_hash: str, profile: Dict, stale: bool = False):
+        """Store a topic's style profile, replacing the one computed from earlier samples"""
+        with self._write() as conn:
+            conn.execute("DELETE FROM style_profiles WHERE topic_id = ? AND model = ?", (topic_id, model))
+            conn.execute("""
+                INSERT OR REPLACE INTO style_profiles (samples_hash, model, topic_id, profile, stale, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (samples_hash, model, topic_id, json.dumps(profile), int(stale), datetime.now().isoformat()))
+    
     def save_fact_sheet(self, topic_id: int, markdown: str, json_data: Dict) -> int:
         """Save fact sheet"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO fact_sheets (topic_id, markdown, json_data)
-            VALUES (?, ?, ?)
-        """, (topic_id, markdown, json.dumps(json_data)))
-        conn.commit()
-        sheet_id = cursor.lastrowid
-        conn.close()
+        with self._write() as conn:
+            cursor = conn.cursor()
+            markdown_inline, markdown_ref = self._store_payload(cursor, *split_markdown(markdown))
+            json_inline, json_ref = self._store_payload(cursor, *split_json(json_data))
+            cursor.execute("""
+                INSERT INTO fact_sheets (topic_id, markdown, json_data, markdown_ref, json_ref)
+                VALUES (?, ?, ?, ?, ?)
+            """, (topic_id, markdown_inline, json_inline, markdown_ref, json_ref))
+            sheet_id = cursor.lastrowid
+            self._save_scraped_items(cursor, sheet_id, topic_id, json_data)
         return sheet_id
     
+    def _save_scraped_items(self, cursor, fact_sheet_id: int, topic_id: int, json_data: Dict):
+        """
+        Upsert every item of a fact sheet into scraped_items and link them
+        
+        Items are the result dicts (source, headline, abstract, url) found in
+        the list-valued sections of the fact sheet JSON.
+        """
+        seen_at = datetime.now().isoformat()
+        rows = {}
+        links = []
+        for section, items in json_data.items():
+            if not isinstance(items, list):
+                continue
+            for position, item in enumerate(items):
+                if not isinstance(item, dict) or not item.get('url'):
+                    continue
+                key = url_hash(item['url'])
+                if key not in rows:
+                    rows[key] = (
+                        key,
+                        item['url'],
+                        item.get('source', ''),
+                        item.get('headline', ''),
+                        item.get('abstract') or '',
+                        seen_at,
+                        seen_at
+                    )
+                    links.append((key, section, position))
+        
+        if not rows:
+            return
+        
+        cursor.executemany("""
+            INSERT INTO scraped_items (url_hash, url, source, headline, abstract, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url_hash) DO UPDATE SET
+                last_seen = excluded.last_seen,
+                headline = excluded.headline,
+                abstract = CASE WHEN excluded.abstract != '' THEN excluded.abstract ELSE abstract END
+        """, list(rows.values()))
+        
+        item_ids = {}
+        keys = list(rows)
+        for start in range(0, len(keys), SQLITE_MAX_PARAMS):
+            chunk = keys[start:start + SQLITE_MAX_PARAMS]
+            cursor.execute(
+                f"SELECT id, url_hash FROM scraped_items WHERE url_hash IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            item_ids.update((row['url_hash'], row['id']) for row in cursor.fetchall())
+        
+        cursor.executemany("""
+            INSERT OR IGNORE INTO fact_sheet_items (fact_sheet_id, item_id, topic_id, section, position)
+            VALUES (?, ?, ?, ?, ?)
+        """, [
+            (fact_sheet_id, item_ids[key], topic_id, section, position)
+            for key, section, position in links
+        ])
+        cursor.executemany("""
+            INSERT OR IGNORE INTO topic_items (topic_id, item_id, first_linked)
+            VALUES (?, ?, ?)
+        """, [(topic_id, item_ids[key], seen_at) for key in rows])
+    
+    def get_new_items_since(self, topic_id: int, since: Optional[datetime] = None) -> List[Dict]:
+        """
+        Get items a topic's fact sheets first included after `since`
+        
+        An item already scraped for another topic still counts as new the
+        first time it appears in this topic's fact sheets.
+        
+        Args:
+            topic_id: Topic whose fact sheets the items appeared in
+            since: Cutoff (typically the topic's last_run); None returns all items
+        
+        Returns:
+            scraped_items rows plus first_linked, newest first
+        """
+        cursor = self.get_connection().cursor()
+        since_text = since.isoformat() if isinstance(since, datetime) else (since or '')
+        cursor.execute(HOT_QUERIES['new_items_since'], (topic_id, since_text))
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def get_item_by_url(self, url: str) -> Optional[Dict]:
+        """Look up a previously scraped item by (normalized) URL"""
+        cursor = self.get_connection().cursor()
+        cursor.execute("SELECT * FROM scraped_items WHERE url_hash = ?", (url_hash(url),))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+    
+    def search(self, query: str, topic_id: Optional[int] = None, limit: int = 20,
+               kinds: Tuple[str, ...] = SEARCH_KINDS) -> List[Dict]:
+        """
+        Full-text search over fact sheets, newsletters and scraped items
+        
+        Args:
+            query: Search terms; every term must match (porter-stemmed)
+            topic_id: Optional topic to restrict results to
+            limit: Maximum number of results
+            kinds: Subset of 'fact_sheet', 'newsletter', 'item' to search
+        
+        Each kind has its own FTS5 index, and bm25 scores from different
+        indexes are not comparable. Results are merged by score instead:
+        each hit's rank relative to the best hit of its kind, so every
+        kind's best match scores 1.0. Near ties alternate between kinds.
+        
+        Returns:
+            List of dicts with kind, id, topic_id, created_at, title, url,
+            snippet (matches wrapped in **), rank (bm25 within its kind,
+            lower is better) and score (0-1, higher is better)
+        """
+        terms = query.split()
+        if not terms:
+            return []
+        # Quote every term so user input cannot be parsed as FTS5 syntax
+        match = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        
+        cursor = self.get_connection().cursor()
+        results = []
+        for kind in kinds:
+            sql = SEARCH_QUERIES[kind]
+            if topic_id is None:
+                cursor.execute(sql.format(topic_filter=""), (match, limit))
+            else:
+                cursor.execute(sql.format(topic_filter=SEARCH_TOPIC_FILTERS[kind]), (match, topic_id, limit))
+            rows = [dict(row) for row in cursor.fetchall()]
+            for position, row in enumerate(rows):
+                # bm25 is negative, best first; 0 would mean no weight at all
+                row['score'] = row['rank'] / rows[0]['rank'] if rows[0]['rank'] < 0 else 1.0
+                results.append((position, row))
+        
+        results.sort(key=lambda result: (-round(result[1]['score'], 2), result[0]))
+        return [row for _, row in results[:limit]]
+    
     def get_latest_fact_sheet(self, topic_id: int) -> Optional[Dict]:
         """Get latest fact sheet for a topic"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM fact_sheets
-            WHERE topic_id = ?
-            ORDER BY created_at DESC
-            LIMIT 1
-        """, (topic_id,))
+        cursor.execute(HOT_QUERIES['latest_fact_sheet'], (topic_id,))
         row = cursor.fetchone()
-        conn.close()
         return dict(row) if row else None
     
     def get_all_fact_sheets(self, topic_id: int) -> List[Dict]:
         """Get all fact sheets for a topic"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM fact_sheets
-            WHERE topic_id = ?
-            ORDER BY created_at DESC
-        """, (topic_id,))
+        cursor.execute(HOT_QUERIES['all_fact_sheets'], (topic_id,))
         rows = cursor.fetchall()
-        conn.close()
         return [dict(row) for row in rows]
     
     def save_newsletter(self, topic_id: int, markdown: str) -> int:
         """Save newsletter"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO newsletters (topic_id, markdown)
-            VALUES (?, ?)
-        """, (topic_id, markdown))
-        conn.commit()
+        with self._write() as conn:
+            cursor = conn.cursor()
+            markdown_inline, markdown_ref = self._store_payload(cursor, *split_markdown(markdown))
+            cursor.execute("""
+                INSERT INTO newsletters (topic_id, markdown, markdown_ref)
+                VALUES (?, ?, ?)
+            """, (topic_id, markdown_inline, markdown_ref))
         newsletter_id = cursor.lastrowid
-        conn.close()
         return newsletter_id
     
     def get_latest_newsletter(self, topic_id: int) -> Optional[Dict]:
         """Get latest newsletter for a topic"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM newsletters
-            WHERE topic_id = ?
-            ORDER BY created_at DESC
-            LIMIT 1
-        """, (topic_id,))
+        cursor.execute(HOT_QUERIES['latest_newsletter'], (topic_id,))
         row = cursor.fetchone()
-        conn.close()
         return dict(row) if row else None
     
     def get_all_newsletters(self, topic_id: int) -> List[Dict]:
         """Get all newsletters for a topic"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM newsletters
-            WHERE topic_id = ?
-            ORDER BY created_at DESC
-        """, (topic_id,))
+        cursor.execute(HOT_QUERIES['all_newsletters'], (topic_id,))
         rows = cursor.fetchall()
-        conn.close()
         return [dict(row) for row in rows]
-
+    
+    def _history_page(self, query: str, topic_id: int, limit: int,
+                      before: Optional[Tuple[str, int]]) -> List[Dict]:
+        """Run a keyset-paginated history query (newest first)"""
+        cursor = self.get_connection().cursor()
+        if before:
+            cursor.execute(HOT_QUERIES[f'{query}_after'], (topic_id, before[0], before[1], limit))
+        else:
+            cursor.execute(HOT_QUERIES[query], (topic_id, limit))
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def list_fact_sheets(self, topic_id: int, limit: int = HISTORY_PAGE_SIZE,
+                         before: Optional[Tuple[str, int]] = None) -> List[Dict]:
+        """
+        List fact sheet metadata for a topic, newest first
+        
+        Args:
+            topic_id: Topic to list
+            limit: Maximum number of rows to return
+            before: (created_at, id) of the last row of the previous page
+        
+        Returns:
+            List of dicts with id, topic_id, created_at and size (no bodies)
+        """
+        return self._history_page('fact_sheet_meta_page', topic_id, limit, before)
+    
+    def get_fact_sheet(self, sheet_id: int) -> Optional[Dict]:
+        """Get a single fact sheet with its body"""
+        cursor = self.get_connection().cursor()
+        cursor.execute(f"SELECT {FACT_SHEET_COLUMNS} FROM fact_sheets f WHERE f.id = ?", (sheet_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+    
+    def iter_fact_sheets(self, topic_id: int, batch_size: int = 100) -> Iterator[Dict]:
+        """Yield every fact sheet for a topic, newest first, one batch in memory at a time"""
+        before = None
+        while True:
+            rows = self._history_page('fact_sheet_page', topic_id, batch_size, before)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            before = (rows[-1]['created_at'], rows[-1]['id'])
+    
+    def list_newsletters(self, topic_id: int, limit: int = HISTORY_PAGE_SIZE,
+                         before: Optional[Tuple[str, int]] = None) -> List[Dict]:
+        """
+        List newsletter metadata for a topic, newest first
+        
+        Args:
+            topic_id: Topic to list
+            limit: Maximum number of rows to return
+            before: (created_at, id) of the last row of the previous page
+        
+        Returns:
+            List of dicts with id, topic_id, created_at and size (no bodies)
+        """
+        return self._history_page('newsletter_meta_page', topic_id, limit, before)
+    
+    def get_newsletter(self, newsletter_id: int) -> Optional[Dict]:
+        """Get a single newsletter with its body"""
+        cursor = self.get_connection().cursor()
+        cursor.execute(f"SELECT {NEWSLETTER_COLUMNS} FROM newsletters n WHERE n.id = ?", (newsletter_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+    
+    def iter_newsletters(self, topic_id: int, batch_size: int = 100) -> Iterator[Dict]:
+        """Yield every newsletter for a topic, newest first, one batch in memory at a time"""
+        before = None
+        while True:
+            rows = self._history_page('newsletter_page', topic_id, batch_size, before)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            before = (rows[-1]['created_at'], rows[-1]['id'])
@@ -0,0 +1,90 @@
+"""
+Content-addressed payload storage helpers
+
+Large text columns (fact sheet markdown/JSON, newsletter markdown) can be
+stored once per distinct content in the payloads table, compressed with
+the configured codec, and referenced by their SHA-256 hash.
+
+Parts that change on every run (the "Generated on" line, build timings)
+are split off as a short head that stays inline in the row, so the body
+of an unchanged fact sheet or newsletter hashes the same across runs.
+"""
+import hashlib
+import json
+import zlib
+from typing import Dict, Tuple
+
+CODECS = ('none', 'zlib')
+
+ZLIB_LEVEL = 6
+
+HEADER_MARKER = '*Generated on '  # Date line written by the fact sheet builder and newsletter generator
+HEADER_MAX_LINES = 5  # Only look for it this close to the top
+VOLATILE_JSON_KEYS = ('created_at', 'build_seconds', 'source_timings')
+
+
+def payload_hash(text: str) -> str:
+    """Content hash used as the payload key"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def split_markdown(text: str) -> Tuple[str, str]:
+    """
+    Split markdown into (head, body) after its "Generated on" line
+    
+    head + body == text. The head is empty if there is no such line near
+    the top.
+    """
+    offset = 0
+    for _ in range(HEADER_MAX_LINES):
+        end = text.find('\n', offset)
+        if text.startswith(HEADER_MARKER, offset):
+            end = len(text) if end < 0 else end + 1
+            return text[:end], text[end:]
+        if end < 0:
+            break
+        offset = end + 1
+    return '', text
+
+
+def split_json(data: Dict) -> Tuple[str, str]:
+    """
+    Serialize a fact sheet's JSON as (head, body) text
+    
+    The head holds the per-run keys (VOLATILE_JSON_KEYS) and the body the
+    rest; head + body is the JSON object with the per-run keys first.
+    """
+    volatile = {key: data[key] for key in VOLATILE_JSON_KEYS if key in data}
+    stable = {key: value for key, value in data.items() if key not in volatile}
+    if not volatile or not stable:
+        return '', json.dumps(data)
+    # '{"a": 1' + ', ' + '"b": 2}' == json.dumps({"a": 1, "b": 2})
+    return json.dumps(volatile)[:-1] + ', ', json.dumps(stable)[1:]
+
+
+def encode_payload(text: str, codec: str) -> Tuple[str, bytes]:
+    """
+    Encode text for the payloads table
+    
+    Returns:
+        Tuple of (content hash, encoded bytes)
+    """
+    raw = text.encode('utf-8')
+    if codec == 'zlib':
+        data = zlib.compress(raw, ZLIB_LEVEL)
+    elif codec == 'none':
+        data = raw
+    else:
+        raise ValueError(f"Unknown payload codec '{codec}'")
+    return hashlib.sha256(raw).hexdigest(), data
+
+
+def decode_payload(codec: str, data: bytes) -> str:
+    """Decode a payloads row back to text (registered as an SQL function)"""
+    if data is None:
+        return None
+    if codec == 'zlib':
+        data = zlib.decompress(data)
+    elif codec != 'none':
+        raise ValueError(f"Unknown payload codec '{codec}'")
+    return bytes(data).decode('utf-8')
@@ -0,0 +1,178 @@
+"""
+Retention and archival for the per-topic history tables
+
+Keeps the newest N fact sheets and newsletters per topic in the hot
+database and moves older rows, in batches, to gzip-compressed monthly
+JSON Lines files. Archived rows stay readable through RetentionManager.
+"""
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Iterator, Optional
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import ARCHIVE_DIR, RETENTION_KEEP_LAST, RETENTION_BATCH_SIZE
+from .database import Database, FACT_SHEET_COLUMNS, NEWSLETTER_COLUMNS
+
+# Archivable tables: (select columns, table alias)
+ARCHIVE_TABLES = {
+    'fact_sheets': (FACT_SHEET_COLUMNS, 'f'),
+    'newsletters': (NEWSLETTER_COLUMNS, 'n'),
+}
+
+
+class RetentionManager:
+    """Prunes old history rows into compressed monthly archive files"""
+    
+    def __init__(self, db: Database, archive_dir: str = ARCHIVE_DIR,
+                 keep_last: int = RETENTION_KEEP_LAST, batch_size: int = RETENTION_BATCH_SIZE):
+        self.db = db
+        self.archive_dir = Path(archive_dir)
+        self.keep_last = keep_last
+        self.batch_size = batch_size
+    
+    def run(self) -> Dict[str, int]:
+        """
+        Apply retention to every topic
+        
+        Returns:
+            Dict with the number of rows archived per table
+        """
+        self._ensure_incremental_vacuum()
+        
+        archived = {table: 0 for table in ARCHIVE_TABLES}
+        for topic in self.db.get_all_topics():
+            keep_last = topic.get('retention_keep_last')
+            if keep_last is None:
+                keep_last = self.keep_last
+            for table in ARCHIVE_TABLES:
+                archived[table] += self._archive_topic(table, topic['id'], keep_last)
+        
+        if any(archived.values()):
+            self._delete_orphan_payloads()
+            self._optimize_search_indexes()
+            # Hand the freed pages back to the filesystem. executescript steps
+            # the pragma to completion; execute() would free a single page.
+            self.db.get_connection().executescript("PRAGMA incremental_vacuum;")
+        
+        return archived
+    
+    def _archive_topic(self, table: str, topic_id: int, keep_last: int) -> int:
+        """Archive rows of one topic beyond its newest `keep_last`, batch by batch"""
+        columns, alias = ARCHIVE_TABLES[table]
+        conn = self.db.get_connection()
+        total = 0
+        
+        while True:
+            # Oldest rows first, so a crash mid-way never archives newer rows
+            # while older ones stay behind
+            rows = conn.execute(f"""
+                SELECT {columns} FROM {table} {alias}
+                WHERE {alias}.id IN (
+                    SELECT id FROM {table}
+                    WHERE topic_id = ?
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT -1 OFFSET ?
+                )
+                ORDER BY {alias}.created_at, {alias}.id
+                LIMIT ?
+            """, (topic_id, keep_last, self.batch_size)).fetchall()
+            if not rows:
+                return total
+            
+            rows = [dict(row) for row in rows]
+            self._write_archive(table, topic_id, rows)
+            
+            ids = [row['id'] for row in rows]
+            placeholders = ','.join('?' * len(ids))
+            with self.db.transaction():
+                if table == 'fact_sheets':
+                    conn.execute(f"DELETE FROM fact_sheet_items WHERE fact_sheet_id IN ({placeholders})", ids)
+                conn.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", ids)
+            total += len(rows)
+    
+    def _write_archive(self, table: str, topic_id: int, rows: List[Dict]):
+        """Append rows to their monthly archive files and flush them to disk"""
+        by_month = {}
+        for row in rows:
+            by_month.setdefault(str(row['created_at'])[:7], []).append(row)
+        
+        for month, month_rows in by_month.items():
+            path = self._archive_path(table, topic_id, month)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Each append adds a gzip member; readers see one continuous stream
+            with open(path, 'ab') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='ab') as archive:
+                    for row in month_rows:
+                        archive.write((json.dumps(row) + "\n").encode('utf-8'))
+                raw.flush()
+                os.fsync(raw.fileno())
+    
+    def _archive_path(self, table: str, topic_id: int, month: str) -> Path:
+        return self.archive_dir / table / f"topic_{topic_id}" / f"{month}.jsonl.gz"
+    
+    def _delete_orphan_payloads(self):
+        """Drop compressed payloads no longer referenced by any row"""
+        conn = self.db.get_connection()
+        with self.db.transaction():
+            conn.execute("""
+                DELETE FROM payloads WHERE hash NOT IN (
+                    SELECT markdown_ref FROM fact_sheets WHERE markdown_ref IS NOT NULL
+                    UNION SELECT json_ref FROM fact_sheets WHERE json_ref IS NOT NULL
+                    UNION SELECT markdown_ref FROM newsletters WHERE markdown_ref IS NOT NULL
+                )
+            """)
+    
+    def _optimize_search_indexes(self):
+        """Merge FTS5 segments so deleted rows stop occupying index pages"""
+        conn = self.db.get_connection()
+        with self.db.transaction():
+            for table in ARCHIVE_TABLES:
+                conn.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('optimize')")
+    
+    def _ensure_incremental_vacuum(self):
+        """
+        Switch older database files to auto_vacuum=INCREMENTAL
+        
+        New files get it from Database's connection setup; files created
+        before that need a one-off VACUUM for the mode to take effect.
+        """
+        conn = self.db.get_connection()
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+    
+    def archived_months(self, table: str, topic_id: int) -> List[str]:
+        """List the months (YYYY-MM) that have archived rows for a topic"""
+        directory = self.archive_dir / table / f"topic_{topic_id}"
+        if not directory.exists():
+            return []
+        return sorted(path.name[:-len(".jsonl.gz")] for path in directory.glob("*.jsonl.gz"))
+    
+    def iter_archived(self, table: str, topic_id: int, month: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Read archived rows (read-only), oldest first
+        
+        Args:
+            table: 'fact_sheets' or 'newsletters'
+            topic_id: Topic to read
+            month: Optional YYYY-MM to read a single month
+        """
+        if table not in ARCHIVE_TABLES:
+            raise ValueError(f"Unknown archive table '{table}'")
+        
+        months = [month] if month else self.archived_months(table, topic_id)
+        seen = set()  # A crash between archive write and delete can duplicate rows
+        for name in months:
+            path = self._archive_path(table, topic_id, name)
+            if not path.exists():
+                continue
+            with gzip.open(path, 'rt', encoding='utf-8') as archive:
+                for line in archive:
+                    row = json.loads(line)
+                    if row['id'] not in seen:
+                        seen.add(row['id'])
+                        yield row
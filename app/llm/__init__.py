@@ -3,6 +3,15 @@ LLM module for Newsletter Generator
 """
 from .style_extractor import StyleExtractor
 from .newsletter_generator import NewsletterGenerator
+from .style_cache import StyleProfileCache
+from .llm_cache import LLMCache, get_llm_cache
+from .ollama_client import OllamaClient, OllamaGeneration, OllamaGenerationError
+from .request_queue import (
+    LLMRequestQueue, LLMRequestCancelled, PRIORITY_INTERACTIVE, PRIORITY_SCHEDULED, get_llm_queue
+)
 
-__all__ = ['StyleExtractor', 'NewsletterGenerator']
+__all__ = ['StyleExtractor', 'NewsletterGenerator', 'StyleProfileCache',
+           'OllamaClient', 'OllamaGeneration', 'OllamaGenerationError', 'LLMCache', 'get_llm_cache',
+           'LLMRequestQueue', 'LLMRequestCancelled', 'PRIORITY_INTERACTIVE', 'PRIORITY_SCHEDULED',
+           'get_llm_queue']
 
@@ -0,0 +1,141 @@
+"""
+On-disk LLM response cache
+
+Stores completed Ollama generations in SQLite, keyed by model, prompt hash,
+options and seed. Entries are evicted least recently used first once the
+stored responses exceed LLM_CACHE_MAX_BYTES. Sampling is only repeatable
+with a fixed seed, so only seeded requests are cached; OllamaClient pins
+seed and temperature on every request in deterministic mode
+(LLM_DETERMINISTIC, off by default).
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import LLM_CACHE_PATH, LLM_CACHE_MAX_BYTES
+
+
+class LLMCache:
+    """SQLite-backed generation cache with LRU, size-bounded eviction"""
+    
+    def __init__(self, path: str, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        """
+        Args:
+            path: SQLite file for cached responses
+            max_bytes: Total response size kept before the least recently used are evicted
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS generations (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                metrics TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_generations_last_used ON generations (last_used)")
+        self._conn.commit()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+    
+    @staticmethod
+    def make_key(model: str, prompt: str, options: Optional[Dict] = None, seed: Optional[int] = None) -> str:
+        """Cache key for a generation request"""
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        options = {name: value for name, value in (options or {}).items() if name != 'seed'}
+        material = json.dumps([model, prompt_hash, options, seed], sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+    
+    def lookup(self, key: str) -> Optional[Dict]:
+        """
+        Get a cached generation and mark it recently used
+        
+        Returns:
+            Dict with response and metrics (of the original generation), or None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT response, metrics FROM generations WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._conn.execute("UPDATE generations SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return {"response": row['response'], "metrics": json.loads(row['metrics'])}
+    
+    def store(self, key: str, model: str, response: str, metrics: Optional[Dict] = None):
+        """Cache a completed generation, evicting least recently used entries beyond max_bytes"""
+        size = len(response.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO generations (key, model, response, metrics, size, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (key, model, response, json.dumps(metrics or {}), size, now, now))
+            self._stats["stores"] += 1
+            self._evict()
+            self._conn.commit()
+    
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM generations").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for row in self._conn.execute("SELECT key, size FROM generations ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            victims.append((row['key'],))
+            total -= row['size']
+        self._conn.executemany("DELETE FROM generations WHERE key = ?", victims)
+        self._stats["evictions"] += len(victims)
+    
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters since startup, plus entries, stored bytes and hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM generations").fetchone()
+        stats["entries"], stats["bytes"] = row[0], row[1]
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / total if total else 0.0
+        return stats
+    
+    def clear(self):
+        """Drop every cached generation"""
+        with self._lock:
+            self._conn.execute("DELETE FROM generations")
+            self._conn.commit()
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_shared_cache: Optional[LLMCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Get the process-wide LLM cache (None if LLM_CACHE_PATH is empty)"""
+    global _shared_cache
+    if not LLM_CACHE_PATH:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMCache(LLM_CACHE_PATH)
+        return _shared_cache
@@ -1,26 +1,36 @@
 """
 Newsletter Generator using Ollama
 """
-import requests
-import json
-from typing import Dict
+from typing import Dict, Optional
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from config.settings import OLLAMA_BASE_URL, OLLAMA_MODEL, NEWSLETTER_TITLE_TEMPLATE, NEWSLETTER_DATE_FORMAT
+from utils.http_client import HTTPClient, get_http_client
+from llm.ollama_client import OllamaClient, OllamaGeneration, OllamaGenerationError
+from llm.request_queue import PRIORITY_INTERACTIVE
 from datetime import datetime
 
+GENERATION_OPTIONS = {"temperature": 0.7, "top_p": 0.9}
+GENERATION_TIMEOUT = 300  # Longer timeout for generation
+
 
 class NewsletterGenerator:
     """Generates newsletters from fact sheets using Ollama"""
     
-    def __init__(self, model: str = OLLAMA_MODEL, base_url: str = OLLAMA_BASE_URL):
+    def __init__(self, model: str = OLLAMA_MODEL, base_url: str = OLLAMA_BASE_URL,
+                 http_client: HTTPClient = None, priority: int = PRIORITY_INTERACTIVE):
         self.model = model
         self.base_url = base_url
+        self.http = http_client or get_http_client()
+        # Priority of this instance's requests in the shared LLM request queue
+        self.ollama = OllamaClient(model, base_url, self.http, priority=priority)
+        self.last_metrics: Dict = {}  # Timings of the last generate() call
     
-    def generate(self, fact_sheet_markdown: str, style_profile: Dict, topic: str) -> str:
+    def generate(self, fact_sheet_markdown: str, style_profile: Dict, topic: str,
+                 raise_errors: bool = False) -> str:
         """
         Generate newsletter from fact sheet
         
@@ -28,10 +38,68 @@ class NewsletterGenerator:
             fact_sheet_markdown: Markdown fact sheet
             style_profile: Writing style profile from StyleExtractor
             topic: Topic name
+            raise_errors: Raise instead of returning an error or partial newsletter
         
         Returns:
-            Generated newsletter in Markdown format
+            Generated newsletter in Markdown format (if generation stops
+            early, the partial text with a note saying so)
+        
+        Raises:
+            OllamaGenerationError: If raise_errors is set and generation
+                fails or stops early
+        """
+        prompt = self._build_prompt(fact_sheet_markdown, style_profile, topic)
+        try:
+            response = self._call_ollama(prompt)
+            return self.format_newsletter(topic, response)
+        
+        except OllamaGenerationError as e:
+            print(f"Error generating newsletter: {e}")
+            self.last_metrics = e.metrics
+            if raise_errors:
+                raise
+            if e.partial:
+                return self.format_newsletter(topic, e.partial, stopped_early=str(e))
+            return f"# Newsletter Generation Error\n\nError: {str(e)}"
+        
+        except Exception as e:
+            print(f"Error generating newsletter: {e}")
+            if raise_errors:
+                raise OllamaGenerationError(f"Generation failed: {e}") from e
+            return f"# Newsletter Generation Error\n\nError: {str(e)}"
+    
+    def generate_stream(self, fact_sheet_markdown: str, style_profile: Dict, topic: str,
+                        use_cache: bool = True) -> OllamaGeneration:
+        """
+        Start generating a newsletter and return the token stream
+        
+        Iterate over the result for text chunks; format_newsletter(topic,
+        generation.text) gives the newsletter so far. generation.error and
+        generation.metrics are set once the stream ends.
+        
+        The request waits its turn in the shared LLM request queue, so this
+        returns without raising: if Ollama cannot be reached, the stream
+        ends without text and generation.error holds the
+        OllamaGenerationError.
+        
+        With use_cache=False the LLM cache is neither read nor written, so
+        the model is asked again even when a cached newsletter exists.
         """
+        prompt = self._build_prompt(fact_sheet_markdown, style_profile, topic)
+        return self.ollama.generate_stream(prompt, GENERATION_OPTIONS, GENERATION_TIMEOUT, use_cache=use_cache)
+    
+    def format_newsletter(self, topic: str, body: str, stopped_early: Optional[str] = None) -> str:
+        """Add the title and date header (and a note if generation stopped early)"""
+        date_str = datetime.now().strftime(NEWSLETTER_DATE_FORMAT)
+        title = NEWSLETTER_TITLE_TEMPLATE.format(topic=topic)
+        
+        newsletter = f"# {title}\n\n*Generated on {date_str}*\n\n---\n\n{body}"
+        if stopped_early:
+            newsletter += f"\n\n---\n\n*Generation stopped early ({stopped_early}); this newsletter is incomplete.*"
+        return newsletter
+    
+    def _build_prompt(self, fact_sheet_markdown: str, style_profile: Dict, topic: str) -> str:
+        """Newsletter prompt from the fact sheet and style profile"""
         # Format style profile for prompt
         style_text = f"""
 Tone: {style_profile.get('tone', 'professional')}
@@ -41,7 +109,7 @@ Common Phrases: {', '.join(style_profile.get('common_phrases', []))}
 """
         
         # Create prompt
-        prompt = f"""Write a newsletter using ONLY information from the FACT SHEET below.
+        return f"""Write a newsletter using ONLY information from the FACT SHEET below.
 
 CRITICAL RULES:
 1. Use ONLY information from the fact sheet - NO hallucinations or made-up facts
@@ -64,39 +132,11 @@ Generate a well-structured newsletter that:
 - Uses ONLY facts from the fact sheet
 
 Format the newsletter in Markdown with appropriate headings, paragraphs, and links."""
-        
-        try:
-            response = self._call_ollama(prompt)
-            
-            # Add header with date
-            date_str = datetime.now().strftime(NEWSLETTER_DATE_FORMAT)
-            title = NEWSLETTER_TITLE_TEMPLATE.format(topic=topic)
-            
-            newsletter = f"# {title}\n\n*Generated on {date_str}*\n\n---\n\n{response}"
-            
-            return newsletter
-        
-        except Exception as e:
-            print(f"Error generating newsletter: {e}")
-            return f"# Newsletter Generation Error\n\nError: {str(e)}"
     
     def _call_ollama(self, prompt: str) -> str:
-        """Call Ollama API"""
-        url = f"{self.base_url}/api/generate"
-        
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0.7,
-                "top_p": 0.9
-            }
-        }
-        
-        response = requests.post(url, json=payload, timeout=300)  # Longer timeout for generation
-        response.raise_for_status()
-        
-        result = response.json()
-        return result.get("response", "")
-
+        """Call Ollama API (streamed, so metrics and partial output are kept)"""
+        generation = self.ollama.generate_stream(prompt, GENERATION_OPTIONS, GENERATION_TIMEOUT)
+        try:
+            return generation.result()
+        finally:
+            self.last_metrics = generation.metrics
@@ -0,0 +1,308 @@
+"""
+Streaming Ollama client
+
+generate_stream() returns an OllamaGeneration that yields text as Ollama
+emits it (the /api/generate NDJSON stream). The text received so far stays
+on the generation object when the request is cancelled, times out or
+fails, and its metrics record time to first token, tokens per second and
+Ollama's own prompt_eval/eval durations.
+
+Completed generations go to the LLM cache when the request has a seed; in
+deterministic mode (LLM_DETERMINISTIC, off by default) every request gets
+LLM_SEED and a pinned temperature, so an unchanged prompt is answered from
+the cache.
+Requests that do reach Ollama first wait for a slot in the process-wide
+LLM request queue, taken when the stream is first iterated.
+"""
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import (
+    OLLAMA_BASE_URL, OLLAMA_MODEL, OLLAMA_CONNECT_TIMEOUT, OLLAMA_IDLE_TIMEOUT, LLM_DETERMINISTIC, LLM_SEED,
+    LLM_DETERMINISTIC_TEMPERATURE
+)
+from utils.http_client import HTTPClient, get_http_client
+from llm.llm_cache import LLMCache, get_llm_cache
+from llm.request_queue import (
+    LLMRequest, LLMRequestQueue, LLMRequestCancelled, PRIORITY_INTERACTIVE, get_llm_queue
+)
+
+# Final-chunk fields reported in nanoseconds, stored in seconds
+DURATION_FIELDS = ('total_duration', 'load_duration', 'prompt_eval_duration', 'eval_duration')
+
+
+class OllamaGenerationError(Exception):
+    """A generation that failed, timed out or was cancelled, with the text received so far"""
+    
+    def __init__(self, message: str, partial: str = "", metrics: Optional[Dict] = None):
+        super().__init__(message)
+        self.partial = partial
+        self.metrics = metrics or {}
+
+
+class OllamaGeneration:
+    """
+    One streaming generation
+    
+    Iterate over it to receive text chunks. Afterwards (or at any point)
+    `text` holds everything received, `metrics` the timings, and `error`
+    the exception that ended the stream early, if any.
+    """
+    
+    def __init__(self, send: Optional[Callable[[], Any]], timeout: float, queue: Optional[LLMRequestQueue] = None,
+                 priority: int = PRIORITY_INTERACTIVE,
+                 on_complete: Optional[Callable[['OllamaGeneration'], None]] = None):
+        """
+        Args:
+            send: Sends the request and returns the streaming HTTP response
+                (None for a cached generation)
+            timeout: Overall deadline in seconds, from when the request is sent
+            queue: Request queue to get a slot from before sending
+            priority: Queue priority
+            on_complete: Called once the stream finishes without error
+        """
+        self._send = send
+        self._queue = queue
+        self._priority = priority
+        self._request: Optional[LLMRequest] = None
+        self._response = None
+        self._started = time.monotonic()
+        self._deadline = self._started + timeout
+        self._on_complete = on_complete
+        self._cancelled = threading.Event()
+        self._consumed = False
+        self._cached: Optional[Dict] = None
+        self.timeout = timeout
+        self.text = ""
+        self.done = False
+        self.error: Optional[Exception] = None
+        self.metrics: Dict = {}
+    
+    @classmethod
+    def from_cache(cls, entry: Dict) -> 'OllamaGeneration':
+        """A generation that replays a cached response (metrics of the original, marked cached)"""
+        generation = cls(None, 0)
+        generation._cached = entry
+        return generation
+    
+    def __iter__(self) -> Iterator[str]:
+        if self._consumed:
+            return
+        self._consumed = True
+        if self._cached is not None:
+            yield from self._replay()
+            return
+        tokens = 0
+        first_token_at = None
+        try:
+            if self._queue is not None:
+                queued_at = time.monotonic()
+                self._request = self._queue.enqueue(self._priority)
+                if self._cancelled.is_set():
+                    raise OllamaGenerationError("Generation cancelled")
+                self._request.wait()
+                self.metrics['queue_wait'] = time.monotonic() - queued_at
+            self._started = time.monotonic()
+            self._deadline = self._started + self.timeout
+            if self._cancelled.is_set():
+                raise OllamaGenerationError("Generation cancelled")
+            try:
+                self._response = self._send()
+            except Exception as e:
+                raise OllamaGenerationError(f"Ollama request failed: {e}") from e
+            if self._cancelled.is_set():
+                raise OllamaGenerationError("Generation cancelled")
+            
+            for line in self._response.iter_lines():
+                if self._cancelled.is_set():
+                    raise OllamaGenerationError("Generation cancelled", self.text)
+                if time.monotonic() > self._deadline:
+                    raise OllamaGenerationError(f"Generation timed out after {self.timeout}s", self.text)
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get('error'):
+                    raise OllamaGenerationError(f"Ollama error: {chunk['error']}", self.text)
+                
+                token = chunk.get('response', '')
+                if token:
+                    if first_token_at is None:
+                        first_token_at = time.monotonic()
+                    tokens += 1
+                    self.text += token
+                    yield token
+                if chunk.get('done'):
+                    self.done = True
+                    self._record_final(chunk)
+                    break
+            if not self.done:
+                # The connection closed without Ollama's final chunk
+                raise OllamaGenerationError("stream ended before completion", self.text)
+        except Exception as e:
+            if self._cancelled.is_set() or isinstance(e, LLMRequestCancelled):
+                self.error = OllamaGenerationError("Generation cancelled", self.text)
+            elif isinstance(e, OllamaGenerationError):
+                self.error = e
+            else:
+                self.error = OllamaGenerationError(f"Generation failed: {e}", self.text)
+        finally:
+            if self._response is not None:
+                self._response.close()
+            if self._request is not None:
+                self._request.release()
+            self._record_timing(first_token_at, tokens)
+            if self.error is not None:
+                self.error.partial = self.text
+                self.error.metrics = self.metrics
+            elif self.done and self._on_complete is not None:
+                self._on_complete(self)
+    
+    def _replay(self) -> Iterator[str]:
+        self.text = self._cached['response']
+        self.done = True
+        self.metrics = dict(self._cached['metrics'], cached=True)
+        elapsed = time.monotonic() - self._started
+        self.metrics['elapsed'] = self.metrics['time_to_first_token'] = elapsed
+        if self.text:
+            yield self.text
+    
+    def cancel(self):
+        """Stop the generation; the text received so far is kept (safe from any thread)"""
+        self._cancelled.set()
+        request = self._request
+        if request is not None:
+            # Leaves the queue if still waiting for a slot
+            request.cancel()
+        response = self._response
+        if response is not None:
+            # Unblocks a reader waiting on a silent stream
+            response.close()
+    
+    def result(self) -> str:
+        """
+        Consume the stream and return the full text
+        
+        Raises:
+            OllamaGenerationError: If the stream ended early (.partial has the text so far)
+        """
+        for _ in self:
+            pass
+        if self.error is not None:
+            raise self.error
+        return self.text
+    
+    def _record_final(self, chunk: Dict):
+        for field in DURATION_FIELDS:
+            if field in chunk:
+                self.metrics[field] = chunk[field] / 1e9
+        for field in ('prompt_eval_count', 'eval_count'):
+            if field in chunk:
+                self.metrics[field] = chunk[field]
+        if self.metrics.get('eval_duration') and self.metrics.get('eval_count'):
+            self.metrics['tokens_per_second'] = self.metrics['eval_count'] / self.metrics['eval_duration']
+    
+    def _record_timing(self, first_token_at: Optional[float], tokens: int):
+        now = time.monotonic()
+        self.metrics['elapsed'] = now - self._started
+        self.metrics['chunks'] = tokens
+        if first_token_at is not None:
+            self.metrics['time_to_first_token'] = first_token_at - self._started
+            if 'tokens_per_second' not in self.metrics and now > first_token_at:
+                # No final chunk (cancelled/failed): estimate from the stream itself
+                self.metrics['tokens_per_second'] = tokens / (now - first_token_at)
+
+
+class OllamaClient:
+    """Calls Ollama's /api/generate with streaming"""
+    
+    def __init__(self, model: str = OLLAMA_MODEL, base_url: str = OLLAMA_BASE_URL,
+                 http_client: HTTPClient = None, cache: LLMCache = None,
+                 deterministic: bool = LLM_DETERMINISTIC, queue: LLMRequestQueue = None,
+                 priority: int = PRIORITY_INTERACTIVE):
+        """
+        Args:
+            model: Ollama model name
+            base_url: Ollama server URL
+            http_client: HTTP client (defaults to the process-wide one)
+            cache: Generation cache (defaults to the process-wide one, if enabled)
+            deterministic: Pin seed and temperature on every request
+            queue: Request queue (defaults to the process-wide one)
+            priority: Queue priority of this client's requests
+        """
+        self.model = model
+        self.base_url = base_url
+        self.http = http_client or get_http_client()
+        self.cache = cache or get_llm_cache()
+        self.deterministic = deterministic
+        self.queue = queue or get_llm_queue()
+        self.priority = priority
+    
+    def generate_stream(self, prompt: str, options: Optional[Dict] = None, timeout: float = 300,
+                        use_cache: bool = True, priority: Optional[int] = None) -> OllamaGeneration:
+        """
+        Queue a generation and return it without waiting for any output
+        
+        Nothing is sent until the generation is iterated: it then waits for
+        a slot in the request queue, and connection errors end up in
+        generation.error.
+        
+        Args:
+            prompt: Prompt text
+            options: Ollama model options (temperature, top_p, seed, ...)
+            timeout: Overall deadline in seconds; the stream is also abandoned
+                if Ollama sends nothing for OLLAMA_IDLE_TIMEOUT seconds
+            use_cache: Serve and store the response through the LLM cache
+                (only requests with a seed are cached)
+            priority: Queue priority (defaults to the client's)
+        """
+        options = dict(options or {})
+        if self.deterministic:
+            options.setdefault('seed', LLM_SEED)
+            options.setdefault('temperature', LLM_DETERMINISTIC_TEMPERATURE)
+        
+        key = None
+        if use_cache and self.cache is not None and options.get('seed') is not None:
+            key = LLMCache.make_key(self.model, prompt, options, options['seed'])
+            entry = self.cache.lookup(key)
+            if entry is not None:
+                return OllamaGeneration.from_cache(entry)
+        
+        payload = {"model": self.model, "prompt": prompt, "stream": True}
+        if options:
+            payload["options"] = options
+        
+        def send():
+            response = self.http.post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+                stream=True,
+                timeout=(OLLAMA_CONNECT_TIMEOUT, min(timeout, OLLAMA_IDLE_TIMEOUT))
+            )
+            response.raise_for_status()
+            return response
+        
+        on_complete = None
+        if key is not None:
+            on_complete = lambda generation: self.cache.store(key, self.model, generation.text, generation.metrics)
+        priority = self.priority if priority is None else priority
+        return OllamaGeneration(send, timeout, self.queue, priority, on_complete)
+    
+    def generate(self, prompt: str, options: Optional[Dict] = None, timeout: float = 300,
+                 use_cache: bool = True, priority: Optional[int] = None) -> str:
+        """
+        Generate and return the full response text
+        
+        Raises:
+            OllamaGenerationError: If generation fails (.partial has the text so far)
+        """
+        return self.generate_stream(prompt, options, timeout, use_cache, priority).result()
+    
+    def cache_stats(self) -> Dict:
+        """LLM cache hit/miss statistics (empty if caching is off)"""
+        return self.cache.stats() if self.cache else {}
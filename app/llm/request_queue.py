@@ -0,0 +1,183 @@
+"""
+Process-wide Ollama request queue
+
+Every Ollama generation (newsletters, style extraction, from the scheduler
+thread or a Streamlit session) takes a slot here first. At most
+OLLAMA_NUM_PARALLEL generations run at once, matching what the Ollama
+server itself serves in parallel; the rest wait in priority order, so an
+interactive request goes ahead of queued scheduled ones (FIFO within a
+priority). Waiting requests can be cancelled, and stats() reports queue
+depth and wait times.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import OLLAMA_NUM_PARALLEL, LLM_QUEUE_WAIT_SAMPLES
+
+PRIORITY_INTERACTIVE = 0  # A user is waiting on the result
+PRIORITY_SCHEDULED = 1  # Background work (scheduled runs, style refreshes)
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_SCHEDULED: "scheduled"}
+
+
+class LLMRequestCancelled(Exception):
+    """The request was cancelled before it got a slot"""
+
+
+class LLMRequest:
+    """A place in the queue; holds a slot once granted until release()"""
+    
+    def __init__(self, queue: 'LLMRequestQueue', priority: int):
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.granted_at: Optional[float] = None
+        self.cancelled = False
+        self.released = False
+        self._queue = queue
+    
+    @property
+    def granted(self) -> bool:
+        return self.granted_at is not None
+    
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Block until the request has a slot
+        
+        Raises:
+            LLMRequestCancelled: If cancel() was called while waiting
+            TimeoutError: If no slot freed up within `timeout` seconds
+        """
+        self._queue._wait(self, timeout)
+    
+    def cancel(self):
+        """Leave the queue (or free the slot if already granted); safe from any thread"""
+        self._queue._cancel(self)
+    
+    def release(self):
+        """Free the slot (idempotent)"""
+        self._queue._release(self)
+    
+    def __enter__(self) -> 'LLMRequest':
+        self.wait()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+class LLMRequestQueue:
+    """Bounded-concurrency priority queue for Ollama requests"""
+    
+    def __init__(self, max_concurrency: int = OLLAMA_NUM_PARALLEL):
+        """
+        Args:
+            max_concurrency: Generations allowed to run at once
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self._cond = threading.Condition()
+        self._heap: List = []  # (priority, sequence, request)
+        self._sequence = itertools.count()
+        self._running = 0
+        self._counts = {"granted": 0, "cancelled": 0, "timed_out": 0}
+        self._waits = {priority: deque(maxlen=LLM_QUEUE_WAIT_SAMPLES) for priority in PRIORITY_NAMES}
+    
+    def enqueue(self, priority: int = PRIORITY_INTERACTIVE) -> LLMRequest:
+        """Join the queue without blocking; call wait() on the result to get the slot"""
+        request = LLMRequest(self, priority)
+        with self._cond:
+            heapq.heappush(self._heap, (priority, next(self._sequence), request))
+            self._grant()
+        return request
+    
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None) -> LLMRequest:
+        """Join the queue and block until granted (use as `with queue.acquire(...):`)"""
+        request = self.enqueue(priority)
+        request.wait(timeout)
+        return request
+    
+    def _grant(self):
+        """Hand free slots to the front of the queue (caller holds the lock)"""
+        granted = False
+        while self._heap and self._running < self.max_concurrency:
+            _, _, request = heapq.heappop(self._heap)
+            if request.cancelled:
+                continue
+            request.granted_at = time.monotonic()
+            self._running += 1
+            self._counts["granted"] += 1
+            self._waits.setdefault(request.priority, deque(maxlen=LLM_QUEUE_WAIT_SAMPLES)).append(
+                request.granted_at - request.enqueued_at
+            )
+            granted = True
+        if granted:
+            self._cond.notify_all()
+    
+    def _wait(self, request: LLMRequest, timeout: Optional[float]):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not request.granted:
+                if request.cancelled:
+                    raise LLMRequestCancelled("LLM request cancelled while queued")
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    request.cancelled = True
+                    self._counts["timed_out"] += 1
+                    raise TimeoutError(f"No LLM slot free within {timeout}s")
+                self._cond.wait(remaining)
+    
+    def _cancel(self, request: LLMRequest):
+        with self._cond:
+            if request.granted:
+                self._release_locked(request)
+            elif not request.cancelled:
+                # Left in the heap and skipped by _grant()
+                request.cancelled = True
+                self._counts["cancelled"] += 1
+                self._cond.notify_all()
+    
+    def _release(self, request: LLMRequest):
+        with self._cond:
+            self._release_locked(request)
+    
+    def _release_locked(self, request: LLMRequest):
+        if request.granted and not request.released:
+            request.released = True
+            self._running -= 1
+            self._grant()
+    
+    def stats(self) -> Dict:
+        """Running and queued requests, counters and recent wait times per priority"""
+        with self._cond:
+            queued = [request for _, _, request in self._heap if not request.cancelled]
+            stats = dict(self._counts, running=self._running, queued=len(queued),
+                         max_concurrency=self.max_concurrency)
+            waits = {priority: list(samples) for priority, samples in self._waits.items()}
+        for priority, name in PRIORITY_NAMES.items():
+            samples = sorted(waits.get(priority, []))
+            stats[f"queued_{name}"] = sum(1 for request in queued if request.priority == priority)
+            stats[f"wait_{name}"] = {
+                "avg": sum(samples) / len(samples) if samples else 0.0,
+                "p95": samples[int(0.95 * (len(samples) - 1))] if samples else 0.0,
+                "max": samples[-1] if samples else 0.0
+            }
+        return stats
+
+
+_shared_queue: Optional[LLMRequestQueue] = None
+_shared_queue_lock = threading.Lock()
+
+
+def get_llm_queue() -> LLMRequestQueue:
+    """Get the process-wide LLM request queue"""
+    global _shared_queue
+    with _shared_queue_lock:
+        if _shared_queue is None:
+            _shared_queue = LLMRequestQueue()
+        return _shared_queue
@@ -0,0 +1,123 @@
+"""
+Stored style profiles, recomputed in the background
+
+Style extraction is a full Ollama round trip over every writing sample, but
+samples rarely change. Profiles are stored in the style_profiles table,
+keyed by a hash of the ordered sample IDs and texts plus the model name.
+add_writing_sample() marks a topic's profile stale; the next get() (or an
+explicit refresh()) recomputes it on a background thread while the
+previous profile keeps being served.
+"""
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Tuple
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from db.database import Database
+from llm.style_extractor import StyleExtractor
+from config.settings import STYLE_PROFILE_WORKERS
+
+
+def samples_hash(samples: List[Dict], model: str) -> str:
+    """Hash of the ordered writing samples (ids and texts) and the model"""
+    digest = hashlib.sha256(model.encode('utf-8'))
+    for sample in samples:
+        text = sample['text'].encode('utf-8')
+        digest.update(f"\0{sample['id']}:{len(text)}\0".encode('ascii'))
+        digest.update(text)
+    return digest.hexdigest()
+
+
+class StyleProfileCache:
+    """Serves stored style profiles and refreshes stale ones in the background"""
+    
+    def __init__(self, db: Database, extractor: StyleExtractor = None, workers: int = STYLE_PROFILE_WORKERS):
+        """
+        Args:
+            db: Database holding writing samples and style profiles
+            extractor: Style extractor (its model is part of the key)
+            workers: Background extractions run at once
+        """
+        self.db = db
+        self.extractor = extractor or StyleExtractor()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="style")
+        # Reentrant: a future that is already done runs its callback (_forget) right away
+        self._lock = threading.RLock()
+        self._in_flight: Dict[Tuple[int, str], Future] = {}
+    
+    def get(self, topic_id: int, wait: bool = True) -> Dict:
+        """
+        Get a topic's style profile without waiting for extraction when possible
+        
+        Args:
+            topic_id: Topic whose writing samples define the style
+            wait: When the topic has no stored profile at all, wait for the
+                first extraction (otherwise return the default profile)
+        
+        Returns:
+            The stored profile (possibly from the previous sample set while a
+            refresh runs), or the default profile if there are no samples
+        """
+        stored = self.db.get_style_profile(topic_id, self.extractor.model)
+        if stored and not stored['stale']:
+            return stored['profile']
+        
+        future = self.refresh(topic_id)
+        if stored:
+            return stored['profile']
+        if wait:
+            return future.result()
+        return self.extractor.extract_style([])
+    
+    def refresh(self, topic_id: int) -> Future:
+        """
+        Recompute a topic's profile in the background unless it is current
+        
+        Returns:
+            Future resolving to the new profile
+        """
+        samples = self.db.get_writing_samples(topic_id)
+        key = samples_hash(samples, self.extractor.model)
+        with self._lock:
+            future = self._in_flight.get((topic_id, key))
+            if future is None:
+                future = self._executor.submit(self._compute, topic_id, samples, key)
+                self._in_flight[(topic_id, key)] = future
+                future.add_done_callback(lambda _: self._forget(topic_id, key))
+        return future
+    
+    def _forget(self, topic_id: int, key: str):
+        with self._lock:
+            self._in_flight.pop((topic_id, key), None)
+    
+    def _compute(self, topic_id: int, samples: List[Dict], key: str) -> Dict:
+        model = self.extractor.model
+        stored = self.db.get_style_profile(topic_id, model)
+        if stored and stored['samples_hash'] == key:
+            if stored['stale']:
+                self.db.save_style_profile(topic_id, model, key, stored['profile'])
+            return stored['profile']
+        if not samples:
+            return self.extractor.extract_style([])
+        
+        try:
+            # Oldest first, so a new sample only changes the last chunk
+            profile = self.extractor.analyze_style([sample['text'] for sample in reversed(samples)])
+        except Exception as e:
+            # Not stored, so the next get() tries again
+            print(f"Error extracting style for topic {topic_id}: {e}")
+            return stored['profile'] if stored else self.extractor.extract_style([])
+        
+        # Samples added during extraction make the new profile stale right away
+        with self.db.transaction():
+            current = samples_hash(self.db.get_writing_samples(topic_id), model)
+            self.db.save_style_profile(topic_id, model, key, profile, stale=current != key)
+        return profile
+    
+    def close(self):
+        """Stop the background workers (running extractions finish first)"""
+        self._executor.shutdown(wait=True)
@@ -1,30 +1,148 @@
 """
 Writing Style Extractor using Ollama
+
+Samples that fit STYLE_CHUNK_TOKENS are analyzed in one call. Larger
+corpora are map-reduced: the samples are packed into chunks of at most that
+many tokens, each chunk gets its own partial profile (concurrently, and
+cached by the chunk's content hash), and the partial profiles are merged
+without another model call. Chunks are packed in the order samples were
+added, so a new sample only changes the last chunk.
 """
-import requests
+import hashlib
 import json
-from typing import List, Dict
+import re
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config.settings import OLLAMA_BASE_URL, OLLAMA_MODEL
+from config.settings import (
+    OLLAMA_BASE_URL, OLLAMA_MODEL, STYLE_CHUNK_TOKENS, STYLE_MAP_WORKERS, STYLE_CHUNK_CACHE_SIZE,
+    STYLE_MAX_PHRASES
+)
+from utils.http_client import HTTPClient, get_http_client
+from llm.ollama_client import OllamaClient
+from llm.request_queue import PRIORITY_INTERACTIVE
+
+CHARS_PER_TOKEN = 4  # Rough average for English text
+SAMPLE_SEPARATOR = "\n\n---\n\n"
+DESCRIPTOR_FIELDS = ('tone', 'structure', 'voice')
+DESCRIPTOR_SPLIT = re.compile(r'[,;/]|\band\b')
+
+
+def chunk_samples(samples: List[str], budget: int = STYLE_CHUNK_TOKENS) -> List[str]:
+    """
+    Pack samples, in order, into chunks of at most `budget` tokens
+    
+    Samples longer than the budget are split on paragraph breaks (or, for
+    a single huge paragraph, at the nearest space).
+    """
+    max_chars = budget * CHARS_PER_TOKEN
+    pieces = []
+    for sample in samples:
+        pieces.extend(_split_text(sample.strip(), max_chars))
+    
+    chunks = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current}{SAMPLE_SEPARATOR}{piece}" if current else piece
+        if current and len(candidate) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_text(text: str, max_chars: int) -> List[str]:
+    if len(text) <= max_chars:
+        return [text] if text else []
+    pieces = []
+    current = ""
+    for paragraph in text.split("\n\n"):
+        while len(paragraph) > max_chars:
+            cut = paragraph.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(paragraph[:cut])
+            paragraph = paragraph[cut:].lstrip()
+        candidate = f"{current}\n\n{paragraph}" if current else paragraph
+        if current and len(candidate) > max_chars:
+            pieces.append(current)
+            current = paragraph
+        else:
+            current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def merge_profiles(partials: List[Tuple[Dict, int]], max_phrases: int = STYLE_MAX_PHRASES) -> Dict:
+    """
+    Merge per-chunk style profiles into one (the reduce step)
+    
+    Args:
+        partials: (profile, weight) pairs, weight being the chunk's size
+        max_phrases: Maximum common phrases kept
+    
+    Returns:
+        Profile whose descriptors are the most weighted ones across chunks
+    """
+    if len(partials) == 1:
+        return partials[0][0]
+    
+    merged = {}
+    for field in DESCRIPTOR_FIELDS:
+        counts = Counter()
+        for profile, weight in partials:
+            for part in DESCRIPTOR_SPLIT.split(str(profile.get(field) or '')):
+                part = ' '.join(part.split()).lower()
+                if part:
+                    counts[part] += weight
+        merged[field] = ', '.join(part for part, _ in counts.most_common(3))
+    
+    phrases = Counter()
+    spelling = {}
+    for profile, weight in partials:
+        for phrase in profile.get('common_phrases') or []:
+            if not isinstance(phrase, str) or not phrase.strip():
+                continue
+            key = phrase.strip().lower()
+            spelling.setdefault(key, phrase.strip())
+            phrases[key] += weight
+    merged['common_phrases'] = [spelling[key] for key, _ in phrases.most_common(max_phrases)]
+    return merged
 
 
 class StyleExtractor:
     """Extracts writing style from user samples using Ollama"""
     
-    def __init__(self, model: str = OLLAMA_MODEL, base_url: str = OLLAMA_BASE_URL):
+    def __init__(self, model: str = OLLAMA_MODEL, base_url: str = OLLAMA_BASE_URL,
+                 http_client: HTTPClient = None, priority: int = PRIORITY_INTERACTIVE):
         self.model = model
         self.base_url = base_url
+        self.http = http_client or get_http_client()
+        # Priority of this instance's requests in the shared LLM request queue
+        self.ollama = OllamaClient(model, base_url, self.http, priority=priority)
+        # Partial profiles by chunk content hash (LRU)
+        self._chunk_cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._chunk_cache_lock = threading.Lock()
     
     def extract_style(self, writing_samples: List[str]) -> Dict:
         """
         Extract writing style from user samples
         
         Args:
-            writing_samples: List of text samples from the user
+            writing_samples: List of text samples from the user, in the
+                order they were added
         
         Returns:
             Dict with style profile: tone, structure, voice, common_phrases
@@ -32,14 +150,49 @@ class StyleExtractor:
         if not writing_samples:
             return self._default_style()
         
-        # Combine all samples
-        combined_text = "\n\n---\n\n".join(writing_samples)
+        try:
+            return self.analyze_style(writing_samples)
+        
+        except Exception as e:
+            print(f"Error extracting style: {e}")
+            return self._default_style()
+    
+    def analyze_style(self, writing_samples: List[str]) -> Dict:
+        """
+        Extract writing style from user samples, raising on failure
+        
+        Unlike extract_style() this does not fall back to the default
+        profile, so callers that store profiles can tell a real result apart.
+        
+        Raises:
+            Exception: If an Ollama call fails or returns no valid JSON
+        """
+        chunks = chunk_samples(writing_samples)
+        if not chunks:
+            return self._default_style()
+        if len(chunks) == 1:
+            return self._chunk_profile(chunks[0])
+        
+        # Map: one partial profile per chunk, unchanged chunks come from the cache
+        with ThreadPoolExecutor(max_workers=STYLE_MAP_WORKERS, thread_name_prefix="style-map") as executor:
+            profiles = list(executor.map(self._chunk_profile, chunks))
+        
+        # Reduce: weighted merge, no model call
+        return merge_profiles([(profile, len(chunk)) for profile, chunk in zip(profiles, chunks)])
+    
+    def _chunk_profile(self, chunk: str) -> Dict:
+        """Style profile of one chunk of samples, cached by content hash"""
+        key = hashlib.sha256(f"{self.model}\0{chunk}".encode('utf-8')).hexdigest()
+        with self._chunk_cache_lock:
+            if key in self._chunk_cache:
+                self._chunk_cache.move_to_end(key)
+                return self._chunk_cache[key]
         
         # Create prompt
         prompt = f"""Analyze the following writing samples and extract the writing style characteristics.
 
 Writing Samples:
-{combined_text}
+{chunk}
 
 Please provide a JSON object with the following structure:
 {{
@@ -51,41 +204,26 @@ Please provide a JSON object with the following structure:
 
 Respond ONLY with valid JSON, no additional text."""
         
-        try:
-            response = self._call_ollama(prompt)
-            
-            # Try to parse JSON from response
-            # Ollama might return text with JSON, so we need to extract it
-            json_str = self._extract_json(response)
-            style_profile = json.loads(json_str)
-            
-            return style_profile
+        response = self._call_ollama(prompt)
         
-        except Exception as e:
-            print(f"Error extracting style: {e}")
-            return self._default_style()
+        # Try to parse JSON from response
+        # Ollama might return text with JSON, so we need to extract it
+        json_str = self._extract_json(response)
+        profile = json.loads(json_str)
+        
+        with self._chunk_cache_lock:
+            self._chunk_cache[key] = profile
+            while len(self._chunk_cache) > STYLE_CHUNK_CACHE_SIZE:
+                self._chunk_cache.popitem(last=False)
+        return profile
     
     def _call_ollama(self, prompt: str) -> str:
         """Call Ollama API"""
-        url = f"{self.base_url}/api/generate"
-        
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False
-        }
-        
-        response = requests.post(url, json=payload, timeout=120)
-        response.raise_for_status()
-        
-        result = response.json()
-        return result.get("response", "")
+        return self.ollama.generate(prompt, timeout=120)
     
     def _extract_json(self, text: str) -> str:
         """Extract JSON from text response"""
         # Try to find JSON object in the response
-        import re
-        
         # Look for JSON object
         json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', text, re.DOTALL)
         if json_match:
@@ -0,0 +1,202 @@
+"""
+Asynchronous MCP client over stdio
+
+Starts an MCP server process (MCP_SERVER_COMMAND, e.g. the Playwright MCP
+server) and talks JSON-RPC 2.0 to it as newline-delimited JSON. Every
+request gets its own id and future, and a single reader task routes
+responses back by id, so any number of tool calls can be in flight at once.
+
+MCPClient is a synchronous facade for the rest of the app: it runs the
+asyncio client on a background event loop thread, and call_tool() blocks
+only the calling thread.
+"""
+import asyncio
+import itertools
+import json
+import shlex
+import threading
+from typing import Any, Dict, List, Optional
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from config.settings import MCP_SERVER_COMMAND, MCP_REQUEST_TIMEOUT
+
+PROTOCOL_VERSION = "2024-11-05"
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024  # Snapshots of large pages run to several MB per line
+
+
+class MCPError(Exception):
+    """A JSON-RPC error response or a tool call that reported isError"""
+
+
+class AsyncMCPClient:
+    """JSON-RPC client for an MCP server on the other end of a subprocess's stdio"""
+    
+    def __init__(self, command: str = MCP_SERVER_COMMAND, request_timeout: float = MCP_REQUEST_TIMEOUT):
+        """
+        Args:
+            command: Server command line
+            request_timeout: Seconds to wait for any single response
+        """
+        self.command = command
+        self.request_timeout = request_timeout
+        self.server_info: Dict = {}
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+    
+    async def start(self):
+        """Start the server and perform the MCP initialize handshake"""
+        self._process = await asyncio.create_subprocess_exec(
+            *shlex.split(self.command),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=MAX_MESSAGE_BYTES
+        )
+        self._write_lock = asyncio.Lock()
+        self._reader_task = asyncio.create_task(self._read_loop())
+        
+        result = await self.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "automated-newsletter", "version": "1.0"}
+        })
+        self.server_info = result.get("serverInfo", {})
+        await self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+    
+    async def request(self, method: str, params: Optional[Dict] = None) -> Dict:
+        """Send a request and wait for its response"""
+        if self._process is None or self._reader_task.done():
+            raise MCPError("MCP server is not running")
+        
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        try:
+            await self._send(message)
+            return await asyncio.wait_for(future, self.request_timeout)
+        finally:
+            self._pending.pop(request_id, None)
+    
+    async def call_tool(self, name: str, arguments: Optional[Dict] = None) -> Dict:
+        """
+        Call a tool
+        
+        Raises:
+            MCPError: If the server or the tool reports an error
+        """
+        result = await self.request("tools/call", {"name": name, "arguments": arguments or {}})
+        if result.get("isError"):
+            raise MCPError(f"{name} failed: {content_text(result)}")
+        return result
+    
+    async def list_tools(self) -> List[Dict]:
+        result = await self.request("tools/list")
+        return result.get("tools", [])
+    
+    async def _send(self, message: Dict):
+        data = json.dumps(message, separators=(',', ':')).encode('utf-8') + b"\n"
+        async with self._write_lock:
+            self._process.stdin.write(data)
+            await self._process.stdin.drain()
+    
+    async def _read_loop(self):
+        """Route responses to their waiting requests by id"""
+        try:
+            while True:
+                line = await self._process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue  # Not protocol output (e.g. a stray log line)
+                
+                if "method" in message:
+                    if message["method"] == "ping" and "id" in message:
+                        await self._send({"jsonrpc": "2.0", "id": message["id"], "result": {}})
+                    continue  # Other notifications and server requests are not used
+                
+                future = self._pending.get(message.get("id"))
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    error = message["error"]
+                    future.set_exception(MCPError(f"{error.get('code')}: {error.get('message')}"))
+                else:
+                    future.set_result(message.get("result") or {})
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(MCPError("MCP server closed the connection"))
+    
+    async def close(self):
+        """Stop the server process"""
+        if self._process is None:
+            return
+        if self._process.stdin and not self._process.stdin.is_closing():
+            self._process.stdin.close()
+        try:
+            await asyncio.wait_for(self._process.wait(), 5)
+        except asyncio.TimeoutError:
+            self._process.kill()
+            await self._process.wait()
+        if self._reader_task:
+            await self._reader_task
+        self._process = None
+
+
+class MCPClient:
+    """Synchronous facade over AsyncMCPClient, safe to use from many threads"""
+    
+    def __init__(self, command: str = MCP_SERVER_COMMAND, request_timeout: float = MCP_REQUEST_TIMEOUT):
+        """Start the server on a private event loop thread"""
+        self.request_timeout = request_timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="mcp-client", daemon=True)
+        self._thread.start()
+        self._client = AsyncMCPClient(command, request_timeout)
+        try:
+            self._run(self._client.start())
+        except Exception:
+            self.close()
+            raise
+    
+    @property
+    def server_info(self) -> Dict:
+        """The server's name and version from the initialize handshake"""
+        return self._client.server_info
+    
+    def call_tool(self, name: str, arguments: Optional[Dict] = None) -> Dict:
+        """Call a tool and wait for its result (other threads' calls proceed concurrently)"""
+        return self._run(self._client.call_tool(name, arguments))
+    
+    def list_tools(self) -> List[Dict]:
+        return self._run(self._client.list_tools())
+    
+    def _run(self, coroutine) -> Any:
+        # A little over the client's own timeout, so its error surfaces first
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(self.request_timeout + 5)
+    
+    def close(self):
+        """Stop the server and the event loop thread"""
+        if not self._loop.is_running():
+            return
+        try:
+            self._run(self._client.close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+            self._loop.close()
+
+
+def content_text(result: Dict) -> str:
+    """Join the text parts of a tool result's content"""
+    return "\n".join(part.get("text", "") for part in result.get("content", []) if part.get("type") == "text")
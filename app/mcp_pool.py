@@ -0,0 +1,178 @@
+"""
+Pool of Playwright MCP browser pages
+
+Scrapers lease a page (anything with the MCPPlaywrightWrapper interface)
+for one navigate/snapshot sequence and hand it back, so several URLs and
+topics can be scraped in parallel while the browser and its pages stay
+warm between runs. Pages that raised during a lease, that have served
+MCP_PAGE_MAX_USES leases, or that fail a health check after sitting idle
+are closed and replaced.
+
+Playwright MCP drives a single current tab per server, so pages cannot
+share one browser while they are used in parallel. With the default
+MCPPlaywrightWrapper.connect factory each page is a separate MCP server
+and headless browser process (roughly 200-300 MB each); pool size is
+capped at MCP_POOL_MAX_SIZE to bound that.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from mcp_wrapper import MCPPlaywrightWrapper
+from config.settings import (
+    MCP_POOL_SIZE, MCP_POOL_MAX_SIZE, MCP_PAGE_MAX_USES, MCP_LEASE_TIMEOUT, MCP_HEALTH_CHECK_IDLE
+)
+
+
+class _PooledPage:
+    """A page plus its bookkeeping"""
+    
+    __slots__ = ('page', 'uses', 'last_used')
+    
+    def __init__(self, page: Any):
+        self.page = page
+        self.uses = 0
+        self.last_used = time.monotonic()
+
+
+class MCPSessionPool:
+    """Leases browser pages with bounded concurrency and health-based recycling"""
+    
+    def __init__(self, factory: Callable[[], Any] = MCPPlaywrightWrapper.connect, size: int = MCP_POOL_SIZE,
+                 max_uses: int = MCP_PAGE_MAX_USES, health_check_idle: float = MCP_HEALTH_CHECK_IDLE):
+        """
+        Args:
+            factory: Creates a new page/client (navigate, snapshot, ...); by
+                default a wrapper around its own MCP server
+            size: Maximum pages open (and leased) at once, at most MCP_POOL_MAX_SIZE
+            max_uses: Leases after which a page is replaced
+            health_check_idle: Seconds idle after which a page is checked before reuse
+        
+        Raises:
+            ValueError: If size is not between 1 and MCP_POOL_MAX_SIZE
+        """
+        if not 1 <= size <= MCP_POOL_MAX_SIZE:
+            raise ValueError(
+                f"Pool size {size} out of range 1-{MCP_POOL_MAX_SIZE}; each page may be a "
+                f"separate browser process (raise MCP_POOL_MAX_SIZE if memory allows)"
+            )
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.health_check_idle = health_check_idle
+        self._cond = threading.Condition()
+        self._idle: List[_PooledPage] = []
+        self._open = 0
+        self._closed = False
+        self._stats = {"leases": 0, "created": 0, "recycled": 0, "wait_seconds": 0.0}
+    
+    @contextmanager
+    def lease(self, timeout: float = MCP_LEASE_TIMEOUT) -> Iterator[Any]:
+        """
+        Borrow a page for the duration of a with-block
+        
+        Raises:
+            TimeoutError: If no page frees up within `timeout` seconds
+        """
+        entry = self._acquire(timeout)
+        healthy = False
+        try:
+            yield entry.page
+            healthy = True
+        finally:
+            self._release(entry, healthy)
+    
+    def _acquire(self, timeout: float) -> _PooledPage:
+        started = time.monotonic()
+        deadline = started + timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._open >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No browser page free within {timeout}s")
+                    self._cond.wait(remaining)
+                if self._idle:
+                    # Most recently used first: it is the warmest
+                    entry = self._idle.pop()
+                else:
+                    self._open += 1
+                    entry = None
+            
+            if entry is None:
+                entry = self._create()
+            elif time.monotonic() - entry.last_used >= self.health_check_idle and not self._is_healthy(entry.page):
+                self._discard(entry)
+                continue
+            
+            with self._cond:
+                self._stats["leases"] += 1
+                self._stats["wait_seconds"] += time.monotonic() - started
+            return entry
+    
+    def _create(self) -> _PooledPage:
+        try:
+            page = self.factory()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["created"] += 1
+        return _PooledPage(page)
+    
+    def _release(self, entry: _PooledPage, healthy: bool):
+        entry.uses += 1
+        entry.last_used = time.monotonic()
+        if not healthy or entry.uses >= self.max_uses or self._closed:
+            self._discard(entry)
+            return
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+    
+    def _discard(self, entry: _PooledPage):
+        """Close a page and free its slot"""
+        _close(entry.page)
+        with self._cond:
+            self._open -= 1
+            self._stats["recycled"] += 1
+            self._cond.notify()
+    
+    @staticmethod
+    def _is_healthy(page: Any) -> bool:
+        try:
+            if hasattr(page, 'is_healthy'):
+                return bool(page.is_healthy())
+            page.snapshot()
+            return True
+        except Exception:
+            return False
+    
+    def stats(self) -> Dict:
+        """Lease counters plus current open/idle page counts"""
+        with self._cond:
+            return dict(self._stats, open=self._open, idle=len(self._idle))
+    
+    def close(self):
+        """Close all idle pages (leased pages are closed when returned)"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for entry in idle:
+            _close(entry.page)
+
+
+def _close(page: Any):
+    try:
+        if hasattr(page, 'close'):
+            page.close()
+    except Exception as e:
+        print(f"Error closing browser page: {e}")
@@ -2,48 +2,102 @@
 MCP Wrapper for Playwright integration
 
 This wrapper provides a simple interface to Playwright MCP tools.
-In Cursor, these would be called through the MCP interface.
+In Cursor, these would be called through the MCP interface; outside it,
+give the wrapper an MCPClient (or use MCPPlaywrightWrapper.connect()) and
+the calls go to a Playwright MCP server over stdio.
 """
-from typing import List, Dict, Optional
+import json
+import re
+from typing import Optional, Any
+import sys
+from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent))
 
-class MCPPlaywrightWrapper:
+from utils.page_readiness import PageReadinessMixin
+from mcp_client import MCPClient, content_text
+from config.settings import MCP_SERVER_COMMAND
+
+RESULT_SECTION = re.compile(r'### Result\n(.*?)(?:\n###|\Z)', re.DOTALL)
+
+
+class MCPPlaywrightWrapper(PageReadinessMixin):
     """
     Wrapper for Playwright MCP tools
     
-    Note: In actual usage within Cursor, this would call the MCP tools directly.
-    This is a placeholder structure that shows how scrapers should interact with MCP.
+    Without a client this is a placeholder structure that shows how scrapers
+    should interact with MCP (every call is a no-op). With one, each method
+    calls the matching browser_* tool.
+    After navigate(), call wait_for_ready() to get the settled page snapshot.
     """
     
-    def __init__(self):
-        """Initialize MCP wrapper"""
-        # In actual implementation, this would set up MCP connection
-        pass
+    def __init__(self, client: Optional[MCPClient] = None, owns_client: bool = False):
+        """
+        Initialize MCP wrapper
+        
+        Args:
+            client: Connected MCP client (None: placeholder mode)
+            owns_client: Close the client (and its server) in close()
+        """
+        self.client = client
+        self.owns_client = owns_client
+    
+    @classmethod
+    def connect(cls, command: str = MCP_SERVER_COMMAND) -> 'MCPPlaywrightWrapper':
+        """Start a dedicated MCP server (its own browser) and wrap it; usable as an MCPSessionPool factory"""
+        return cls(MCPClient(command), owns_client=True)
+    
+    def _call(self, tool: str, **arguments) -> Optional[str]:
+        if self.client is None:
+            return None
+        arguments = {key: value for key, value in arguments.items() if value is not None}
+        return content_text(self.client.call_tool(tool, arguments))
     
     def navigate(self, url: str):
         """Navigate to a URL using Playwright MCP"""
-        # This would call: mcp_Playwright_browser_navigate(url=url)
-        # For now, this is a placeholder
-        pass
+        self._call("browser_navigate", url=url)
     
-    def snapshot(self) -> Dict:
+    def snapshot(self) -> Any:
         """Get page snapshot using Playwright MCP"""
-        # This would call: mcp_Playwright_browser_snapshot()
-        # Returns accessibility snapshot
-        return {}
+        # Returns the accessibility snapshot text (an empty dict in placeholder mode)
+        text = self._call("browser_snapshot")
+        return {} if text is None else text
     
     def click(self, element: str, ref: str):
         """Click an element using Playwright MCP"""
-        # This would call: mcp_Playwright_browser_click(element=element, ref=ref)
-        pass
+        self._call("browser_click", element=element, ref=ref)
     
     def type(self, element: str, ref: str, text: str):
         """Type text into an element using Playwright MCP"""
-        # This would call: mcp_Playwright_browser_type(element=element, ref=ref, text=text)
-        pass
+        self._call("browser_type", element=element, ref=ref, text=text)
     
     def evaluate(self, function: str, element: Optional[str] = None, ref: Optional[str] = None):
         """Evaluate JavaScript on page using Playwright MCP"""
-        # This would call: mcp_Playwright_browser_evaluate(function=function, element=element, ref=ref)
-        pass
-
+        text = self._call("browser_evaluate", function=function, element=element, ref=ref)
+        if text is None:
+            return None
+        match = RESULT_SECTION.search(text)
+        value = (match.group(1) if match else text).strip()
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    
+    def is_healthy(self) -> bool:
+        """Check that the page still responds (used by MCPSessionPool)"""
+        if self.client is None:
+            return True
+        try:
+            return self.evaluate("() => true") is True
+        except Exception:
+            return False
+    
+    def close(self):
+        """Close the page using Playwright MCP"""
+        if self.client is None:
+            return
+        try:
+            self._call("browser_close")
+        finally:
+            if self.owns_client:
+                self.client.close()
@@ -1,8 +1,11 @@
 """
 Fact Sheet Builder - Creates structured fact sheets from scraped content
 """
-from typing import List, Dict
+from typing import List, Dict, Callable, Tuple, Optional, Set
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import threading
+import time
 import sys
 from pathlib import Path
 
@@ -12,55 +15,80 @@ from scrapers.news_scraper import NewsScraper
 from scrapers.linkedin_scraper import LinkedInScraper
 from scrapers.research_scraper import ResearchScraper
 from scrapers.web_scraper import WebScraper
+from utils.http_client import HTTPClient
+from utils.circuit_breaker import get_circuit_breakers
+from utils.urls import url_hash
+from pipeline.deduplicator import Deduplicator, merge_items
+from pipeline.ranker import Ranker
+from config.settings import SOURCE_TIMEOUTS, SCRAPING_TIMEOUT, FACT_SHEET_MAX_ITEMS
+
+# Sources that can fetch incrementally (only results published since a cutoff)
+RESEARCH_SOURCES = ("arxiv", "semantic_scholar")
 
 
 class FactSheetBuilder:
     """Builds fact sheets from scraped content"""
     
-    def __init__(self):
+    def __init__(self, http_client: HTTPClient = None):
         self.news_scraper = NewsScraper()
         self.linkedin_scraper = LinkedInScraper()
-        self.research_scraper = ResearchScraper()
+        self.research_scraper = ResearchScraper(http_client)
         self.web_scraper = WebScraper()
+        self.deduplicator = Deduplicator()
+        self.ranker = Ranker()
+        # MCP scrapers sharing a single browser tab take turns; with an
+        # MCPSessionPool each lease gets its own page, so no lock is needed
+        self._mcp_lock = threading.Lock()
     
-    def build_fact_sheet(self, topic: str, use_mcp_client=None) -> Dict:
+    def build_fact_sheet(self, topic: str, use_mcp_client=None, since: Optional[Dict[str, datetime]] = None,
+                         seen_urls: Optional[Set[str]] = None) -> Dict:
         """
         Build a fact sheet for a topic
         
+        All sources are scraped concurrently, each with its own deadline
+        (SOURCE_TIMEOUTS) counted from when it starts running. A source that
+        fails or misses its deadline contributes no results and is marked
+        "error" / "timeout" in source_timings; a source whose circuit
+        breaker is open is skipped without being called. Duplicates across
+        sources are merged, then all items are ranked together and only the
+        best FACT_SHEET_MAX_ITEMS are kept.
+        
         Args:
             topic: The topic to build a fact sheet for
-            use_mcp_client: Optional MCP client for Playwright scraping
+            use_mcp_client: Optional MCP client (or MCPSessionPool) for Playwright scraping
+            since: Per research source, only fetch papers published after
+                this time (incremental); sources without an entry fetch the newest
+            seen_urls: url_hash values of papers already in the topic's
+                fact sheets, dropped from the research results
         
         Returns:
             Dict with 'markdown' and 'json_data' keys
         """
-        # Scrape from all sources
-        research_papers = self.research_scraper.scrape(topic)
+        started = time.monotonic()
+        results, timings = self._scrape_sources(self._sources(topic, use_mcp_client, since or {}))
+        if seen_urls:
+            for name in RESEARCH_SOURCES:
+                results[name] = [item for item in results[name] if url_hash(item['url']) not in seen_urls]
         
-        # For Playwright-based scrapers, use MCP if available
-        if use_mcp_client:
-            self.news_scraper._current_topic = topic
-            news_items = self.news_scraper.scrape_with_mcp(use_mcp_client)
-            
-            self.linkedin_scraper._current_topic = topic
-            linkedin_posts = self.linkedin_scraper.scrape_with_mcp(use_mcp_client)
-            
-            self.web_scraper._current_topic = topic
-            web_articles = self.web_scraper.scrape_with_mcp(use_mcp_client)
-        else:
-            # Fallback: return empty lists if MCP not available
-            news_items = []
-            linkedin_posts = []
-            web_articles = []
+        sections, duplicates = self._merge_duplicates({
+            "research_papers": results['arxiv'] + results['semantic_scholar'],
+            "news_headlines": results.get('news', []),
+            "linkedin_posts": results.get('linkedin', []),
+            "web_articles": results.get('web', [])
+        })
+        sections = self._rank(topic, sections, FACT_SHEET_MAX_ITEMS)
         
         # Build JSON structure
         json_data = {
             "topic": topic,
             "created_at": datetime.now().isoformat(),
-            "research_papers": research_papers,
-            "news_headlines": news_items,
-            "linkedin_posts": linkedin_posts,
-            "web_articles": web_articles
+            "research_papers": sections["research_papers"],
+            "news_headlines": sections["news_headlines"],
+            "linkedin_posts": sections["linkedin_posts"],
+            "web_articles": sections["web_articles"],
+            "duplicates_merged": duplicates,
+            "source_timings": timings,
+            "build_seconds": round(time.monotonic() - started, 3)
         }
         
         # Build Markdown
@@ -71,6 +99,148 @@ class FactSheetBuilder:
             "json_data": json_data
         }
     
+    def _merge_duplicates(self, sections: Dict[str, List[Dict]]) -> Tuple[Dict[str, List[Dict]], int]:
+        """
+        Merge duplicate items across all sections
+        
+        Each merged item stays in the section of its first occurrence and
+        lists every source it was found in.
+        
+        Returns:
+            Tuple of (deduplicated sections, number of items merged away)
+        """
+        flat = [(section, item) for section, items in sections.items() for item in items]
+        groups = self.deduplicator.group([item for _, item in flat])
+        
+        merged = {section: [] for section in sections}
+        for group in groups:
+            section = flat[group[0]][0]
+            merged[section].append(merge_items([flat[i][1] for i in group]))
+        return merged, len(flat) - len(groups)
+    
+    def _rank(self, topic: str, sections: Dict[str, List[Dict]], budget: int) -> Dict[str, List[Dict]]:
+        """Keep the `budget` most relevant items across all sections, best first within each section"""
+        flat = [(section, item) for section, items in sections.items() for item in items]
+        ranked = {section: [] for section in sections}
+        for index in self.ranker.top(topic, [item for _, item in flat], budget):
+            section, item = flat[index]
+            ranked[section].append(item)
+        return ranked
+    
+    def _sources(self, topic: str, mcp_client, since: Dict[str, datetime]) -> List[Tuple[str, Callable[[], List[Dict]], Optional[threading.Lock]]]:
+        """List (name, scrape function, lock to hold while scraping) for this build"""
+        # Every source raises through its circuit breaker, so a failed fetch
+        # shows up as an error rather than as a source with no results
+        sources = [
+            ("arxiv", lambda: self.research_scraper.scrape_arxiv(
+                topic, since.get("arxiv"), raise_errors=True), None),
+            ("semantic_scholar", lambda: self.research_scraper.scrape_semantic_scholar(
+                topic, since.get("semantic_scholar"), raise_errors=True), None),
+        ]
+        
+        # For Playwright-based scrapers, use MCP if available
+        if mcp_client:
+            lock = None if hasattr(mcp_client, 'lease') else self._mcp_lock
+            for name, scraper in (("news", self.news_scraper),
+                                  ("linkedin", self.linkedin_scraper),
+                                  ("web", self.web_scraper)):
+                sources.append((name, self._mcp_source(scraper, topic, mcp_client), lock))
+        
+        return sources
+    
+    def _mcp_source(self, scraper, topic: str, mcp_client) -> Callable[[], List[Dict]]:
+        """Bind an MCP scraper to this build's topic and client (errors raise, so they are reported)"""
+        return lambda: scraper.scrape_with_mcp(mcp_client, topic, raise_errors=True)
+    
+    def _scrape_sources(self, sources: List[Tuple[str, Callable[[], List[Dict]], Optional[threading.Lock]]]) -> Tuple[Dict, Dict]:
+        """
+        Run every source concurrently and collect results in source order
+        
+        Each build gets its own threads, one per source, so sources never
+        queue behind another topic's build. A source's deadline starts when
+        it starts running; one waiting for the shared browser tab gives up
+        after waiting its own timeout. A source that misses its deadline is
+        abandoned (its thread finishes in the background).
+        
+        Returns:
+            Tuple of (results by source name, timing info by source name)
+        """
+        breakers = get_circuit_breakers()
+        results = {"arxiv": [], "semantic_scholar": []}
+        timings = {}
+        
+        runnable = []
+        for name, scrape, lock in sources:
+            if breakers.get(name).is_open():
+                results[name] = []
+                timings[name] = {"status": "circuit_open", "seconds": 0.0, "items": 0}
+                continue
+            runnable.append((name, scrape, lock))
+        if not runnable:
+            return results, timings
+        
+        executor = ThreadPoolExecutor(max_workers=len(runnable), thread_name_prefix="fact-sheet-source")
+        futures = []
+        for name, scrape, lock in runnable:
+            timeout = SOURCE_TIMEOUTS.get(name, SCRAPING_TIMEOUT)
+            state = {"ready": threading.Event(), "started": None}
+            futures.append((name, timeout, state, executor.submit(self._timed, scrape, lock, timeout, state)))
+        
+        try:
+            for name, timeout, state, future in futures:
+                # Set once the source runs or gives up on the browser tab,
+                # at most `timeout` after submission
+                state["ready"].wait()
+                try:
+                    if state["started"] is None:
+                        future.result()  # Raises the TimeoutError from _timed
+                    deadline = state["started"] + timeout
+                    items, elapsed = future.result(timeout=max(0, deadline - time.monotonic()))
+                    results[name] = items
+                    timings[name] = {"status": "ok", "seconds": round(elapsed, 3), "items": len(items)}
+                except (FutureTimeoutError, TimeoutError):
+                    print(f"Source {name} missed its {timeout}s deadline")
+                    results[name] = []
+                    timings[name] = {"status": "timeout", "seconds": self._elapsed(state), "items": 0}
+                except Exception as e:
+                    print(f"Error scraping {name}: {e}")
+                    results[name] = []
+                    timings[name] = {"status": "error", "seconds": self._elapsed(state), "items": 0}
+        finally:
+            # Don't wait for abandoned sources; their threads exit when the scrape returns
+            executor.shutdown(wait=False)
+        
+        return results, timings
+    
+    @staticmethod
+    def _timed(scrape: Callable[[], List[Dict]], lock: Optional[threading.Lock], timeout: float,
+               state: Dict) -> Tuple[List[Dict], float]:
+        """
+        Run a scrape function and measure how long it took (excluding lock waits)
+        
+        Records the start time in state["started"] and sets state["ready"]
+        once the scrape starts, or once waiting `timeout` for the lock fails.
+        """
+        try:
+            if lock and not lock.acquire(timeout=timeout):
+                raise TimeoutError(f"waited {timeout}s for the browser tab")
+            state["started"] = time.monotonic()
+        finally:
+            state["ready"].set()
+        try:
+            items = scrape()
+            return items, time.monotonic() - state["started"]
+        finally:
+            if lock:
+                lock.release()
+    
+    @staticmethod
+    def _elapsed(state: Dict) -> float:
+        """Seconds a source has been running (0 if it never started)"""
+        if state["started"] is None:
+            return 0.0
+        return round(time.monotonic() - state["started"], 3)
+    
     def _build_markdown(self, topic: str, data: Dict) -> str:
         """Build Markdown fact sheet"""
         lines = [f"# Fact Sheet: {topic}\n"]
@@ -87,7 +257,10 @@ class FactSheetBuilder:
                     if len(abstract) > 500:
                         abstract = abstract[:500] + "..."
                     lines.append(f"   {abstract}")
-                lines.append(f"   Source: [{paper['source']}]({paper['url']})\n")
+                if len(paper.get('sources', [])) > 1:
+                    lines.append(f"   Sources: {self._source_links(paper)}\n")
+                else:
+                    lines.append(f"   Source: [{paper['source']}]({paper['url']})\n")
         else:
             lines.append("\n## Research Papers\n*No research papers found.*\n")
         
@@ -95,7 +268,7 @@ class FactSheetBuilder:
         if data.get("news_headlines"):
             lines.append("\n## News Headlines\n")
             for item in data["news_headlines"]:
-                lines.append(f"- {item['headline']} ([{item['source']}]({item['url']}))")
+                lines.append(f"- {item['headline']} ({self._source_links(item)})")
             lines.append("")
         else:
             lines.append("\n## News Headlines\n*No news headlines found.*\n")
@@ -113,10 +286,15 @@ class FactSheetBuilder:
         if data.get("web_articles"):
             lines.append("\n## Web Articles\n")
             for item in data["web_articles"]:
-                lines.append(f"- {item['headline']} ([{item['source']}]({item['url']}))")
+                lines.append(f"- {item['headline']} ({self._source_links(item)})")
             lines.append("")
         else:
             lines.append("\n## Web Articles\n*No web articles found.*\n")
         
         return "\n".join(lines)
-
+    
+    @staticmethod
+    def _source_links(item: Dict) -> str:
+        """Markdown links to every source an item was found in"""
+        sources = item.get('sources') or [{"source": item['source'], "url": item['url']}]
+        return ", ".join(f"[{entry['source']}]({entry['url']})" for entry in sources)
@@ -0,0 +1,114 @@
+"""
+Relevance ranking for scraped items
+
+Scores every candidate from every source in one batch: BM25 of the
+headline and abstract against the topic's terms, computed as NumPy
+arrays over the whole candidate set, plus a recency boost that decays
+with the item's publication age. Only the top items within the fact
+sheet budget are kept.
+"""
+import re
+from datetime import datetime, timezone
+from typing import List, Dict, Optional
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import RANKING_RECENCY_WEIGHT, RANKING_RECENCY_HALF_LIFE_DAYS
+
+WORD_PATTERN = re.compile(r'\w+')
+STOPWORDS = {'a', 'an', 'and', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with'}
+
+# Standard BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class Ranker:
+    """Scores scraped items against a topic"""
+    
+    def __init__(self, recency_weight: float = RANKING_RECENCY_WEIGHT,
+                 half_life_days: float = RANKING_RECENCY_HALF_LIFE_DAYS):
+        """
+        Args:
+            recency_weight: Weight of the recency boost (0-1) relative to relevance (0-1)
+            half_life_days: Age at which an item's recency boost halves
+        """
+        self.recency_weight = recency_weight
+        self.half_life_days = half_life_days
+    
+    def score(self, topic: str, items: List[Dict], now: Optional[datetime] = None) -> np.ndarray:
+        """
+        Score items against a topic
+        
+        Returns:
+            Array of scores aligned with `items` (higher is better)
+        """
+        if not items:
+            return np.zeros(0)
+        
+        documents = [_tokenize(f"{item.get('headline') or ''} {item.get('abstract') or ''}") for item in items]
+        relevance = self._bm25(_tokenize(topic), documents)
+        if relevance.max() > 0:
+            relevance = relevance / relevance.max()
+        return relevance + self.recency_weight * self._recency(items, now or datetime.now(timezone.utc))
+    
+    def top(self, topic: str, items: List[Dict], k: int) -> List[int]:
+        """Indexes of the k best items, best first (ties keep source order)"""
+        scores = self.score(topic, items)
+        order = np.argsort(-scores, kind='stable')
+        return order[:k].tolist()
+    
+    def _bm25(self, query: List[str], documents: List[List[str]]) -> np.ndarray:
+        """BM25 of each document against the query terms"""
+        terms = list(dict.fromkeys(term for term in query if term not in STOPWORDS)) or list(dict.fromkeys(query))
+        if not terms:
+            return np.zeros(len(documents))
+        term_ids = {term: index for index, term in enumerate(terms)}
+        
+        # Term-frequency matrix (documents x query terms) from one flat list of hits
+        doc_ids, hit_ids = [], []
+        for doc_index, tokens in enumerate(documents):
+            for token in tokens:
+                term_index = term_ids.get(token)
+                if term_index is not None:
+                    doc_ids.append(doc_index)
+                    hit_ids.append(term_index)
+        tf = np.bincount(
+            np.asarray(doc_ids, dtype=np.int64) * len(terms) + np.asarray(hit_ids, dtype=np.int64),
+            minlength=len(documents) * len(terms)
+        ).reshape(len(documents), len(terms)).astype(float)
+        
+        lengths = np.array([len(tokens) for tokens in documents], dtype=float)
+        average_length = lengths.mean() or 1.0
+        df = (tf > 0).sum(axis=0)
+        idf = np.log1p((len(documents) - df + 0.5) / (df + 0.5))
+        
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / average_length)
+        return ((tf * (BM25_K1 + 1)) / (tf + norm[:, None]) * idf).sum(axis=1)
+    
+    def _recency(self, items: List[Dict], now: datetime) -> np.ndarray:
+        """Exponential decay by publication age; undated items get half the boost"""
+        ages = np.array([_age_days(item.get('published'), now) for item in items], dtype=float)
+        boost = np.power(0.5, np.clip(ages, 0, None) / self.half_life_days)
+        return np.where(np.isnan(ages), 0.5, boost)
+
+
+def _tokenize(text: str) -> List[str]:
+    return WORD_PATTERN.findall(text.lower())
+
+
+def _age_days(published: Optional[str], now: datetime) -> float:
+    """Age in days of an ISO 8601 date/timestamp (NaN if missing or unparseable)"""
+    if not published:
+        return float('nan')
+    try:
+        value = datetime.fromisoformat(published.replace('Z', '+00:00'))
+    except ValueError:
+        return float('nan')
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (now - value).total_seconds() / 86400
@@ -4,29 +4,47 @@ Scheduler for automated newsletter generation
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime, timedelta
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Set
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from db.database import Database
-from pipeline.fact_sheet_builder import FactSheetBuilder
+from db.retention import RetentionManager
+from pipeline.fact_sheet_builder import FactSheetBuilder, RESEARCH_SOURCES
 from llm.style_extractor import StyleExtractor
+from llm.style_cache import StyleProfileCache
 from llm.newsletter_generator import NewsletterGenerator
-from config.settings import FREQUENCY_OPTIONS
+from llm.request_queue import PRIORITY_SCHEDULED
+from config.settings import (
+    FREQUENCY_OPTIONS, RETENTION_INTERVAL_HOURS, INCREMENTAL_RESEARCH, RESEARCH_OVERLAP_DAYS,
+    PIPELINE_MAX_PARALLEL_TOPICS
+)
 
 
 class NewsletterScheduler:
     """Manages scheduled newsletter generation"""
     
-    def __init__(self, db: Database, mcp_client=None):
+    def __init__(self, db: Database, mcp_client=None, max_parallel_topics: int = PIPELINE_MAX_PARALLEL_TOPICS):
+        """
+        Args:
+            db: Database instance
+            mcp_client: Optional MCP client, or an MCPSessionPool to scrape
+                several pages (and topics) at once
+            max_parallel_topics: Due topics processed concurrently
+        """
         self.db = db
         self.scheduler = BackgroundScheduler()
         self.fact_sheet_builder = FactSheetBuilder()
-        self.style_extractor = StyleExtractor()
-        self.newsletter_generator = NewsletterGenerator()
+        # Background work: queued behind interactive generations
+        self.style_extractor = StyleExtractor(priority=PRIORITY_SCHEDULED)
+        self.style_profiles = StyleProfileCache(db, self.style_extractor)
+        self.newsletter_generator = NewsletterGenerator(priority=PRIORITY_SCHEDULED)
+        self.retention_manager = RetentionManager(db)
         self.mcp_client = mcp_client
+        self.max_parallel_topics = max_parallel_topics
         self.running = False
     
     def start(self):
@@ -39,6 +57,12 @@ class NewsletterScheduler:
                 id='newsletter_check',
                 replace_existing=True
             )
+            self.scheduler.add_job(
+                self._run_retention,
+                trigger=IntervalTrigger(hours=RETENTION_INTERVAL_HOURS),
+                id='retention',
+                replace_existing=True
+            )
             self.scheduler.start()
             self.running = True
     
@@ -50,14 +74,30 @@ class NewsletterScheduler:
     
     def _check_and_run_pipeline(self):
         """Check all topics and run pipeline if due"""
-        topics = self.db.get_all_topics()
+        due = [topic for topic in self.db.get_all_topics() if self._should_run(topic)]
         
-        for topic in topics:
-            if self._should_run(topic):
-                try:
-                    self._run_pipeline(topic['id'], topic['topic_name'])
-                except Exception as e:
-                    print(f"Error running pipeline for topic {topic['topic_name']}: {e}")
+        if self.max_parallel_topics > 1 and len(due) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_parallel_topics, thread_name_prefix="topic") as executor:
+                list(executor.map(self._run_topic, due))
+        else:
+            for topic in due:
+                self._run_topic(topic)
+    
+    def _run_topic(self, topic: Dict):
+        """Run the pipeline for one topic, logging instead of raising"""
+        try:
+            self._run_pipeline(topic['id'], topic['topic_name'])
+        except Exception as e:
+            print(f"Error running pipeline for topic {topic['topic_name']}: {e}")
+    
+    def _run_retention(self):
+        """Archive history beyond each topic's retention policy"""
+        try:
+            archived = self.retention_manager.run()
+            if any(archived.values()):
+                print(f"Retention archived: {archived}")
+        except Exception as e:
+            print(f"Error running retention: {e}")
     
     def _should_run(self, topic: Dict) -> bool:
         """Check if pipeline should run for a topic"""
@@ -87,39 +127,86 @@ class NewsletterScheduler:
         """Run the full pipeline for a topic"""
         print(f"Running pipeline for topic: {topic_name}")
         
-        # Step 1: Build fact sheet
+        run_started = datetime.now()
+        
+        # Step 1: Build fact sheet (only research not fetched before, if enabled)
+        since = self._research_since(topic_id) if INCREMENTAL_RESEARCH else {}
         fact_sheet = self.fact_sheet_builder.build_fact_sheet(
             topic_name,
-            use_mcp_client=self.mcp_client
-        )
-        
-        # Step 2: Save fact sheet
-        self.db.save_fact_sheet(
-            topic_id,
-            fact_sheet['markdown'],
-            fact_sheet['json_data']
+            use_mcp_client=self.mcp_client,
+            since=since,
+            seen_urls=self._seen_urls(topic_id, since)
         )
         
-        # Step 3: Get writing samples and extract style
-        writing_samples = self.db.get_writing_samples(topic_id)
-        sample_texts = [sample['text'] for sample in writing_samples]
-        style_profile = self.style_extractor.extract_style(sample_texts)
+        # Step 2: Get the stored style profile (re-extracted in the background
+        # when the writing samples changed)
+        style_profile = self.style_profiles.get(topic_id)
         
-        # Step 4: Generate newsletter
+        # Step 3: Generate newsletter. A failed or incomplete generation
+        # raises before anything is saved, so neither last_run nor the
+        # research marks move and the next run fetches this research again.
         newsletter = self.newsletter_generator.generate(
             fact_sheet['markdown'],
             style_profile,
-            topic_name
+            topic_name,
+            raise_errors=True
         )
         
-        # Step 5: Save newsletter
-        self.db.save_newsletter(topic_id, newsletter)
-        
-        # Step 6: Update last_run
-        self.db.update_topic_last_run(topic_id, datetime.now())
+        # Step 4: Save fact sheet, newsletter and last_run in one commit so a
+        # crash never leaves a fact sheet without its newsletter
+        with self.db.transaction():
+            self.db.save_fact_sheet(
+                topic_id,
+                fact_sheet['markdown'],
+                fact_sheet['json_data']
+            )
+            self.db.save_newsletter(topic_id, newsletter)
+            # A research source that failed keeps its old mark, so the next
+            # run fetches the window it missed
+            timings = fact_sheet['json_data'].get('source_timings', {})
+            for source in RESEARCH_SOURCES:
+                if timings.get(source, {}).get('status') == 'ok':
+                    self.db.set_fetched_through(topic_id, source, run_started)
+            self.db.update_topic_last_run(topic_id, datetime.now())
         
         print(f"Pipeline completed for topic: {topic_name}")
     
+    def _research_since(self, topic_id: int) -> Dict[str, datetime]:
+        """
+        Per research source, the cutoff for this run's incremental fetch
+        
+        Each source's last successful fetch, minus RESEARCH_OVERLAP_DAYS:
+        papers show up in the APIs a day or more after their publication
+        date. Sources never fetched successfully have no cutoff. Topics that
+        ran before these marks were kept start from their last_run.
+        """
+        marks = self.db.get_fetched_through(topic_id)
+        if not marks:
+            last_run = self._last_run(topic_id)
+            marks = {source: last_run for source in RESEARCH_SOURCES} if last_run else {}
+        since = {}
+        for source in RESEARCH_SOURCES:
+            mark = marks.get(source)
+            if mark:
+                since[source] = mark - timedelta(days=RESEARCH_OVERLAP_DAYS)
+        return since
+    
+    def _seen_urls(self, topic_id: int, since: Dict[str, datetime]) -> Set[str]:
+        """url_hash of items the topic's fact sheets took in within the overlap window"""
+        if not since:
+            return set()
+        return {item['url_hash'] for item in self.db.get_new_items_since(topic_id, min(since.values()))}
+    
+    def _last_run(self, topic_id: int) -> Optional[datetime]:
+        """Get a topic's last run time, or None if it never ran"""
+        topic = self.db.get_topic(topic_id)
+        if not topic or not topic.get('last_run'):
+            return None
+        try:
+            return datetime.fromisoformat(topic['last_run'])
+        except ValueError:
+            return None
+    
     def run_manual(self, topic_id: int):
         """Manually trigger pipeline for a topic"""
         topic = self.db.get_topic(topic_id)
@@ -2,13 +2,15 @@
 Base scraper class with common functionality
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Callable, Optional, Any
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from config.settings import MAX_RESULTS_PER_SOURCE
+from utils.circuit_breaker import CircuitOpenError, get_circuit_breakers
+from utils.page_readiness import wait_for_ready
 
 
 class BaseScraper(ABC):
@@ -23,16 +25,66 @@ class BaseScraper(ABC):
         Scrape content for a given topic
         
         Returns:
-            List of dicts with keys: source, headline, abstract (optional), url
+            List of dicts with keys: source, headline, abstract (optional), url,
+            published (optional, ISO 8601), doi / arxiv_id (optional)
         """
         pass
     
-    def format_result(self, source: str, headline: str, url: str, abstract: str = "") -> Dict:
+    def format_result(self, source: str, headline: str, url: str, abstract: str = "", published: str = "") -> Dict:
         """Format a result dictionary"""
-        return {
+        result = {
             "source": source,
             "headline": headline,
             "abstract": abstract,
             "url": url
         }
-
+        if published:
+            result["published"] = published
+        return result
+    
+    def call_source(self, source: str, label: str, fetch: Callable[..., List[Dict]], *args,
+                    raise_errors: bool = False) -> List[Dict]:
+        """
+        Run a source's fetch function through that source's circuit breaker
+        
+        Errors are logged and yield no results, as before; they also count
+        toward opening the breaker, after which the source is skipped
+        without a network call until its cooldown ends.
+        
+        Args:
+            source: Breaker name (matches the SOURCE_TIMEOUTS keys)
+            label: Human-readable source name for log messages
+            fetch: Function that returns results or raises on failure
+            raise_errors: Re-raise errors (after the breaker has counted
+                them) instead of returning no results
+        """
+        try:
+            return get_circuit_breakers().get(source).call(fetch, *args)
+        except CircuitOpenError as e:
+            if raise_errors:
+                raise
+            print(f"Skipping {label}: {e}")
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error scraping {label}: {e}")
+        return []
+    
+    def load_page(self, mcp_client, url: str, selector: Optional[str] = None) -> Any:
+        """
+        Navigate the MCP browser to a URL and return the snapshot once the page is ready
+        
+        Args:
+            mcp_client: MCP client with navigate() and snapshot(), or an
+                MCPSessionPool (a page is leased for this load)
+            url: Page to load
+            selector: CSS selector that marks the results as rendered (optional)
+        """
+        if hasattr(mcp_client, 'lease'):
+            with mcp_client.lease() as page:
+                return self.load_page(page, url, selector)
+        
+        mcp_client.navigate(url=url)
+        if hasattr(mcp_client, 'wait_for_ready'):
+            return mcp_client.wait_for_ready(selector=selector)
+        return wait_for_ready(mcp_client.snapshot, getattr(mcp_client, 'evaluate', None), selector=selector)
@@ -0,0 +1,158 @@
+"""
+Declarative result-card extractors for accessibility snapshots
+
+Each site is described by a CardExtractor: which nodes are result cards,
+where the headline and link live inside a card, and which page regions to
+skip. extract() walks the parsed snapshot once and yields keyword
+arguments for BaseScraper.format_result.
+"""
+import re
+from typing import Dict, Iterator, Optional, Tuple, Any
+from urllib.parse import urljoin, urlsplit, parse_qs
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.snapshot_parser import SnapshotNode, parse_snapshot, walk, find_all, first
+
+# Page chrome that never contains results
+CHROME_ROLES = frozenset({'banner', 'navigation', 'contentinfo', 'complementary', 'search', 'dialog'})
+# Card parts left out of text-based headlines
+NOISE_ROLES = frozenset({'button', 'img', 'menu', 'toolbar'})
+
+
+class CardExtractor:
+    """Extracts result cards from a snapshot according to a declarative spec"""
+    
+    def __init__(self, source: str, card_roles: Tuple[str, ...], url_pattern: str = r'.',
+                 headline_roles: Optional[Tuple[str, ...]] = None, card_requires: Optional[str] = None,
+                 abstract_roles: Tuple[str, ...] = (), base_url: str = "", exclude_hosts: Tuple[str, ...] = (),
+                 headline_chars: int = 200, prune_roles: frozenset = CHROME_ROLES):
+        """
+        Args:
+            source: Source name given to every result (empty: the result's host)
+            card_roles: Roles of nodes that can be result cards
+            url_pattern: Regex the card's link URL must match (first matching link wins)
+            headline_roles: Roles whose name is the headline (first found, else the
+                link text); None uses the card's whole text, truncated
+            card_requires: Role that must occur inside a node for it to count as a card
+            abstract_roles: Roles whose names, joined, form the abstract
+            base_url: Base for relative URLs
+            exclude_hosts: Result URLs on these hosts are skipped
+            headline_chars: Maximum headline length
+            prune_roles: Roles whose subtrees are never searched
+        """
+        self.source = source
+        self.card_roles = frozenset(card_roles)
+        self.url_pattern = re.compile(url_pattern)
+        self.headline_roles = frozenset(headline_roles) if headline_roles else None
+        self.card_requires = card_requires
+        self.abstract_roles = frozenset(abstract_roles)
+        self.base_url = base_url
+        self.exclude_hosts = exclude_hosts
+        self.headline_chars = headline_chars
+        self.prune_roles = prune_roles
+    
+    def extract(self, snapshot: Any, limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Yield format_result keyword arguments for each result card
+        
+        Args:
+            snapshot: Snapshot text, dict or parsed tree
+            limit: Stop after this many results
+        """
+        root = parse_snapshot(snapshot)
+        seen = set()
+        for card in find_all(root, self._is_card, prune=self._prune):
+            if limit is not None and len(seen) >= limit:
+                return
+            result = self._extract_card(card)
+            if result is None or result['url'] in seen:
+                continue
+            seen.add(result['url'])
+            yield result
+    
+    def _prune(self, node: SnapshotNode) -> bool:
+        return node.role in self.prune_roles
+    
+    def _is_card(self, node: SnapshotNode) -> bool:
+        if node.role not in self.card_roles:
+            return False
+        if self.card_requires is None:
+            return True
+        return first(node, lambda child: child is not node and child.role == self.card_requires) is not None
+    
+    def _extract_card(self, card: SnapshotNode) -> Optional[Dict]:
+        link = first(card, self._is_result_link)
+        if link is None:
+            return None
+        url = self._resolve(link.url)
+        if not url:
+            return None
+        
+        if self.headline_roles is None:
+            headline = ' '.join(
+                node.name for node in walk(card, prune=self._is_noise)
+                if node.name and not self._is_noise(node)
+            )
+        else:
+            heading = first(card, lambda node: node.role in self.headline_roles and bool(node.name))
+            headline = heading.name if heading else link.name
+        headline = ' '.join(headline.split())[:self.headline_chars]
+        if not headline:
+            return None
+        
+        abstract = ""
+        if self.abstract_roles:
+            abstract = ' '.join(node.name for node in find_all(card, self._is_abstract) if node.name)
+        host = urlsplit(url).hostname or ''
+        source = self.source or (host[4:] if host.startswith('www.') else host)
+        return {"source": source, "headline": headline, "url": url, "abstract": abstract}
+    
+    def _is_result_link(self, node: SnapshotNode) -> bool:
+        return node.role == 'link' and bool(node.url) and self.url_pattern.search(node.url) is not None
+    
+    def _is_abstract(self, node: SnapshotNode) -> bool:
+        return node.role in self.abstract_roles
+    
+    @staticmethod
+    def _is_noise(node: SnapshotNode) -> bool:
+        return node.role in NOISE_ROLES
+    
+    def _resolve(self, url: str) -> str:
+        url = urljoin(self.base_url, url) if self.base_url else url
+        parts = urlsplit(url)
+        if parts.path == '/url' and 'q' in parse_qs(parts.query):
+            # Google redirect links carry the target in ?q=
+            url = parse_qs(parts.query)['q'][0]
+            parts = urlsplit(url)
+        host = (parts.hostname or '').lower()
+        if not parts.scheme.startswith('http') or any(host == h or host.endswith('.' + h) for h in self.exclude_hosts):
+            return ""
+        return url
+
+
+GOOGLE_NEWS = CardExtractor(
+    source="Google News",
+    card_roles=('article',),
+    url_pattern=r'\./(?:read|articles)/',
+    headline_roles=('heading', 'link'),
+    base_url="https://news.google.com/"
+)
+
+GOOGLE_SEARCH = CardExtractor(
+    source="",
+    card_roles=('link',),
+    card_requires='heading',
+    headline_roles=('heading',),
+    exclude_hosts=('google.com',)
+)
+
+LINKEDIN_POSTS = CardExtractor(
+    source="LinkedIn",
+    card_roles=('article', 'listitem'),
+    url_pattern=r'/feed/update/|/posts/',
+    headline_roles=None,
+    base_url="https://www.linkedin.com/"
+)
@@ -1,9 +1,9 @@
 """
 LinkedIn scraper using Playwright MCP
 """
-import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 from .base_scraper import BaseScraper
+from .extractors import LINKEDIN_POSTS
 
 
 class LinkedInScraper(BaseScraper):
@@ -18,35 +18,28 @@ class LinkedInScraper(BaseScraper):
         results = []
         return results
     
-    def scrape_with_mcp(self, mcp_client) -> List[Dict]:
+    def scrape_with_mcp(self, mcp_client, topic: Optional[str] = None, raise_errors: bool = False) -> List[Dict]:
         """
         Scrape using Playwright MCP client
         
         Note: LinkedIn scraping may require authentication for better results.
         This focuses on public posts only.
+        
+        With raise_errors, a failed scrape raises instead of returning [].
         """
-        results = []
-        topic = getattr(self, '_current_topic', '')
+        topic = topic or getattr(self, '_current_topic', '')
         
         if not topic:
-            return results
+            return []
         
-        try:
-            # Navigate to LinkedIn search
-            search_url = f"https://www.linkedin.com/search/results/content/?keywords={topic.replace(' ', '%20')}"
-            mcp_client.navigate(url=search_url)
-            
-            # Wait for page to load
-            time.sleep(3)
-            
-            # Get page snapshot
-            snapshot = mcp_client.snapshot()
-            
-            # Extract post summaries from snapshot
-            # This would need parsing logic based on LinkedIn's structure
-            
-        except Exception as e:
-            print(f"Error scraping LinkedIn: {e}")
+        return self.call_source("linkedin", "LinkedIn", self._fetch_posts, topic, mcp_client, raise_errors=raise_errors)
+    
+    def _fetch_posts(self, topic: str, mcp_client) -> List[Dict]:
+        """Scrape LinkedIn content search for a topic, raising on failure"""
+        # Navigate to LinkedIn search
+        search_url = f"https://www.linkedin.com/search/results/content/?keywords={topic.replace(' ', '%20')}"
+        # Wait until the page settles (post markup changes too often for a selector)
+        snapshot = self.load_page(mcp_client, search_url)
         
-        return results
-
+        # Extract post summaries from the result cards
+        return [self.format_result(**fields) for fields in LINKEDIN_POSTS.extract(snapshot, limit=self.max_results)]
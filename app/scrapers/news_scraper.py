@@ -1,9 +1,9 @@
 """
 News scraper using Playwright MCP
 """
-import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 from .base_scraper import BaseScraper
+from .extractors import GOOGLE_NEWS
 
 
 class NewsScraper(BaseScraper):
@@ -27,35 +27,27 @@ class NewsScraper(BaseScraper):
         # For now, return empty list - actual scraping happens via MCP wrapper
         return results
     
-    def scrape_with_mcp(self, mcp_client) -> List[Dict]:
+    def scrape_with_mcp(self, mcp_client, topic: Optional[str] = None, raise_errors: bool = False) -> List[Dict]:
         """
         Scrape using Playwright MCP client
         
         This method should be called with an MCP client that has Playwright tools
+        
+        With raise_errors, a failed scrape raises instead of returning [].
         """
-        results = []
-        topic = getattr(self, '_current_topic', '')
+        topic = topic or getattr(self, '_current_topic', '')
         
         if not topic:
-            return results
-        
-        try:
-            # Navigate to Google News
-            search_url = f"https://news.google.com/search?q={topic.replace(' ', '+')}"
-            mcp_client.navigate(url=search_url)
-            
-            # Wait for page to load
-            time.sleep(2)
-            
-            # Get page snapshot to find headlines
-            snapshot = mcp_client.snapshot()
-            
-            # Extract headlines and links from the snapshot
-            # This would need to be parsed from the accessibility snapshot
-            # For now, this is a template structure
-            
-        except Exception as e:
-            print(f"Error scraping news: {e}")
+            return []
         
-        return results
-
+        return self.call_source("news", "news", self._fetch_news, topic, mcp_client, raise_errors=raise_errors)
+    
+    def _fetch_news(self, topic: str, mcp_client) -> List[Dict]:
+        """Scrape Google News for a topic, raising on failure"""
+        # Navigate to Google News
+        search_url = f"https://news.google.com/search?q={topic.replace(' ', '+')}"
+        # Wait for the result articles to render, then take the snapshot
+        snapshot = self.load_page(mcp_client, search_url, selector="article")
+        
+        # Extract headlines and links from the result cards
+        return [self.format_result(**fields) for fields in GOOGLE_NEWS.extract(snapshot, limit=self.max_results)]
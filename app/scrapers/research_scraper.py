@@ -1,118 +1,200 @@
 """
 Research paper scraper using arXiv and Semantic Scholar APIs
 """
-import requests
-from typing import List, Dict
+from typing import List, Dict, Optional, Iterator
+from datetime import datetime, timezone
+import io
+import xml.etree.ElementTree as ET
 from .base_scraper import BaseScraper
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config.settings import ARXIV_MAX_RESULTS, SEMANTIC_SCHOLAR_MAX_RESULTS
+from config.settings import (
+    ARXIV_MAX_RESULTS, ARXIV_PAGE_SIZE, ARXIV_INCREMENTAL_MAX_RESULTS,
+    SEMANTIC_SCHOLAR_MAX_RESULTS, HTTP_CACHE_TTLS
+)
+from utils.http_client import HTTPClient, get_http_client
 
 
 class ResearchScraper(BaseScraper):
     """Scrapes research papers from arXiv and Semantic Scholar"""
     
-    def scrape(self, topic: str) -> List[Dict]:
+    def __init__(self, http_client: HTTPClient = None):
+        super().__init__()
+        self.http = http_client or get_http_client()
+    
+    def scrape(self, topic: str, since: Optional[datetime] = None) -> List[Dict]:
         """
         Scrape research papers for a topic from arXiv and Semantic Scholar
-        """
-        results = []
         
-        # Scrape from arXiv
-        arxiv_results = self._scrape_arxiv(topic)
-        results.extend(arxiv_results)
+        Args:
+            topic: Topic to search for
+            since: Only return papers published after this time (incremental mode)
         
-        # Scrape from Semantic Scholar
-        semantic_results = self._scrape_semantic_scholar(topic)
-        results.extend(semantic_results)
+        Each source is capped by its own limit (ARXIV_MAX_RESULTS,
+        SEMANTIC_SCHOLAR_MAX_RESULTS), as in a fact sheet build.
+        """
+        return self.scrape_arxiv(topic, since) + self.scrape_semantic_scholar(topic, since)
+    
+    def scrape_arxiv(self, topic: str, since: Optional[datetime] = None, raise_errors: bool = False) -> List[Dict]:
+        """
+        Scrape from arXiv API (through the arXiv circuit breaker)
         
-        return results[:self.max_results]
+        With raise_errors, a failed fetch raises instead of returning [].
+        """
+        return self.call_source("arxiv", "arXiv", self._fetch_arxiv, topic, since, raise_errors=raise_errors)
     
-    def _scrape_arxiv(self, topic: str) -> List[Dict]:
-        """Scrape from arXiv API"""
+    def _fetch_arxiv(self, topic: str, since: Optional[datetime] = None) -> List[Dict]:
+        """
+        Fetch papers from the arXiv API, raising on failure
+        
+        Without `since`, fetches the newest ARXIV_MAX_RESULTS entries. With
+        it, pages through results newest-first and stops at the first entry
+        submitted at or before `since` (or after ARXIV_INCREMENTAL_MAX_RESULTS).
+        """
         results = []
-        try:
-            # arXiv API endpoint
-            url = "http://export.arxiv.org/api/query"
+        since_utc = _to_utc(since) if since else None
+        # arXiv API endpoint
+        url = "http://export.arxiv.org/api/query"
+        page_size = ARXIV_PAGE_SIZE if since_utc else ARXIV_MAX_RESULTS
+        limit = ARXIV_INCREMENTAL_MAX_RESULTS if since_utc else ARXIV_MAX_RESULTS
+        start = 0
+        
+        while start < limit:
             params = {
                 "search_query": f"all:{topic}",
-                "start": 0,
-                "max_results": ARXIV_MAX_RESULTS,
+                "start": start,
+                "max_results": min(page_size, limit - start),
                 "sortBy": "submittedDate",
                 "sortOrder": "descending"
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = self.http.get(url, params=params, timeout=30, cache_ttl=HTTP_CACHE_TTLS["arxiv"])
             response.raise_for_status()
             
-            # Parse XML response
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(response.content)
-            
-            # Namespace for arXiv XML
-            ns = {'atom': 'http://www.w3.org/2005/Atom'}
+            entries = 0
+            reached_seen = False
+            for entry in self._iter_arxiv_entries(response.content):
+                entries += 1
+                if since_utc and entry['published'] and entry['published'] <= since_utc:
+                    reached_seen = True
+                    break
+                results.append(self.format_result(
+                    source="arXiv",
+                    headline=entry['title'],
+                    url=entry['url'],
+                    abstract=entry['abstract'],
+                    published=entry['published'].isoformat() if entry['published'] else ""
+                ))
             
-            for entry in root.findall('atom:entry', ns):
-                title_elem = entry.find('atom:title', ns)
-                summary_elem = entry.find('atom:summary', ns)
-                link_elem = entry.find('atom:id', ns)
-                
-                if title_elem is not None and link_elem is not None:
-                    title = title_elem.text.strip() if title_elem.text else ""
-                    abstract = summary_elem.text.strip() if summary_elem is not None and summary_elem.text else ""
-                    paper_url = link_elem.text if link_elem.text else ""
-                    
-                    results.append(self.format_result(
-                        source="arXiv",
-                        headline=title,
-                        url=paper_url,
-                        abstract=abstract
-                    ))
-        
-        except Exception as e:
-            print(f"Error scraping arXiv: {e}")
+            if reached_seen or entries < params["max_results"]:
+                break
+            start += entries
         
         return results
     
-    def _scrape_semantic_scholar(self, topic: str) -> List[Dict]:
-        """Scrape from Semantic Scholar API"""
-        results = []
-        try:
-            # Semantic Scholar API endpoint
-            url = "https://api.semanticscholar.org/graph/v1/paper/search"
-            params = {
-                "query": topic,
-                "limit": SEMANTIC_SCHOLAR_MAX_RESULTS,
-                "sort": "relevance"
-            }
-            headers = {
-                "Accept": "application/json"
-            }
-            
-            response = requests.get(url, params=params, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+    def _iter_arxiv_entries(self, content: bytes) -> Iterator[Dict]:
+        """
+        Stream entries out of an arXiv Atom feed
+        
+        Uses iterparse and clears each entry once read, so memory does not
+        grow with the size of the feed.
+        """
+        ns = '{http://www.w3.org/2005/Atom}'
+        for _, elem in ET.iterparse(io.BytesIO(content), events=('end',)):
+            if elem.tag != f'{ns}entry':
+                continue
             
-            if 'data' in data:
-                for paper in data['data']:
-                    title = paper.get('title', '')
-                    abstract = paper.get('abstract', '')
-                    paper_id = paper.get('paperId', '')
-                    paper_url = f"https://www.semanticscholar.org/paper/{paper_id}" if paper_id else ""
-                    
-                    results.append(self.format_result(
-                        source="Semantic Scholar",
-                        headline=title,
-                        url=paper_url,
-                        abstract=abstract
-                    ))
+            title = elem.findtext(f'{ns}title')
+            paper_url = elem.findtext(f'{ns}id')
+            if title is not None and paper_url is not None:
+                published = elem.findtext(f'{ns}published')
+                yield {
+                    "title": title.strip(),
+                    "abstract": (elem.findtext(f'{ns}summary') or "").strip(),
+                    "url": paper_url.strip(),
+                    "published": _parse_timestamp(published) if published else None
+                }
+            elem.clear()
+    
+    def scrape_semantic_scholar(self, topic: str, since: Optional[datetime] = None,
+                                raise_errors: bool = False) -> List[Dict]:
+        """
+        Scrape from Semantic Scholar API (through its circuit breaker)
         
-        except Exception as e:
-            print(f"Error scraping Semantic Scholar: {e}")
+        With raise_errors, a failed fetch raises instead of returning [].
+        """
+        return self.call_source("semantic_scholar", "Semantic Scholar", self._fetch_semantic_scholar, topic, since,
+                                raise_errors=raise_errors)
+    
+    def _fetch_semantic_scholar(self, topic: str, since: Optional[datetime] = None) -> List[Dict]:
+        """
+        Fetch papers from the Semantic Scholar API, raising on failure
+        
+        With `since`, restricts results to papers published on or after that
+        date. Only the fields the fact sheet uses are requested, plus the
+        DOI / arXiv ids used to match papers already found on arXiv and the
+        publication date used for ranking.
+        """
+        results = []
+        # Semantic Scholar API endpoint
+        url = "https://api.semanticscholar.org/graph/v1/paper/search"
+        params = {
+            "query": topic,
+            "limit": SEMANTIC_SCHOLAR_MAX_RESULTS,
+            "sort": "relevance",
+            "fields": "title,abstract,externalIds,publicationDate"  # paperId is always included
+        }
+        if since:
+            params["publicationDateOrYear"] = f"{since:%Y-%m-%d}:"
+        headers = {
+            "Accept": "application/json"
+        }
+        
+        response = self.http.get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=30,
+            cache_ttl=HTTP_CACHE_TTLS["semantic_scholar"]
+        )
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        if 'data' in data:
+            for paper in data['data']:
+                title = paper.get('title') or ''
+                abstract = paper.get('abstract') or ''
+                paper_id = paper.get('paperId', '')
+                paper_url = f"https://www.semanticscholar.org/paper/{paper_id}" if paper_id else ""
+                
+                result = self.format_result(
+                    source="Semantic Scholar",
+                    headline=title,
+                    url=paper_url,
+                    abstract=abstract,
+                    published=paper.get('publicationDate') or ""
+                )
+                external_ids = paper.get('externalIds') or {}
+                if external_ids.get('DOI'):
+                    result['doi'] = external_ids['DOI']
+                if external_ids.get('ArXiv'):
+                    result['arxiv_id'] = external_ids['ArXiv']
+                results.append(result)
         
         return results
 
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    """Parse an Atom timestamp (e.g. 2024-05-01T17:59:59Z) as an aware datetime"""
+    try:
+        return datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _to_utc(value: datetime) -> datetime:
+    """Convert a datetime to UTC, treating naive values (like last_run) as local time"""
+    return value.astimezone(timezone.utc)
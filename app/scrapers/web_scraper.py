@@ -1,9 +1,10 @@
 """
 Web scraper using Playwright MCP for general web articles
 """
-import time
-from typing import List, Dict
+from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
 from .base_scraper import BaseScraper
+from .extractors import GOOGLE_SEARCH
 
 
 class WebScraper(BaseScraper):
@@ -18,18 +19,29 @@ class WebScraper(BaseScraper):
         results = []
         return results
     
-    def scrape_with_mcp(self, mcp_client) -> List[Dict]:
+    def scrape_with_mcp(self, mcp_client, topic: Optional[str] = None, raise_errors: bool = False) -> List[Dict]:
         """
         Scrape using Playwright MCP client
         
         Searches for articles on various public sites related to the topic.
+        
+        With raise_errors, a failed scrape raises instead of returning [].
         """
-        results = []
-        topic = getattr(self, '_current_topic', '')
+        topic = topic or getattr(self, '_current_topic', '')
         
         if not topic:
-            return results
+            return []
+        
+        return self.call_source("web", "web", self._fetch_articles, topic, mcp_client, raise_errors=raise_errors)
+    
+    def _fetch_articles(self, topic: str, mcp_client) -> List[Dict]:
+        """
+        Search the configured sites for a topic
         
+        Sites are loaded in parallel when mcp_client is an MCPSessionPool.
+        A failing site is skipped; the source only counts as failed (and
+        raises) when every site failed.
+        """
         # List of sites to search (public, non-news sites)
         search_sites = [
             f"https://www.google.com/search?q={topic.replace(' ', '+')}+site:medium.com",
@@ -37,19 +49,28 @@ class WebScraper(BaseScraper):
             f"https://www.google.com/search?q={topic.replace(' ', '+')}+site:github.com",
         ]
         
-        for search_url in search_sites[:2]:  # Limit to first 2 sites
+        def search(search_url: str):
             try:
-                mcp_client.navigate(url=search_url)
-                time.sleep(2)
-                
-                snapshot = mcp_client.snapshot()
-                
-                # Extract article titles and links from snapshot
-                # This would need parsing logic based on search results structure
+                # Wait for the search results container
+                snapshot = self.load_page(mcp_client, search_url, selector="#search")
                 
+                # Extract article titles and links from the search results
+                return list(GOOGLE_SEARCH.extract(snapshot, limit=self.max_results)), None
             except Exception as e:
                 print(f"Error scraping web: {e}")
-                continue
+                return [], e
         
-        return results
-
+        sites = search_sites[:2]  # Limit to first 2 sites
+        if hasattr(mcp_client, 'lease'):
+            # A page pool can load every site at once
+            with ThreadPoolExecutor(max_workers=len(sites)) as executor:
+                outcomes = list(executor.map(search, sites))
+        else:
+            outcomes = [search(search_url) for search_url in sites]
+        
+        errors = [error for _, error in outcomes if error]
+        if errors and len(errors) == len(sites):
+            raise errors[-1]
+        
+        results = [self.format_result(**fields) for found, _ in outcomes for fields in found]
+        return results[:self.max_results]
@@ -6,6 +6,7 @@ import sys
 from pathlib import Path
 from datetime import datetime
 import json
+import time
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -13,9 +14,16 @@ sys.path.append(str(Path(__file__).parent.parent))
 from db.database import Database
 from pipeline.fact_sheet_builder import FactSheetBuilder
 from pipeline.scheduler import NewsletterScheduler
-from llm.style_extractor import StyleExtractor
 from llm.newsletter_generator import NewsletterGenerator
-from config.settings import FREQUENCY_OPTIONS
+from llm.style_extractor import StyleExtractor
+from llm.style_cache import StyleProfileCache
+from utils.http_client import get_http_client
+from utils.circuit_breaker import get_circuit_breakers
+from llm.llm_cache import get_llm_cache
+from llm.request_queue import get_llm_queue
+from config.settings import FREQUENCY_OPTIONS, HISTORY_PAGE_SIZE
+
+STREAM_RENDER_INTERVAL = 0.1  # Seconds between re-renders of a streaming newsletter
 
 # Page configuration
 st.set_page_config(
@@ -31,11 +39,16 @@ if 'db' not in st.session_state:
 if 'scheduler' not in st.session_state:
     st.session_state.scheduler = NewsletterScheduler(st.session_state.db)
 
+# Someone is waiting on these extractions, so unlike the scheduler's cache
+# they run at interactive priority in the LLM request queue
+if 'style_profiles' not in st.session_state:
+    st.session_state.style_profiles = StyleProfileCache(st.session_state.db, StyleExtractor())
+
 # Sidebar navigation
 st.sidebar.title("📰 Newsletter Generator")
 page = st.sidebar.radio(
     "Navigation",
-    ["Topics Manager", "Writing Samples", "Fact Sheets", "Generate Newsletter"]
+    ["Topics Manager", "Writing Samples", "Fact Sheets", "Generate Newsletter", "Search"]
 )
 
 # Topics Manager Page
@@ -143,6 +156,8 @@ elif page == "Writing Samples":
             if text_to_save:
                 try:
                     st.session_state.db.add_writing_sample(selected_topic_id, text_to_save)
+                    # Re-extract the style now so generation does not wait for it
+                    st.session_state.style_profiles.refresh(selected_topic_id)
                     st.success("Writing sample saved!")
                     st.rerun()
                 except Exception as e:
@@ -195,24 +210,57 @@ elif page == "Fact Sheets":
                         fact_sheet['markdown'],
                         fact_sheet['json_data']
                     )
+                    st.session_state.pop(f"fact_sheet_pages_{selected_topic_id}", None)
                     st.success("Fact sheet generated!")
                     st.rerun()
                 except Exception as e:
                     st.error(f"Error: {e}")
         
-        # Display fact sheets
-        fact_sheets = st.session_state.db.get_all_fact_sheets(selected_topic_id)
+        # Display fact sheets one page at a time; a body is only loaded when
+        # its sheet is opened (expander contents run even while collapsed)
+        pages_key = f"fact_sheet_pages_{selected_topic_id}"
+        if pages_key not in st.session_state:
+            st.session_state[pages_key] = [None]  # Keyset cursor for each visited page
+        page_starts = st.session_state[pages_key]
+        
+        fact_sheets = st.session_state.db.list_fact_sheets(
+            selected_topic_id,
+            limit=HISTORY_PAGE_SIZE,
+            before=page_starts[-1]
+        )
         
         if fact_sheets:
             st.subheader("Fact Sheet History")
-            for idx, sheet in enumerate(fact_sheets, 1):
-                with st.expander(f"Fact Sheet {idx} - {sheet['created_at']}"):
+            offset = (len(page_starts) - 1) * HISTORY_PAGE_SIZE
+            for idx, meta in enumerate(fact_sheets, offset + 1):
+                with st.expander(f"Fact Sheet {idx} - {meta['created_at']} ({meta['size']:,} chars)"):
+                    if not st.checkbox("Show fact sheet", key=f"open_{meta['id']}"):
+                        continue
+                    sheet = st.session_state.db.get_fact_sheet(meta['id'])
+                    if not sheet:
+                        st.info("This fact sheet was archived.")
+                        continue
                     st.markdown(sheet['markdown'])
                     
                     # Show JSON data
                     if st.checkbox(f"Show JSON Data", key=f"json_{sheet['id']}"):
                         json_data = json.loads(sheet['json_data'])
                         st.json(json_data)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if len(page_starts) > 1 and st.button("← Newer"):
+                    page_starts.pop()
+                    st.rerun()
+            with col2:
+                if len(fact_sheets) == HISTORY_PAGE_SIZE and st.button("Older →"):
+                    last = fact_sheets[-1]
+                    page_starts.append((last['created_at'], last['id']))
+                    st.rerun()
+        elif len(page_starts) > 1:
+            # Page emptied underneath us (e.g. history pruned); start over
+            st.session_state[pages_key] = [None]
+            st.rerun()
         else:
             st.info("No fact sheets for this topic yet. Generate one above!")
     else:
@@ -243,32 +291,83 @@ elif page == "Generate Newsletter":
             # Get writing samples
             writing_samples = st.session_state.db.get_writing_samples(selected_topic_id)
             
-            if st.button("Generate Newsletter"):
-                with st.spinner("Generating newsletter..."):
-                    try:
-                        # Extract style
-                        if writing_samples:
-                            sample_texts = [s['text'] for s in writing_samples]
-                            style_extractor = StyleExtractor()
-                            style_profile = style_extractor.extract_style(sample_texts)
-                        else:
-                            style_profile = {"tone": "professional", "structure": "clear paragraphs", "voice": "third person", "common_phrases": []}
-                            st.info("No writing samples found. Using default style.")
-                        
-                        # Generate newsletter
-                        generator = NewsletterGenerator()
-                        newsletter = generator.generate(
-                            fact_sheet['markdown'],
-                            style_profile,
-                            topic_name
-                        )
-                        
-                        # Save newsletter
+            # Output of a generation that was stopped (Streamlit's Stop button or a rerun)
+            partial = st.session_state.get('partial_newsletter')
+            if partial and partial['topic_id'] == selected_topic_id:
+                st.warning("The last generation was interrupted. Its partial output can still be saved.")
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button("Save Partial Newsletter"):
+                        st.session_state.db.save_newsletter(selected_topic_id, partial['markdown'])
+                        del st.session_state['partial_newsletter']
+                        st.rerun()
+                with col2:
+                    if st.button("Discard Partial Newsletter"):
+                        del st.session_state['partial_newsletter']
+                        st.rerun()
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                generate = st.button("Generate Newsletter")
+            with col2:
+                regenerate = st.button("Regenerate Without Cache",
+                                       help="Ask the model again instead of replaying a cached newsletter")
+            
+            if generate or regenerate:
+                try:
+                    # Stored style profile (extracted when the samples changed)
+                    style_profile = st.session_state.style_profiles.get(selected_topic_id)
+                    if not writing_samples:
+                        st.info("No writing samples found. Using default style.")
+                    
+                    # Generate newsletter, rendering tokens as they arrive
+                    generator = NewsletterGenerator()
+                    generation = generator.generate_stream(
+                        fact_sheet['markdown'],
+                        style_profile,
+                        topic_name,
+                        use_cache=not regenerate
+                    )
+                    output = st.empty()
+                    last_render = 0.0
+                    for _ in generation:
+                        if time.monotonic() - last_render >= STREAM_RENDER_INTERVAL:
+                            newsletter = generator.format_newsletter(topic_name, generation.text)
+                            output.markdown(newsletter + " ▌")
+                            st.session_state.partial_newsletter = {
+                                "topic_id": selected_topic_id,
+                                "markdown": generator.format_newsletter(topic_name, generation.text, stopped_early="interrupted")
+                            }
+                            last_render = time.monotonic()
+                    output.empty()
+                    st.session_state.pop('partial_newsletter', None)
+                    
+                    st.session_state.last_generation_metrics = generation.metrics
+                    if generation.error is not None and not generation.text:
+                        raise generation.error
+                    if generation.error is not None:
+                        # Keep what was generated, marked as incomplete
+                        newsletter = generator.format_newsletter(topic_name, generation.text, stopped_early=str(generation.error))
+                        st.session_state.db.save_newsletter(selected_topic_id, newsletter)
+                        st.warning(f"Generation stopped early ({generation.error}); the partial newsletter was saved.")
+                    else:
+                        newsletter = generator.format_newsletter(topic_name, generation.text)
                         st.session_state.db.save_newsletter(selected_topic_id, newsletter)
-                        st.success("Newsletter generated!")
                         st.rerun()
-                    except Exception as e:
-                        st.error(f"Error: {e}")
+                except Exception as e:
+                    st.error(f"Error: {e}")
+            
+            metrics = st.session_state.get('last_generation_metrics')
+            if metrics and metrics.get('cached'):
+                st.caption("Last generation: served from the LLM cache (same fact sheet, style and settings)")
+            elif metrics:
+                st.caption(
+                    f"Last generation: queued {metrics.get('queue_wait', 0):.1f}s, "
+                    f"first token after {metrics.get('time_to_first_token', 0):.1f}s, "
+                    f"{metrics.get('tokens_per_second', 0):.1f} tokens/s, "
+                    f"prompt evaluation {metrics.get('prompt_eval_duration', 0):.1f}s, "
+                    f"generation {metrics.get('eval_duration', 0):.1f}s"
+                )
             
             # Display latest newsletter
             newsletter = st.session_state.db.get_latest_newsletter(selected_topic_id)
@@ -291,6 +390,55 @@ elif page == "Generate Newsletter":
     else:
         st.warning("Please add a topic first in the Topics Manager page.")
 
+# Search Page
+elif page == "Search":
+    st.title("Search")
+    st.write("Find past newsletters, fact sheets and scraped items that mention a term.")
+    
+    topics = st.session_state.db.get_all_topics()
+    topic_names = {t['id']: t['topic_name'] for t in topics}
+    
+    query = st.text_input("Search terms", placeholder="e.g., diffusion models")
+    col1, col2 = st.columns(2)
+    with col1:
+        search_topic_id = st.selectbox(
+            "Topic",
+            options=[None] + list(topic_names),
+            format_func=lambda x: "All topics" if x is None else topic_names[x]
+        )
+    with col2:
+        kind_labels = {"newsletter": "Newsletters", "fact_sheet": "Fact sheets", "item": "Scraped items"}
+        kinds = st.multiselect(
+            "Search in",
+            options=list(kind_labels),
+            default=list(kind_labels),
+            format_func=lambda x: kind_labels[x]
+        )
+    
+    if query and kinds:
+        results = st.session_state.db.search(query, topic_id=search_topic_id, limit=50, kinds=tuple(kinds))
+        st.caption(f"{len(results)} result(s)")
+        
+        for result in results:
+            with st.container():
+                if result['kind'] == 'item':
+                    st.markdown(f"**[{result['title']}]({result['url']})** · first seen {result['created_at']}")
+                else:
+                    topic_label = topic_names.get(result['topic_id'], "Unknown topic")
+                    st.markdown(f"**{result['title']}** · {topic_label} · {result['created_at']}")
+                st.markdown(result['snippet'])
+                
+                if result['kind'] != 'item':
+                    if st.checkbox("Show full text", key=f"search_{result['kind']}_{result['id']}"):
+                        if result['kind'] == 'newsletter':
+                            body = st.session_state.db.get_newsletter(result['id'])
+                        else:
+                            body = st.session_state.db.get_fact_sheet(result['id'])
+                        if body:
+                            st.markdown(body['markdown'])
+                
+                st.divider()
+
 # Footer
 st.sidebar.markdown("---")
 st.sidebar.markdown("**Status:**")
@@ -299,6 +447,40 @@ if st.session_state.scheduler.running:
 else:
     st.sidebar.info("Scheduler: Stopped")
 
+cache_stats = get_http_client().cache_stats()
+if cache_stats:
+    st.sidebar.caption(
+        f"HTTP cache: {cache_stats['hit_rate']:.0%} hit rate "
+        f"({cache_stats['hits']} hits, {cache_stats['revalidated']} revalidated, {cache_stats['misses']} misses)"
+    )
+
+llm_cache = get_llm_cache()
+if llm_cache:
+    llm_stats = llm_cache.stats()
+    st.sidebar.caption(
+        f"LLM cache: {llm_stats['hit_rate']:.0%} hit rate "
+        f"({llm_stats['hits']} hits, {llm_stats['misses']} misses, {llm_stats['entries']} stored)"
+    )
+
+queue_stats = get_llm_queue().stats()
+st.sidebar.caption(
+    f"LLM queue: {queue_stats['running']}/{queue_stats['max_concurrency']} running, "
+    f"{queue_stats['queued_interactive']} interactive and {queue_stats['queued_scheduled']} scheduled waiting "
+    f"(avg wait {queue_stats['wait_interactive']['avg']:.1f}s / {queue_stats['wait_scheduled']['avg']:.1f}s)"
+)
+
+source_health = get_circuit_breakers().health()
+if source_health:
+    st.sidebar.markdown("**Sources:**")
+    state_icons = {"closed": "🟢", "half_open": "🟡", "open": "🔴"}
+    for name, health in sorted(source_health.items()):
+        line = f"{state_icons.get(health['state'], '⚪')} {name}"
+        if health['state'] != "closed":
+            line += f" — {health['consecutive_failures']} failures"
+            if health.get('opened_until', 0) > datetime.now().timestamp():
+                line += f", retry after {datetime.fromtimestamp(health['opened_until']).strftime('%H:%M:%S')}"
+        st.sidebar.caption(line, help=health.get('last_error') or None)
+
 if st.sidebar.button("Start Scheduler"):
     st.session_state.scheduler.start()
     st.sidebar.success("Scheduler started!")
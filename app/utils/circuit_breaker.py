@@ -0,0 +1,206 @@
+"""
+Circuit breakers for scraping sources
+
+A breaker opens after SOURCE_FAILURE_THRESHOLD consecutive failures and
+then rejects calls immediately, so an outage costs one fast
+CircuitOpenError per topic instead of a full request timeout. Once the
+cooldown has passed a single probe call is let through (half-open): success
+closes the circuit, failure reopens it with a doubled cooldown. State is
+saved to SOURCE_HEALTH_PATH so it survives restarts and the UI can show it.
+"""
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import (
+    SOURCE_FAILURE_THRESHOLD, SOURCE_COOLDOWN_SECONDS, SOURCE_MAX_COOLDOWN_SECONDS, SOURCE_HEALTH_PATH
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one source"""
+    
+    def __init__(self, name: str, on_change: Optional[Callable[[], None]] = None,
+                 failure_threshold: int = SOURCE_FAILURE_THRESHOLD, cooldown: float = SOURCE_COOLDOWN_SECONDS,
+                 max_cooldown: float = SOURCE_MAX_COOLDOWN_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._probing = False
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.cooldown = cooldown
+        self.opened_until = 0.0  # Wall-clock time, so it can be persisted
+        self.last_success = None
+        self.last_failure = None
+        self.last_error = ""
+    
+    def call(self, fn: Callable, *args, **kwargs):
+        """
+        Call fn through the breaker
+        
+        Raises:
+            CircuitOpenError: If the circuit is open (or a probe is already running)
+        """
+        self._before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self._record_failure(e)
+            raise
+        self._record_success()
+        return result
+    
+    def is_open(self) -> bool:
+        """True while calls would be rejected without a probe"""
+        with self._lock:
+            return self.state == OPEN and time.time() < self.opened_until
+    
+    def _before_call(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and time.time() >= self.opened_until:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            retry_in = max(0, int(self.opened_until - time.time()))
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit {self.state}, retry in {retry_in}s)")
+    
+    def _record_success(self):
+        with self._lock:
+            self._probing = False
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.cooldown = self.base_cooldown
+            self.last_success = time.time()
+        self._changed()
+    
+    def _record_failure(self, error: Exception):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_failure = time.time()
+            self.last_error = str(error)[:200]
+            if self.state == HALF_OPEN:
+                # Failed probe: back off harder before the next one
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._open()
+            elif self.consecutive_failures >= self.failure_threshold:
+                self._open()
+            self._probing = False
+        self._changed()
+    
+    def _open(self):
+        self.state = OPEN
+        self.opened_until = time.time() + self.cooldown
+    
+    def _changed(self):
+        if self._on_change:
+            self._on_change()
+    
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "cooldown": self.cooldown,
+                "opened_until": self.opened_until,
+                "last_success": self.last_success,
+                "last_failure": self.last_failure,
+                "last_error": self.last_error
+            }
+    
+    def load(self, data: Dict):
+        """Restore persisted state (a half-open probe interrupted by a restart counts as open)"""
+        with self._lock:
+            self.state = OPEN if data.get("state") == HALF_OPEN else data.get("state", CLOSED)
+            self.consecutive_failures = data.get("consecutive_failures", 0)
+            self.cooldown = data.get("cooldown", self.base_cooldown)
+            self.opened_until = data.get("opened_until", 0.0)
+            self.last_success = data.get("last_success")
+            self.last_failure = data.get("last_failure")
+            self.last_error = data.get("last_error", "")
+
+
+class CircuitBreakerRegistry:
+    """One breaker per source name, persisted to a JSON file"""
+    
+    def __init__(self, path: str = SOURCE_HEALTH_PATH):
+        """
+        Args:
+            path: JSON file for breaker state (empty string keeps state in memory only)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._saved = load_source_health(path) if path else {}
+    
+    def get(self, name: str) -> CircuitBreaker:
+        """Get (or create) the breaker for a source"""
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, on_change=self.save)
+                if name in self._saved:
+                    breaker.load(self._saved[name])
+                self._breakers[name] = breaker
+            return breaker
+    
+    def health(self) -> Dict[str, Dict]:
+        """Current state of every known source"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        health = dict(self._saved)
+        health.update({breaker.name: breaker.to_dict() for breaker in breakers})
+        return health
+    
+    def save(self):
+        """Write all breaker states to disk atomically"""
+        if not self.path:
+            return
+        health = self.health()
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(health, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def load_source_health(path: str = SOURCE_HEALTH_PATH) -> Dict[str, Dict]:
+    """Read persisted source health (e.g. for display in another process)"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+_shared_registry: Optional[CircuitBreakerRegistry] = None
+_shared_registry_lock = threading.Lock()
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Get the process-wide breaker registry"""
+    global _shared_registry
+    with _shared_registry_lock:
+        if _shared_registry is None:
+            _shared_registry = CircuitBreakerRegistry()
+        return _shared_registry
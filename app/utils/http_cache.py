@@ -0,0 +1,136 @@
+"""
+On-disk HTTP response cache
+
+Stores GET responses in SQLite keyed by normalized URL and query
+parameters. Entries younger than the caller's TTL are served without any
+network call; older entries are revalidated with If-None-Match /
+If-Modified-Since so an unchanged response costs a 304 instead of a body.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit, parse_qsl, urlencode, urlunsplit
+import sys
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import HTTP_CACHE_MAX_AGE
+
+# Response headers worth keeping with a cached body
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class HTTPCache:
+    """SQLite-backed response cache with conditional revalidation"""
+    
+    def __init__(self, path: str, max_age: int = HTTP_CACHE_MAX_AGE):
+        """
+        Args:
+            path: SQLite file for cached responses
+            max_age: Seconds after which an entry is dropped entirely
+        """
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_fetched_at ON responses (fetched_at)")
+        self._conn.commit()
+        self._stats = {"hits": 0, "revalidated": 0, "misses": 0}
+    
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Cache key for a GET request: URL with its query merged with params and sorted"""
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if params:
+            query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+        query.sort()
+        normalized = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ''))
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Get a cached entry (fresh or stale) or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM responses WHERE key = ?", (key,)).fetchone()
+        return dict(row) if row else None
+    
+    def store(self, key: str, response: requests.Response):
+        """Cache a successful response"""
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO responses (key, url, status, headers, body, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (key, response.url, response.status_code, json.dumps(headers), response.content, now))
+            self._conn.execute("DELETE FROM responses WHERE fetched_at < ?", (now - self.max_age,))
+            self._conn.commit()
+    
+    def touch(self, key: str):
+        """Mark an entry as freshly validated (after a 304)"""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+    
+    def record(self, outcome: str):
+        """Count a hit, revalidation or miss"""
+        with self._lock:
+            self._stats[outcome] += 1
+    
+    def stats(self) -> Dict:
+        """Hit/miss counters since startup, plus the overall hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = stats["hits"] + stats["revalidated"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["revalidated"]) / total if total else 0.0
+        return stats
+    
+    @staticmethod
+    def is_fresh(entry: Dict, ttl: float) -> bool:
+        return time.time() - entry['fetched_at'] < ttl
+    
+    @staticmethod
+    def validators(entry: Dict) -> Dict[str, str]:
+        """Conditional request headers for a cached entry"""
+        headers = json.loads(entry['headers'])
+        conditional = {}
+        if 'ETag' in headers:
+            conditional['If-None-Match'] = headers['ETag']
+        if 'Last-Modified' in headers:
+            conditional['If-Modified-Since'] = headers['Last-Modified']
+        return conditional
+    
+    @staticmethod
+    def to_response(entry: Dict) -> requests.Response:
+        """Rebuild a requests.Response from a cached entry"""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(json.loads(entry['headers']))
+        response._content = entry['body']
+        response.url = entry['url']
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
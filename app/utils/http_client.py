@@ -0,0 +1,132 @@
+"""
+Shared HTTP client for scrapers and LLM calls
+
+One requests.Session per process keeps a keep-alive connection pool per
+host, so only the first request to arXiv, Semantic Scholar or Ollama pays
+for the TCP/TLS handshake. GET requests can opt into the on-disk response
+cache by passing a cache_ttl.
+"""
+import threading
+from urllib.parse import urlsplit
+from typing import Optional, Dict
+import sys
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import (
+    HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_USER_AGENT, HTTP_CACHE_PATH, RATE_LIMIT_MAX_RETRIES
+)
+from utils.http_cache import HTTPCache
+from utils.rate_limiter import RateLimiter, get_rate_limiter, parse_retry_after
+
+# Responses that mean "slow down" rather than "failed"
+THROTTLED_STATUSES = (429, 503)
+
+
+class HTTPClient:
+    """Pooled, keep-alive HTTP client"""
+    
+    def __init__(self, pool_connections: int = HTTP_POOL_CONNECTIONS, pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 cache: HTTPCache = None, rate_limiter: RateLimiter = None):
+        """
+        Args:
+            pool_connections: Number of hosts to keep connection pools for
+            pool_maxsize: Maximum open connections kept per host
+            cache: Optional response cache used by get(..., cache_ttl=...)
+            rate_limiter: Per-host limiter (defaults to the process-wide one)
+        """
+        self.cache = cache
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = HTTP_USER_AGENT
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def get(self, url: str, cache_ttl: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        Send a GET request (same arguments as requests.get)
+        
+        Args:
+            url: URL to fetch
+            cache_ttl: Seconds a cached response may be served without a
+                network call. After that it is revalidated with a
+                conditional GET. None bypasses the cache.
+        """
+        if cache_ttl is None or self.cache is None:
+            return self._request("GET", url, **kwargs)
+        
+        key = HTTPCache.make_key(url, kwargs.get('params'))
+        entry = self.cache.lookup(key)
+        if entry and HTTPCache.is_fresh(entry, cache_ttl):
+            self.cache.record("hits")
+            return HTTPCache.to_response(entry)
+        
+        if entry:
+            headers = dict(kwargs.get('headers') or {})
+            headers.update(HTTPCache.validators(entry))
+            kwargs['headers'] = headers
+        
+        response = self._request("GET", url, **kwargs)
+        if entry and response.status_code == 304:
+            self.cache.touch(key)
+            self.cache.record("revalidated")
+            return HTTPCache.to_response(entry)
+        
+        self.cache.record("misses")
+        if response.status_code == 200 and 'no-store' not in response.headers.get('Cache-Control', ''):
+            self.cache.store(key, response)
+        return response
+    
+    def cache_stats(self) -> Dict:
+        """Response cache hit/miss statistics (empty if caching is off)"""
+        return self.cache.stats() if self.cache else {}
+    
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request (same arguments as requests.post)"""
+        return self._request("POST", url, **kwargs)
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the per-host rate limiter
+        
+        Throttled responses (429/503) slow the host down and are retried
+        after Retry-After, so callers queue instead of failing. The last
+        throttled response is returned once the retries run out.
+        """
+        host = urlsplit(url).hostname or ""
+        if not self.rate_limiter.is_limited(host):
+            return self.session.request(method, url, **kwargs)
+        
+        for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+            self.rate_limiter.acquire(host)
+            response = self.session.request(method, url, **kwargs)
+            if response.status_code not in THROTTLED_STATUSES:
+                self.rate_limiter.success(host)
+                return response
+            
+            self.rate_limiter.backoff(host, parse_retry_after(response.headers.get('Retry-After')))
+            if attempt < RATE_LIMIT_MAX_RETRIES:
+                response.close()
+        return response
+    
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+
+_shared_client: Optional[HTTPClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """Get the process-wide HTTP client"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = HTTPClient(cache=HTTPCache(HTTP_CACHE_PATH) if HTTP_CACHE_PATH else None)
+        return _shared_client
@@ -6,9 +6,15 @@ In Cursor, MCP tools are available through the function interface.
 """
 from typing import Optional, Dict, List
 import sys
+from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent.parent))
 
-class MCPHelper:
+from utils.page_readiness import PageReadinessMixin
+from utils.snapshot_parser import parse_snapshot, walk, text_content
+
+
+class MCPHelper(PageReadinessMixin):
     """
     Helper class to use Playwright MCP tools
     
@@ -52,41 +58,33 @@ class MCPHelper:
             print(f"MCP snapshot error: {e}")
         return None
     
+    def evaluate(self, function: str):
+        """Evaluate JavaScript on the page (None if the tool is unavailable)"""
+        if not self.has_mcp or 'evaluate' not in self.mcp_tools:
+            return None
+        
+        try:
+            return self.mcp_tools['evaluate'](function=function)
+        except Exception as e:
+            print(f"MCP evaluate error: {e}")
+        return None
+    
     def extract_links_from_snapshot(self, snapshot: Dict) -> List[Dict]:
         """
         Extract links and text from accessibility snapshot
         
-        This is a helper to parse the snapshot structure.
-        The actual structure depends on the page.
+        Accepts snapshot text or a nested dict. Links without a name of
+        their own take the text of their subtree.
         """
         links = []
         
         if not snapshot:
             return links
         
-        # Parse snapshot structure
-        # This is a simplified parser - actual implementation would need
-        # to handle the specific structure of accessibility snapshots
-        def traverse(node, parent_text=""):
-            if isinstance(node, dict):
-                node_type = node.get('type', '')
-                text = node.get('text', '')
-                href = node.get('href', '')
-                
-                if href:
-                    links.append({
-                        'text': text or parent_text,
-                        'url': href
-                    })
-                
-                # Recursively process children
-                for key, value in node.items():
-                    if key not in ['type', 'text', 'href']:
-                        traverse(value, text or parent_text)
-            elif isinstance(node, list):
-                for item in node:
-                    traverse(item, parent_text)
-        
-        traverse(snapshot)
+        for node in walk(parse_snapshot(snapshot)):
+            if node.url:
+                links.append({
+                    'text': node.name or text_content(node),
+                    'url': node.url
+                })
         return links
-
@@ -0,0 +1,84 @@
+"""
+Page readiness checks for Playwright MCP clients
+
+Instead of sleeping a fixed time after navigate(), wait until the page is
+actually usable: an optional CSS selector is present (or, without one,
+document.readyState is 'complete'), and then consecutive accessibility
+snapshots stop changing. Everything is bounded by a deadline, so a slow or
+broken page costs at most MCP_READY_TIMEOUT.
+"""
+import json
+import time
+from typing import Callable, Optional, Any
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import MCP_READY_TIMEOUT, MCP_READY_POLL_INTERVAL, MCP_READY_STABLE_POLLS
+
+
+def wait_for_ready(snapshot: Callable[[], Any], evaluate: Optional[Callable[..., Any]] = None,
+                   selector: Optional[str] = None, timeout: float = MCP_READY_TIMEOUT,
+                   poll_interval: float = MCP_READY_POLL_INTERVAL,
+                   stable_polls: int = MCP_READY_STABLE_POLLS) -> Any:
+    """
+    Wait until the current page is ready and return its snapshot
+    
+    Args:
+        snapshot: Function returning the page's accessibility snapshot
+        evaluate: Optional function running JavaScript in the page (the
+            browser_evaluate tool). If it returns None the check is skipped.
+        selector: CSS selector that must be present before snapshots are taken
+        timeout: Overall deadline in seconds
+        poll_interval: Seconds between polls
+        stable_polls: Number of identical consecutive snapshots that count as settled
+    
+    Returns:
+        The last snapshot taken (settled, or the latest one at the deadline)
+    """
+    deadline = time.monotonic() + timeout
+    
+    if evaluate is not None:
+        if selector:
+            check = f"() => document.querySelector({json.dumps(selector)}) !== null"
+        else:
+            check = "() => document.readyState === 'complete'"
+        while time.monotonic() < deadline:
+            ready = evaluate(function=check)
+            if ready is None or ready is True or ready == 'true':
+                break
+            _pause(poll_interval, deadline)
+    
+    previous = None
+    identical = 0
+    while True:
+        current = snapshot()
+        if previous is not None and current == previous:
+            identical += 1
+            if identical + 1 >= stable_polls:
+                return current
+        else:
+            identical = 0
+        previous = current
+        if time.monotonic() >= deadline:
+            return current
+        _pause(poll_interval, deadline)
+
+
+def _pause(interval: float, deadline: float):
+    time.sleep(max(0.0, min(interval, deadline - time.monotonic())))
+
+
+class PageReadinessMixin:
+    """Adds wait_for_ready() to MCP clients that have snapshot() (and optionally evaluate())"""
+    
+    def wait_for_ready(self, selector: Optional[str] = None, timeout: float = MCP_READY_TIMEOUT) -> Any:
+        """
+        Wait until the current page is ready and return its snapshot
+        
+        Args:
+            selector: CSS selector that must be present first (optional)
+            timeout: Overall deadline in seconds
+        """
+        return wait_for_ready(self.snapshot, getattr(self, 'evaluate', None), selector=selector, timeout=timeout)
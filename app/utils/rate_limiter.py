@@ -0,0 +1,127 @@
+"""
+Per-host rate limiting shared by every scraper in the process
+
+Each configured host gets a token bucket (implemented as a GCRA schedule,
+so waiting callers are served in arrival order). 429/503 responses halve
+the host's rate and pause it for Retry-After; successes restore the rate
+additively, so sustained throughput converges on what the provider allows.
+"""
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import RATE_LIMITS, RATE_LIMIT_BACKOFF
+
+MIN_RATE_FRACTION = 1 / 16  # Adaptive backoff never drops below this share of the base rate
+RECOVERY_FRACTION = 0.1  # Share of the base rate regained per successful request
+
+
+class _HostBucket:
+    """Token bucket state for one host"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.next_slot = 0.0  # Theoretical arrival time of the next request
+        self.paused_until = 0.0
+
+
+class RateLimiter:
+    """Blocking per-host token buckets with adaptive backoff"""
+    
+    def __init__(self, limits: Dict[str, Tuple[float, int]] = RATE_LIMITS):
+        """
+        Args:
+            limits: host -> (requests per second, burst size). Hosts not
+                listed are not limited.
+        """
+        self._lock = threading.Lock()
+        self._buckets = {host: _HostBucket(rate, burst) for host, (rate, burst) in limits.items()}
+    
+    def is_limited(self, host: str) -> bool:
+        return host in self._buckets
+    
+    def acquire(self, host: str) -> float:
+        """
+        Wait for permission to send a request to `host`
+        
+        Returns:
+            Seconds spent waiting
+        """
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            return 0.0
+        
+        with self._lock:
+            now = time.monotonic()
+            interval = 1.0 / bucket.rate
+            # Up to `burst` requests may run ahead of the steady schedule
+            earliest = bucket.next_slot - (bucket.burst - 1) * interval
+            start = max(now, earliest, bucket.paused_until)
+            bucket.next_slot = max(bucket.next_slot, start) + interval
+        
+        wait = start - now
+        if wait > 0:
+            time.sleep(wait)
+        return max(0.0, wait)
+    
+    def backoff(self, host: str, retry_after: Optional[float] = None):
+        """Slow a host down after a 429/503 response"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            return
+        
+        with self._lock:
+            bucket.rate = max(bucket.base_rate * MIN_RATE_FRACTION, bucket.rate / 2)
+            pause = retry_after if retry_after is not None else RATE_LIMIT_BACKOFF
+            bucket.paused_until = max(bucket.paused_until, time.monotonic() + pause)
+    
+    def success(self, host: str):
+        """Let a host's rate recover after a successful response"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            return
+        
+        with self._lock:
+            bucket.rate = min(bucket.base_rate, bucket.rate + bucket.base_rate * RECOVERY_FRACTION)
+    
+    def current_rate(self, host: str) -> Optional[float]:
+        """Current allowed requests per second for a host (None if unlimited)"""
+        bucket = self._buckets.get(host)
+        return bucket.rate if bucket else None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter"""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
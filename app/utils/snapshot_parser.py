@@ -0,0 +1,200 @@
+"""
+Accessibility snapshot parsing and traversal
+
+Playwright MCP's browser_snapshot returns the page's ARIA tree as YAML-like
+text:
+
+    - article [ref=e12]:
+      - link "Headline" [ref=e13]:
+        - /url: ./read/CBMi...
+      - text: Publisher
+
+parse_snapshot() turns that (or a nested dict snapshot) into a tree of
+SnapshotNode objects in one pass over the lines, without recursion. walk()
+traverses the tree with an explicit stack and can prune whole subtrees
+(navigation bars, footers), so large pages are cheap to search.
+"""
+import re
+from typing import Callable, Iterator, List, Optional, Tuple, Union, Dict, Any
+
+NODE_PATTERN = re.compile(
+    r'^(?P<role>[\w-]+)'
+    r'(?: "(?P<name>(?:[^"\\]|\\.)*)")?'
+    r'(?P<attrs>(?: \[[^\]]*\])*)'
+    r'(?::(?: (?P<text>.*))?)?$'
+)
+ATTR_PATTERN = re.compile(r'\[([^=\]]+)(?:=([^\]]*))?\]')
+YAML_BLOCK = re.compile(r'```yaml\n(.*?)```', re.DOTALL)
+
+
+class SnapshotNode:
+    """One node of an accessibility tree"""
+    
+    __slots__ = ('role', 'name', 'url', 'attrs', 'children')
+    
+    def __init__(self, role: str, name: str = "", url: str = "", attrs: Optional[Dict[str, str]] = None):
+        self.role = role
+        self.name = name
+        self.url = url
+        self.attrs = attrs
+        self.children: List['SnapshotNode'] = []
+    
+    def __repr__(self) -> str:
+        return f"SnapshotNode({self.role!r}, {self.name!r}, children={len(self.children)})"
+
+
+def parse_snapshot(snapshot: Union[str, Dict, List, SnapshotNode, None]) -> SnapshotNode:
+    """
+    Parse a snapshot into a SnapshotNode tree
+    
+    Accepts browser_snapshot text (optionally wrapped in the MCP tool's
+    markdown response), a nested dict/list snapshot, or an existing tree.
+    """
+    if isinstance(snapshot, SnapshotNode):
+        return snapshot
+    if isinstance(snapshot, str):
+        return parse_aria_snapshot(snapshot)
+    return _from_dict(snapshot)
+
+
+def parse_aria_snapshot(text: str, keep_attrs: bool = False) -> SnapshotNode:
+    """
+    Parse Playwright ARIA snapshot text into a tree under a 'document' root
+    
+    Args:
+        text: Snapshot text
+        keep_attrs: Also parse bracketed attributes such as [level=3]
+            (skipped by default; extractors do not need them)
+    """
+    block = YAML_BLOCK.search(text)
+    if block:
+        text = block.group(1)
+    
+    root = SnapshotNode('document')
+    # (indent, node) for the current chain of open ancestors
+    stack: List[Tuple[int, SnapshotNode]] = [(-1, root)]
+    for line in text.splitlines():
+        content = line.lstrip(' ')
+        if not content.startswith('- '):
+            continue
+        indent = len(line) - len(content)
+        content = content[2:]
+        while stack[-1][0] >= indent:
+            stack.pop()
+        parent = stack[-1][1]
+        
+        if content.startswith('/'):
+            # Property of the parent, e.g. "/url: https://..."
+            key, _, value = content[1:].partition(':')
+            value = _unquote(value.strip())
+            if key == 'url':
+                parent.url = value
+            else:
+                if parent.attrs is None:
+                    parent.attrs = {}
+                parent.attrs[key] = value
+            continue
+        
+        node = _parse_node(content, keep_attrs)
+        parent.children.append(node)
+        stack.append((indent, node))
+    return root
+
+
+def _parse_node(content: str, keep_attrs: bool) -> SnapshotNode:
+    match = NODE_PATTERN.match(content)
+    if not match:
+        # Bare text line (e.g. a quoted string)
+        return SnapshotNode('text', _unquote(content.rstrip(':')))
+    
+    name = match.group('name')
+    name = name.replace('\\"', '"') if name else ""
+    text = match.group('text')
+    if text:
+        text = _unquote(text)
+        if not name:
+            name = text
+    attrs = None
+    if keep_attrs and match.group('attrs'):
+        attrs = {key: value if value is not None else "" for key, value in ATTR_PATTERN.findall(match.group('attrs'))}
+        attrs.pop('ref', None)
+        attrs = attrs or None
+    return SnapshotNode(match.group('role'), name, attrs=attrs)
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        return value[1:-1]
+    return value
+
+
+def _from_dict(snapshot: Any) -> SnapshotNode:
+    """Convert a nested dict/list snapshot (type/text/href keys) into a tree"""
+    root = SnapshotNode('document')
+    stack = [(snapshot, root)]
+    while stack:
+        value, parent = stack.pop()
+        if isinstance(value, list):
+            # Reversed so children keep document order once popped
+            stack.extend((item, parent) for item in reversed(value))
+        elif isinstance(value, dict):
+            node = SnapshotNode(
+                str(value.get('role') or value.get('type') or 'generic'),
+                str(value.get('name') or value.get('text') or ''),
+                url=str(value.get('url') or value.get('href') or '')
+            )
+            parent.children.append(node)
+            nested = [item for key, item in value.items()
+                      if key not in ('role', 'type', 'name', 'text', 'url', 'href') and isinstance(item, (dict, list))]
+            stack.extend((item, node) for item in reversed(nested))
+    return root
+
+
+def walk(root: SnapshotNode, prune: Optional[Callable[[SnapshotNode], bool]] = None,
+         max_depth: Optional[int] = None) -> Iterator[SnapshotNode]:
+    """
+    Yield nodes depth-first in document order
+    
+    Args:
+        root: Tree to walk (the root itself is yielded first)
+        prune: Called per node; when it returns True the node's subtree is
+            skipped (the node itself is still yielded)
+        max_depth: Do not descend below this depth (root is depth 0)
+    """
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        yield node
+        if not node.children or (prune is not None and prune(node)):
+            continue
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for child in reversed(node.children):
+            stack.append((child, depth + 1))
+
+
+def find_all(root: SnapshotNode, predicate: Callable[[SnapshotNode], bool],
+             prune: Optional[Callable[[SnapshotNode], bool]] = None) -> Iterator[SnapshotNode]:
+    """Yield matching nodes without descending into matches or pruned subtrees"""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if predicate(node):
+            yield node
+            continue
+        if prune is not None and prune(node):
+            continue
+        stack.extend(reversed(node.children))
+
+
+def text_content(node: SnapshotNode, separator: str = " ") -> str:
+    """All names in a subtree, joined in document order"""
+    return separator.join(current.name for current in walk(node) if current.name)
+
+
+def first(node: SnapshotNode, predicate: Callable[[SnapshotNode], bool]) -> Optional[SnapshotNode]:
+    """First node in a subtree (including itself) that matches"""
+    for current in walk(node):
+        if predicate(current):
+            return current
+    return None
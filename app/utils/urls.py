@@ -0,0 +1,58 @@
+"""
+URL normalization helpers
+
+Scraped items are identified across runs and sources by their normalized
+URL, so trivial differences (scheme, www., tracking parameters, arXiv
+version suffixes) do not create separate items.
+"""
+import hashlib
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+TRACKING_PARAMS = {'fbclid', 'gclid', 'ref_src', 'trk', 'trackingid'}
+
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+ARXIV_VERSION = re.compile(r'^(/abs/[^/]+?)v\d+$')
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for identity comparisons
+    
+    Lowercases scheme and host, treats http and https alike, drops www.,
+    default ports, fragments, tracking parameters and trailing slashes,
+    sorts the query string and strips arXiv version suffixes.
+    """
+    if not url:
+        return ""
+    
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+    
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    port = parts.port
+    netloc = host if port is None or str(port) == DEFAULT_PORTS.get(parts.scheme.lower()) else f"{host}:{port}"
+    
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    if host.endswith('arxiv.org'):
+        path = ARXIV_VERSION.sub(r'\1', path)
+    
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ]
+    query.sort()
+    
+    return urlunsplit((scheme, netloc, path, urlencode(query), ''))
+
+
+def url_hash(url: str) -> str:
+    """Stable key for a URL (hash of its normalized form)"""
+    return hashlib.sha1(normalize_url(url).encode('utf-8')).hexdigest()
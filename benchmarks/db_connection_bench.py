@@ -0,0 +1,65 @@
+"""
+Benchmark thread-local connection reuse against a connection per call
+
+Usage:
+    python benchmarks/db_connection_bench.py [--calls N] [--threads N]
+
+Runs get_topic in a loop on a scratch database, first through Database
+(one reused connection per thread, WAL) and then the way the code used
+to work: connect, query, close on every call.
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from db.database import Database
+
+
+def get_topic_per_call(db_path: str, topic_id: int):
+    """get_topic as it was before connections were reused"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        row = conn.execute("SELECT * FROM topics WHERE id = ?", (topic_id,)).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def bench(label: str, call, calls: int, threads: int):
+    started = time.perf_counter()
+    if threads == 1:
+        for _ in range(calls):
+            call()
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda _: call(), range(calls)))
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<17} {elapsed / calls * 1e6:8.1f} us/call  ({calls / elapsed:8.0f} calls/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        db = Database(db_path)
+        topic_id = db.add_topic("Benchmark topic", "weekly")
+        for threads in args.threads:
+            print(f"get_topic, {args.calls} calls, {threads} thread(s):")
+            bench("connect-per-call", lambda: get_topic_per_call(db_path, topic_id), args.calls, threads)
+            bench("thread-local", lambda: db.get_topic(topic_id), args.calls, threads)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark fact sheet storage size and throughput per compression mode
+
+Usage:
+    python benchmarks/db_payload_bench.py [--sheets N] [--repeat FRACTION]
+
+Writes a synthetic history of fact sheets shaped like FactSheetBuilder's
+output (a "Generated on" header, per-run timings in the JSON) to a scratch
+database for each DATABASE_COMPRESSION mode, then reports the file size
+after VACUUM and write/read throughput. A fraction of the runs find
+nothing new and repeat the previous run's items, which is where
+content-addressed storage can deduplicate.
+"""
+import argparse
+import random
+import string
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from db.database import Database
+from db.payloads import CODECS
+
+SECTIONS = ("research_papers", "news_headlines", "linkedin_posts", "web_articles")
+
+
+def random_text(rng: random.Random, words: int) -> str:
+    return " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(words))
+
+
+def make_items(rng: random.Random, pool: list) -> dict:
+    return {section: rng.sample(pool, 5) for section in SECTIONS}
+
+
+def make_sheet(topic: str, items: dict, run_at: datetime, rng: random.Random) -> dict:
+    """A fact sheet as FactSheetBuilder.build_fact_sheet returns it"""
+    json_data = {
+        "topic": topic,
+        "created_at": run_at.isoformat(),
+        **items,
+        "duplicates_merged": 0,
+        "source_timings": {name: {"status": "ok", "seconds": round(rng.random() * 5, 3), "items": 5}
+                           for name in ("arxiv", "semantic_scholar", "news", "linkedin", "web")},
+        "build_seconds": round(rng.random() * 10, 3)
+    }
+    lines = [f"# Fact Sheet: {topic}\n", f"*Generated on {run_at.strftime('%B %d, %Y at %H:%M')}*\n"]
+    for section in SECTIONS:
+        lines.append(f"\n## {section.replace('_', ' ').title()}\n")
+        for item in items[section]:
+            lines.append(f"- **{item['headline']}**\n  {item['abstract']}\n  Source: [{item['source']}]({item['url']})")
+    return {"markdown": "\n".join(lines), "json_data": json_data}
+
+
+def bench(compression: str, sheets: list, tmp: str):
+    db_path = str(Path(tmp) / f"{compression}.db")
+    db = Database(db_path, compression=compression)
+    topic_id = db.add_topic("Benchmark topic", "daily")
+
+    started = time.perf_counter()
+    for sheet in sheets:
+        with db.transaction():
+            db.save_fact_sheet(topic_id, sheet["markdown"], sheet["json_data"])
+    write = time.perf_counter() - started
+
+    started = time.perf_counter()
+    read = sum(1 for _ in db.iter_fact_sheets(topic_id))
+    read_time = time.perf_counter() - started
+
+    conn = db.get_connection()
+    payloads = conn.execute("SELECT COUNT(*) FROM payloads").fetchone()[0]
+    conn.execute("VACUUM")
+    db.close()
+    size_mb = Path(db_path).stat().st_size / 1e6
+    print(f"  {compression:<5} {size_mb:7.1f} MB, write {len(sheets) / write:6.0f} sheets/s, "
+          f"read {read / read_time:6.0f} sheets/s, {payloads} payloads")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sheets", type=int, default=2000)
+    parser.add_argument("--repeat", type=float, default=0.3, help="Fraction of runs with nothing new")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pool = [{"source": "arXiv", "url": f"https://arxiv.org/abs/{i:05d}",
+             "headline": random_text(rng, 10), "abstract": random_text(rng, 120)} for i in range(300)]
+    run_at = datetime(2024, 1, 1)
+    sheets, items = [], make_items(rng, pool)
+    for _ in range(args.sheets):
+        if rng.random() >= args.repeat:
+            items = make_items(rng, pool)
+        run_at += timedelta(hours=rng.randint(1, 48))
+        sheets.append(make_sheet("Benchmark topic", items, run_at, rng))
+
+    print(f"{args.sheets} fact sheets, {args.repeat:.0%} repeating the previous run:")
+    with tempfile.TemporaryDirectory() as tmp:
+        for compression in CODECS:
+            bench(compression, sheets, tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark Database.search latency on a synthetic history
+
+Usage:
+    python benchmarks/db_search_bench.py [--topics N] [--sheets N] [--items-per-sheet N]
+
+Fills a scratch database (zlib storage) with fact sheets, newsletters and
+the scraped items they link, then times a few query shapes (best of 5)
+and shows how the results split across kinds.
+"""
+import argparse
+import random
+import string
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from db.database import Database
+
+TOPIC_TERMS = ["transformer", "diffusion", "robotics", "quantum", "genomics"]
+
+
+def random_text(rng: random.Random, words: int, extra=()) -> str:
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(words)]
+    vocabulary += list(extra)
+    rng.shuffle(vocabulary)
+    return " ".join(vocabulary)
+
+
+def populate(db: Database, rng: random.Random, topics: int, sheets: int, items_per_sheet: int):
+    item_number = 0
+    for t in range(topics):
+        term = TOPIC_TERMS[t % len(TOPIC_TERMS)]
+        topic_id = db.add_topic(f"{term} {t}", "daily")
+        for _ in range(sheets // topics):
+            items = []
+            for _ in range(items_per_sheet):
+                item_number += 1
+                items.append({
+                    "source": "arXiv",
+                    "url": f"https://arxiv.org/abs/{item_number:07d}",
+                    "headline": random_text(rng, 8, [term]),
+                    "abstract": random_text(rng, 40, [term, "model"])
+                })
+            body = "\n".join(f"- **{item['headline']}**\n  {item['abstract']}" for item in items[:10])
+            with db.transaction():
+                db.save_fact_sheet(topic_id, f"# Fact Sheet: {term}\n\n## Research Papers\n{body}",
+                                   {"topic": term, "research_papers": items})
+                db.save_newsletter(topic_id, f"# Weekly Newsletter: {term}\n\n{random_text(rng, 300, [term] * 5)}")
+
+
+def bench(label: str, db: Database, query: str, topic_id=None, rounds: int = 5):
+    times = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        results = db.search(query, topic_id=topic_id)
+        times.append(time.perf_counter() - started)
+    kinds = dict(Counter(result['kind'] for result in results))
+    print(f"  {label:<24} {min(times) * 1000:7.1f} ms  {len(results):>3} hits {kinds}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--topics", type=int, default=5)
+    parser.add_argument("--sheets", type=int, default=500, help="Fact sheets (and newsletters) in total")
+    parser.add_argument("--items-per-sheet", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(str(Path(tmp) / "search.db"), compression="zlib")
+        started = time.perf_counter()
+        populate(db, rng, args.topics, args.sheets, args.items_per_sheet)
+        documents = args.sheets * (args.items_per_sheet + 2)
+        print(f"{documents} documents indexed in {time.perf_counter() - started:.0f} s:")
+        bench("single term", db, "transformer")
+        bench("two terms", db, "transformer model")
+        bench("single term, one topic", db, "transformer", topic_id=1)
+        bench("no hits", db, "zzzzqqq")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
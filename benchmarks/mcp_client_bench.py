@@ -0,0 +1,65 @@
+"""
+Benchmark MCP tool-call throughput and latency against the stub server
+
+Usage:
+    python benchmarks/mcp_client_bench.py [--calls N] [--latency SECONDS] [--concurrency N ...]
+
+Compares one call at a time with several calls in flight on the same
+connection (threads sharing one MCPClient, as pooled scrapers would).
+"""
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from mcp_client import MCPClient, content_text
+
+STUB_SERVER = Path(__file__).parent / "mcp_stub_server.py"
+
+
+def timed_call(client: MCPClient, tool: str) -> float:
+    started = time.perf_counter()
+    content_text(client.call_tool(tool, {"url": "https://example.com"} if tool == "browser_navigate" else {}))
+    return time.perf_counter() - started
+
+
+def bench(client: MCPClient, tool: str, calls: int, concurrency: int):
+    started = time.perf_counter()
+    if concurrency == 1:
+        latencies = [timed_call(client, tool) for _ in range(calls)]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(lambda _: timed_call(client, tool), range(calls)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"  {tool:<17} concurrency {concurrency:>3}: {calls / elapsed:7.1f} calls/s, "
+          f"median {statistics.median(latencies) * 1000:6.1f} ms, p95 {p95 * 1000:6.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub server's mean seconds per call")
+    parser.add_argument("--snapshot-kb", type=int, default=256)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+    
+    command = f"{sys.executable} {STUB_SERVER} --latency {args.latency} --snapshot-kb {args.snapshot_kb}"
+    started = time.perf_counter()
+    client = MCPClient(command)
+    print(f"Connected to {client.server_info.get('name')} in {(time.perf_counter() - started) * 1000:.0f} ms")
+    try:
+        for tool in ("browser_navigate", "browser_snapshot"):
+            for concurrency in args.concurrency:
+                bench(client, tool, args.calls, concurrency)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Stub Playwright MCP server for offline testing and benchmarks
+
+Speaks the MCP stdio transport (newline-delimited JSON-RPC 2.0) and answers
+the browser_* tools the scrapers use with canned content after a simulated
+delay. Requests are handled concurrently, like a real server, so pipelined
+clients can be measured.
+
+Usage:
+    python benchmarks/mcp_stub_server.py [--latency SECONDS] [--snapshot-kb KB]
+
+Point the app at it with e.g.
+    MCP_SERVER_COMMAND="python benchmarks/mcp_stub_server.py --latency 0.05"
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+
+TOOLS = ["browser_navigate", "browser_snapshot", "browser_evaluate", "browser_click", "browser_type", "browser_close"]
+
+
+def stub_snapshot(size_kb: int) -> str:
+    """A Google News-like snapshot of roughly size_kb kilobytes"""
+    lines = ['- main [ref=e1]:']
+    i = 0
+    while sum(len(line) + 1 for line in lines) < size_kb * 1024:
+        lines += [
+            f'  - article [ref=a{i}]:',
+            f'    - link "Stub story {i} about language models" [ref=l{i}]:',
+            f'      - /url: ./read/STUB{i:06d}',
+            f'    - time [ref=t{i}]: {i % 23 + 1} hours ago',
+        ]
+        i += 1
+    return "```yaml\n" + "\n".join(lines) + "\n```"
+
+
+class StubServer:
+    def __init__(self, latency: float, snapshot_kb: int):
+        self.latency = latency
+        self.snapshot = stub_snapshot(snapshot_kb)
+        self.url = "about:blank"
+        self.write_lock = asyncio.Lock()
+    
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=64 * 1024 * 1024)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        tasks = set()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            if "id" not in message:
+                continue  # Notification (notifications/initialized)
+            task = asyncio.create_task(self.handle(message))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+    
+    async def handle(self, message):
+        method = message.get("method")
+        params = message.get("params") or {}
+        response = {"jsonrpc": "2.0", "id": message["id"]}
+        if method == "initialize":
+            response["result"] = {
+                "protocolVersion": params.get("protocolVersion", "2024-11-05"),
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "mcp-stub", "version": "1.0"}
+            }
+        elif method == "tools/list":
+            response["result"] = {"tools": [{"name": name, "inputSchema": {"type": "object"}} for name in TOOLS]}
+        elif method == "tools/call":
+            # Jittered delay so responses come back out of order
+            await asyncio.sleep(self.latency * random.uniform(0.5, 1.5))
+            response["result"] = self.call_tool(params.get("name"), params.get("arguments") or {})
+        else:
+            response["error"] = {"code": -32601, "message": f"Method not found: {method}"}
+        await self.send(response)
+    
+    def call_tool(self, name, arguments):
+        if name not in TOOLS:
+            return {"content": [{"type": "text", "text": f"Tool {name} not found"}], "isError": True}
+        if name == "browser_navigate":
+            self.url = arguments.get("url", self.url)
+            text = f"### Page state\n- Page URL: {self.url}"
+        elif name == "browser_snapshot":
+            text = f"### Page state\n- Page URL: {self.url}\n- Page Snapshot:\n{self.snapshot}"
+        elif name == "browser_evaluate":
+            text = "### Result\ntrue"
+        else:
+            text = "### Result\nok"
+        return {"content": [{"type": "text", "text": text}]}
+    
+    async def send(self, message):
+        async with self.write_lock:
+            sys.stdout.write(json.dumps(message) + "\n")
+            sys.stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean seconds per tool call")
+    parser.add_argument("--snapshot-kb", type=int, default=64, help="Size of browser_snapshot output")
+    args = parser.parse_args()
+    asyncio.run(StubServer(args.latency, args.snapshot_kb).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark the snapshot parser and result extractors
+
+Usage:
+    python benchmarks/snapshot_parser_bench.py [snapshot.yaml ...]
+
+Pass snapshots recorded with Playwright MCP's browser_snapshot (the raw
+tool output is fine). Without arguments a synthetic Google News page of
+about 4 MB is generated.
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from utils.snapshot_parser import parse_snapshot, walk
+from scrapers.extractors import GOOGLE_NEWS, GOOGLE_SEARCH, LINKEDIN_POSTS
+
+EXTRACTORS = {"google_news": GOOGLE_NEWS, "google_search": GOOGLE_SEARCH, "linkedin": LINKEDIN_POSTS}
+
+
+def synthetic_news_snapshot(articles: int = 6000) -> str:
+    """A Google News-like snapshot: page chrome plus many nested article cards"""
+    lines = ['- banner [ref=e1]:', '  - navigation [ref=e2]:']
+    lines += [f'    - link "Section {i}" [ref=n{i}]:\n      - /url: ./topics/{i}' for i in range(200)]
+    lines.append('- main [ref=e3]:')
+    for i in range(articles):
+        lines += [
+            f'  - article [ref=a{i}]:',
+            f'    - generic [ref=g{i}]:',
+            f'      - img "Publisher {i % 50}" [ref=i{i}]',
+            f'      - text: Publisher {i % 50}',
+            f'    - link "Story number {i} about large language models and their \\"impact\\"" [ref=l{i}] [cursor=pointer]:',
+            f'      - /url: ./read/CBMi{i:08d}',
+            f'    - generic [ref=t{i}]:',
+            f'      - time [ref=tm{i}]: {i % 23 + 1} hours ago',
+            f'      - button "More" [ref=b{i}]',
+        ]
+    lines.append('- contentinfo [ref=e4]:\n  - link "Privacy" [ref=e5]:\n    - /url: https://policies.google.com/privacy')
+    return "\n".join(lines)
+
+
+def bench(label: str, text: str, rounds: int = 5):
+    size_mb = len(text.encode('utf-8')) / 1e6
+    parse_times, extract_times, limited_times = [], [], []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        root = parse_snapshot(text)
+        parse_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        counts = {name: sum(1 for _ in extractor.extract(root)) for name, extractor in EXTRACTORS.items()}
+        extract_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        for extractor in EXTRACTORS.values():
+            list(extractor.extract(root, limit=10))
+        limited_times.append(time.perf_counter() - started)
+    nodes = sum(1 for _ in walk(root))
+    parse, extract = min(parse_times), min(extract_times)
+    print(f"{label}: {size_mb:.1f} MB, {nodes} nodes")
+    print(f"  parse    {parse * 1000:8.1f} ms  ({size_mb / parse:.1f} MB/s)")
+    print(f"  extract  {extract * 1000:8.1f} ms  (all extractors) -> {counts}")
+    print(f"  extract  {min(limited_times) * 1000:8.1f} ms  (all extractors, first 10 results as the scrapers do)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            bench(path, Path(path).read_text(encoding='utf-8'))
+    else:
+        bench("synthetic Google News", synthetic_news_snapshot())
@@ -0,0 +1,25 @@
+"""
+Keep the process-wide caches and source health out of the working directory
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+import llm.llm_cache as llm_cache
+import utils.circuit_breaker as circuit_breaker
+import utils.http_client as http_client
+
+
+@pytest.fixture(autouse=True)
+def breakers(monkeypatch, tmp_path):
+    """Fresh HTTP and LLM caches and circuit breakers under tmp_path; yields the breaker registry"""
+    monkeypatch.setattr(http_client, "HTTP_CACHE_PATH", str(tmp_path / "http_cache.db"))
+    monkeypatch.setattr(http_client, "_shared_client", None)
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_PATH", str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(llm_cache, "_shared_cache", None)
+    registry = circuit_breaker.CircuitBreakerRegistry(str(tmp_path / "source_health.json"))
+    monkeypatch.setattr(circuit_breaker, "_shared_registry", registry)
+    return registry
@@ -0,0 +1,56 @@
+"""
+A failed write must not leave its connection holding the write lock
+"""
+import gc
+import sys
+import threading
+import weakref
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from db.database import Database
+
+
+def test_failed_write_rolls_back(tmp_path):
+    db = Database(str(tmp_path / "newsletter.db"), compression="zlib")
+    try:
+        topic_id = db.add_topic("AI", "daily")
+        with pytest.raises(TypeError):
+            db.save_fact_sheet(topic_id, "# Fact Sheet", {"topic": "AI", "bad": object()})
+        
+        # Another thread can still write, and this thread can open a transaction
+        errors = []
+        writer = threading.Thread(target=lambda: errors.append(db.add_topic("Other", "daily")))
+        writer.start()
+        writer.join()
+        assert isinstance(errors[0], int)
+        with db.transaction():
+            db.update_topic_last_run(topic_id, datetime.now())
+    finally:
+        db.close()
+
+
+def test_duplicate_topic_rolls_back(tmp_path):
+    db = Database(str(tmp_path / "newsletter.db"))
+    try:
+        db.add_topic("AI", "daily")
+        with pytest.raises(ValueError):
+            db.add_topic("AI", "daily")
+        assert not db.get_connection().in_transaction
+    finally:
+        db.close()
+
+
+def test_unreferenced_database_closes_its_connections(tmp_path):
+    db = Database(str(tmp_path / "newsletter.db"))
+    conn = db.get_connection()
+    ref = weakref.ref(db)
+    del db
+    gc.collect()
+    assert ref() is None
+    with pytest.raises(Exception):
+        conn.execute("SELECT 1")
@@ -0,0 +1,62 @@
+"""
+Source deadlines count from when each source starts running, and failures are reported
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+import pipeline.fact_sheet_builder as fact_sheet_builder
+from pipeline.fact_sheet_builder import FactSheetBuilder
+
+
+def scrape_for(seconds, items):
+    def scrape():
+        time.sleep(seconds)
+        return items
+    return scrape
+
+
+def test_sources_sharing_a_tab_each_get_their_full_deadline(monkeypatch):
+    monkeypatch.setitem(fact_sheet_builder.SOURCE_TIMEOUTS, "news", 0.5)
+    monkeypatch.setitem(fact_sheet_builder.SOURCE_TIMEOUTS, "web", 0.5)
+    lock = threading.Lock()
+    results, timings = FactSheetBuilder()._scrape_sources([
+        ("news", scrape_for(0.3, [{"headline": "a"}]), lock),
+        ("web", scrape_for(0.3, [{"headline": "b"}]), lock),
+    ])
+    # web starts 0.3s in and finishes at 0.6s, past 0.5s from the build start
+    assert timings["news"]["status"] == "ok"
+    assert timings["web"]["status"] == "ok"
+    assert results["web"] == [{"headline": "b"}]
+
+
+def test_stuck_source_times_out_and_tab_waiters_give_up(monkeypatch):
+    monkeypatch.setitem(fact_sheet_builder.SOURCE_TIMEOUTS, "news", 0.2)
+    monkeypatch.setitem(fact_sheet_builder.SOURCE_TIMEOUTS, "web", 0.2)
+    lock = threading.Lock()
+    started = time.monotonic()
+    results, timings = FactSheetBuilder()._scrape_sources([
+        ("news", scrape_for(1.0, [{"headline": "a"}]), lock),
+        ("web", scrape_for(0.0, [{"headline": "b"}]), lock),
+    ])
+    assert time.monotonic() - started < 0.8
+    assert timings["news"]["status"] == "timeout"
+    assert timings["web"]["status"] == "timeout"
+    assert results["news"] == results["web"] == []
+
+
+class BrokenBrowser:
+    def navigate(self, url):
+        raise RuntimeError("browser crashed")
+
+
+def test_mcp_failures_are_reported_and_counted(breakers):
+    builder = FactSheetBuilder()
+    sources = [source for source in builder._sources("AI", BrokenBrowser(), {}) if source[0] == "news"]
+    results, timings = builder._scrape_sources(sources)
+    assert timings["news"]["status"] == "error"
+    assert results["news"] == []
+    assert breakers.health()["news"]["consecutive_failures"] == 1
@@ -0,0 +1,82 @@
+"""
+Incremental research cutoffs only advance for sources that succeeded
+"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from db.database import Database
+from pipeline.scheduler import NewsletterScheduler
+from config.settings import RESEARCH_OVERLAP_DAYS
+
+PAPER = {"source": "arXiv", "url": "https://arxiv.org/abs/2401.00001", "headline": "Paper", "abstract": "Text"}
+
+
+class FakeBuilder:
+    def __init__(self):
+        self.calls = []
+        self.statuses = {"arxiv": "ok", "semantic_scholar": "ok"}
+    
+    def build_fact_sheet(self, topic, use_mcp_client=None, since=None, seen_urls=None):
+        self.calls.append({"since": since, "seen_urls": seen_urls})
+        timings = {name: {"status": status, "seconds": 0.0, "items": 0} for name, status in self.statuses.items()}
+        return {"markdown": "# Fact Sheet", "json_data": {"research_papers": [PAPER], "source_timings": timings}}
+
+
+class FakeGenerator:
+    def generate(self, fact_sheet_markdown, style_profile, topic, raise_errors=False):
+        return "# Newsletter"
+
+
+class FakeStyleProfiles:
+    def get(self, topic_id):
+        return {}
+
+
+def make_scheduler(db):
+    scheduler = NewsletterScheduler(db)
+    scheduler.fact_sheet_builder = FakeBuilder()
+    scheduler.newsletter_generator = FakeGenerator()
+    scheduler.style_profiles = FakeStyleProfiles()
+    return scheduler
+
+
+def test_failed_source_keeps_its_cutoff(tmp_path):
+    db = Database(str(tmp_path / "newsletter.db"))
+    try:
+        topic_id = db.add_topic("AI", "daily")
+        scheduler = make_scheduler(db)
+        builder = scheduler.fact_sheet_builder
+        
+        before_first = datetime.now()
+        builder.statuses["semantic_scholar"] = "error"
+        scheduler.run_manual(topic_id)
+        assert builder.calls[0]["since"] == {}
+        
+        scheduler.run_manual(topic_id)
+        since = builder.calls[1]["since"]
+        overlap = timedelta(days=RESEARCH_OVERLAP_DAYS)
+        assert since["arxiv"] >= before_first - overlap
+        assert "semantic_scholar" not in since  # Never fetched: no cutoff
+        # Papers taken in within the overlap window are not repeated
+        assert len(builder.calls[1]["seen_urls"]) == 1
+    finally:
+        db.close()
+
+
+def test_topics_without_marks_start_from_last_run(tmp_path):
+    db = Database(str(tmp_path / "newsletter.db"))
+    try:
+        topic_id = db.add_topic("AI", "daily")
+        last_run = datetime(2024, 5, 10, 8, 0)
+        db.update_topic_last_run(topic_id, last_run)
+        scheduler = make_scheduler(db)
+        
+        scheduler.run_manual(topic_id)
+        since = scheduler.fact_sheet_builder.calls[0]["since"]
+        assert since == {source: last_run - timedelta(days=RESEARCH_OVERLAP_DAYS)
+                         for source in ("arxiv", "semantic_scholar")}
+    finally:
+        db.close()
@@ -0,0 +1,45 @@
+"""
+A streamed generation only succeeds when Ollama sends its final chunk
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from llm.ollama_client import OllamaGeneration, OllamaGenerationError
+
+
+class FakeResponse:
+    def __init__(self, chunks):
+        self.lines = [json.dumps(chunk).encode() for chunk in chunks]
+    
+    def iter_lines(self):
+        return iter(self.lines)
+    
+    def close(self):
+        pass
+
+
+def make_generation(chunks, completed):
+    return OllamaGeneration(lambda: FakeResponse(chunks), 30, on_complete=completed.append)
+
+
+def test_stream_with_final_chunk_completes():
+    completed = []
+    generation = make_generation([{"response": "Hello"}, {"response": " world", "done": True}], completed)
+    assert generation.result() == "Hello world"
+    assert generation.done and generation.error is None
+    assert completed == [generation]
+
+
+def test_stream_cut_short_is_an_error():
+    completed = []
+    generation = make_generation([{"response": "Hello"}, {"response": " wor"}], completed)
+    with pytest.raises(OllamaGenerationError, match="stream ended before completion") as raised:
+        generation.result()
+    assert raised.value.partial == "Hello wor"
+    assert not generation.done
+    assert completed == []  # Truncated text never reaches the LLM cache
@@ -0,0 +1,54 @@
+"""
+Content-addressed payload storage round-trips and deduplicates across runs
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from db.database import Database
+
+
+def fact_sheet(run_at: str, seconds: float):
+    json_data = {
+        "topic": "AI",
+        "created_at": run_at,
+        "research_papers": [{"source": "arXiv", "url": "https://arxiv.org/abs/1", "headline": "Paper", "abstract": "Text"}],
+        "source_timings": {"arxiv": {"status": "ok", "seconds": seconds, "items": 1}},
+        "build_seconds": seconds
+    }
+    markdown = f"# Fact Sheet: AI\n\n*Generated on {run_at}*\n\n\n## Research Papers\n\n1. **Paper**\n   Text"
+    return markdown, json_data
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_fact_sheets_round_trip(tmp_path, compression):
+    db = Database(str(tmp_path / "newsletter.db"), compression=compression)
+    try:
+        topic_id = db.add_topic("AI", "daily")
+        markdown, json_data = fact_sheet("May 01, 2024 at 10:00", 1.5)
+        sheet_id = db.save_fact_sheet(topic_id, markdown, json_data)
+        newsletter_id = db.save_newsletter(topic_id, "# Weekly\n\n*Generated on May 01, 2024*\n\n---\n\nBody")
+        
+        sheet = db.get_fact_sheet(sheet_id)
+        assert sheet['markdown'] == markdown
+        assert json.loads(sheet['json_data']) == json_data
+        assert db.get_newsletter(newsletter_id)['markdown'].endswith("---\n\nBody")
+        assert db.list_fact_sheets(topic_id)[0]['size'] == len(markdown)
+    finally:
+        db.close()
+
+
+def test_runs_differing_only_in_header_share_payloads(tmp_path):
+    db = Database(str(tmp_path / "newsletter.db"), compression="zlib")
+    try:
+        topic_id = db.add_topic("AI", "daily")
+        db.save_fact_sheet(topic_id, *fact_sheet("May 01, 2024 at 10:00", 1.5))
+        db.save_fact_sheet(topic_id, *fact_sheet("May 02, 2024 at 10:00", 2.5))
+        count = db.get_connection().execute("SELECT COUNT(*) FROM payloads").fetchone()[0]
+        assert count == 2  # One markdown body, one JSON body
+    finally:
+        db.close()
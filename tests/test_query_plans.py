@@ -0,0 +1,31 @@
+"""
+The hot history queries must be answered from their indexes
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from db.database import Database
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_hot_queries_use_indexes(tmp_path, compression):
+    db = Database(str(tmp_path / "newsletter.db"), compression=compression)
+    try:
+        assert db.check_query_plans() == []
+    finally:
+        db.close()
+
+
+def test_check_query_plans_reports_missing_index(tmp_path):
+    db = Database(str(tmp_path / "newsletter.db"))
+    try:
+        db.get_connection().execute("DROP INDEX idx_fact_sheets_topic_created")
+        offenders = db.check_query_plans()
+        assert 'latest_fact_sheet' in offenders
+        assert 'latest_newsletter' not in offenders
+    finally:
+        db.close()
@@ -0,0 +1,36 @@
+"""
+ResearchScraper's per-source methods, as used by the fact sheet builder
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from scrapers.research_scraper import ResearchScraper
+
+
+def papers(source, count):
+    return [{"source": source, "headline": f"Paper {i}", "url": f"https://{source}/{i}"} for i in range(count)]
+
+
+def test_scrape_keeps_each_sources_own_limit(monkeypatch):
+    scraper = ResearchScraper(http_client=object())
+    monkeypatch.setattr(scraper, "_fetch_arxiv", lambda topic, since: papers("arxiv", scraper.max_results))
+    monkeypatch.setattr(scraper, "_fetch_semantic_scholar", lambda topic, since: papers("s2", 5))
+    results = scraper.scrape("AI")
+    assert len(results) == scraper.max_results + 5
+    assert results[-1]["source"] == "s2"
+
+
+def test_failed_source_raises_only_when_asked(monkeypatch, breakers):
+    scraper = ResearchScraper(http_client=object())
+    
+    def fail(topic, since):
+        raise ConnectionError("arXiv is down")
+    monkeypatch.setattr(scraper, "_fetch_arxiv", fail)
+    assert scraper.scrape_arxiv("AI") == []
+    with pytest.raises(ConnectionError):
+        scraper.scrape_arxiv("AI", raise_errors=True)
+    assert breakers.health()["arxiv"]["consecutive_failures"] == 2
@@ -0,0 +1,34 @@
+"""
+Scraped items are shared across topics but "new" per topic
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from db.database import Database
+
+PAPER = {"source": "arXiv", "url": "https://arxiv.org/abs/2401.00001", "headline": "Paper", "abstract": "Text"}
+
+
+def test_item_is_new_for_each_topic_that_first_links_it(tmp_path):
+    db = Database(str(tmp_path / "newsletter.db"))
+    try:
+        topic_a = db.add_topic("A", "daily")
+        topic_b = db.add_topic("B", "daily")
+        db.save_fact_sheet(topic_a, "# A", {"research_papers": [PAPER]})
+        cutoff = datetime.now()
+        assert db.get_new_items_since(topic_b, cutoff) == []
+        
+        db.save_fact_sheet(topic_b, "# B", {"research_papers": [PAPER]})
+        new_for_b = db.get_new_items_since(topic_b, cutoff)
+        assert [item['url'] for item in new_for_b] == [PAPER['url']]
+        assert db.get_new_items_since(topic_a, cutoff) == []
+        
+        # Seeing it again later does not make it new again
+        later = datetime.now()
+        db.save_fact_sheet(topic_b, "# B", {"research_papers": [PAPER]})
+        assert db.get_new_items_since(topic_b, later) == []
+    finally:
+        db.close()
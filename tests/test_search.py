@@ -0,0 +1,94 @@
+"""
+Full-text search: merged ranking and the external-content indexes
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from db.database import Database
+from db.payloads import decode_payload
+
+
+def test_search_mixes_kinds_when_all_match(tmp_path):
+    db = Database(str(tmp_path / "newsletter.db"))
+    try:
+        topic_id = db.add_topic("AI", "daily")
+        with db.transaction():
+            for i in range(30):
+                item = {"source": "arXiv", "url": f"https://arxiv.org/abs/{i}",
+                        "headline": f"Transformer models {i}", "abstract": "A study of attention"}
+                db.save_fact_sheet(topic_id, f"# Fact Sheet\n\nThe transformer paper {i} and other work " * 5,
+                                   {"research_papers": [item]})
+                db.save_newsletter(topic_id, f"# Newsletter {i}\n\nThis week in transformer news. " * 3)
+        
+        results = db.search("transformer")
+        assert len(results) == 20
+        assert {result['kind'] for result in results} == {'fact_sheet', 'newsletter', 'item'}
+        assert all(0 < result['score'] <= 1 for result in results)
+    finally:
+        db.close()
+
+
+def fill(db, sheets=30):
+    topic_id = db.add_topic("AI", "daily")
+    with db.transaction():
+        for i in range(sheets):
+            db.save_fact_sheet(topic_id, f"# Fact Sheet\n\nThe transformer paper {i} and other work " * 5, {})
+            db.save_newsletter(topic_id, f"# Newsletter {i}\n\nThis week in transformer news. " * 3)
+    return topic_id
+
+
+def test_search_indexes_store_no_bodies_and_decode_only_hits(tmp_path):
+    db = Database(str(tmp_path / "newsletter.db"), compression="zlib")
+    try:
+        topic_id = fill(db)
+        conn = db.get_connection()
+        tables = {row['name'] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert 'fact_sheets_fts_content' not in tables
+        assert 'newsletters_fts_content' not in tables
+        
+        decoded = []
+        conn.create_function("payload_decode", 2, lambda codec, data: decoded.append(1) or decode_payload(codec, data))
+        results = db.search("transformer", topic_id=topic_id, limit=5, kinds=('fact_sheet',))
+        assert len(results) == 5
+        assert all('**transformer**' in result['snippet'] for result in results)
+        assert len(decoded) <= 5
+    finally:
+        db.close()
+
+
+def test_deleted_rows_leave_the_index(tmp_path):
+    db = Database(str(tmp_path / "newsletter.db"), compression="zlib")
+    try:
+        fill(db, sheets=3)
+        conn = db.get_connection()
+        with db.transaction():
+            conn.execute("DELETE FROM fact_sheets WHERE id = 1")
+        conn.execute("INSERT INTO fact_sheets_fts (fact_sheets_fts) VALUES ('integrity-check')")
+        assert sorted(result['id'] for result in db.search("transformer", kinds=('fact_sheet',))) == [2, 3]
+    finally:
+        db.close()
+
+
+def test_plain_text_index_from_older_files_is_rebuilt(tmp_path):
+    path = str(tmp_path / "newsletter.db")
+    db = Database(path, compression="zlib")
+    fill(db, sheets=3)
+    conn = db.get_connection()
+    conn.executescript("""
+        DROP TRIGGER fact_sheets_fts_insert;
+        DROP TRIGGER fact_sheets_fts_delete;
+        DROP TABLE fact_sheets_fts;
+        CREATE VIRTUAL TABLE fact_sheets_fts USING fts5(topic_id UNINDEXED, body, tokenize = 'porter unicode61');
+    """)
+    db.close()
+    
+    db = Database(path, compression="zlib")
+    try:
+        sql = db.get_connection().execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'fact_sheets_fts'").fetchone()['sql']
+        assert "content = 'fact_sheets_text'" in sql
+        assert len(db.search("transformer", kinds=('fact_sheet',))) == 3
+    finally:
+        db.close()